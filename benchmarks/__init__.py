@@ -0,0 +1 @@
+"""Offline performance benchmarks; run a module with `python -m benchmarks.NAME`."""
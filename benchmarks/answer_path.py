@@ -0,0 +1,252 @@
+"""End-to-end answer path throughput and memory on a synthetically scaled manifest.
+
+python -m benchmarks.answer_path --baseline benchmarks/baselines/answer_path.json
+
+Generates a `tabletalk.synthetic` project with `--nodes` models of `--columns` columns, then
+measures `Manifest.load`, `Agent.resolve`, `selector_options`, `validate_sql`, `Runtime.answer`,
+`EvalRunner.run`, and `Trace.write` for the `finance` group against an in-memory DuckDB table of
+`--orders` rows and a scripted model that answers instantly.
+Times are the best of `--repeat` runs; `peak_kib` is the tracemalloc peak of one extra run.
+
+`--output` writes the results as JSON. `--baseline` compares every `_ms` figure with a stored result
+and exits non-zero when one is slower by more than `--tolerance` and by at least `--floor-ms`, or
+when a measured scale has no baseline entry. The stored baseline covers the default 1k and 10k
+scales and was recorded on one development machine; regenerate it with `--output` before comparing
+on different hardware or at larger `--nodes` such as 50000, which needs several GiB of memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from tabletalk.agents import Agent
+from tabletalk.authoring import selector_options
+from tabletalk.connections import ReadOnlyConnection, Target
+from tabletalk.evals import EvalCase, EvalRunner, EvalSuite, ResultExpectation
+from tabletalk.interfaces import LLMProvider
+from tabletalk.manifest import Manifest
+from tabletalk.providers.duckdb_provider import DuckDBProvider
+from tabletalk.runtime import Runtime
+from tabletalk.synthetic import SyntheticArtifacts, SyntheticSpec, generate, populate_duckdb
+from tabletalk.validation import validate_sql
+
+QUESTION = "What was the total amount in July 2026?"
+
+
+class ScriptedLLM(LLMProvider):
+    """Answers by schema: the benchmark query when asked for SQL, otherwise a cited value."""
+
+    def __init__(self, sql: str, answer: str) -> None:
+        super().__init__()
+        self.sql = sql
+        self.answer = answer
+
+    def generate_response(self, prompt: str) -> str:
+        return self.answer
+
+    def generate_structured(
+        self, messages: list[dict[str, str]], json_schema: dict[str, Any]
+    ) -> dict[str, Any]:
+        self.last_usage = {"prompt_tokens": sum(len(item["content"]) for item in messages) // 4}
+        if "sql" in json_schema["properties"]:
+            return {
+                "interpretation": {
+                    "intent": "aggregate",
+                    "metrics": ["amount"],
+                    "dimensions": [],
+                    "start_date": "2026-07-01",
+                    "end_date": "2026-08-01",
+                    "assumptions": [],
+                },
+                "sql": self.sql,
+                "rejection": None,
+            }
+        return {
+            "text": self.answer,
+            "claims": [{"text": self.answer, "evidence": [{"row": 0, "column": "amount"}]}],
+        }
+
+
+def write_artifacts(artifacts: SyntheticArtifacts, directory: Path) -> Path:
+    for name, payload in (
+        ("catalog.json", artifacts.catalog),
+        ("run_results.json", artifacts.run_results),
+    ):
+        (directory / name).write_text(json.dumps(payload))
+    path = directory / "manifest.json"
+    path.write_text(json.dumps(artifacts.manifest))
+    return path
+
+
+def runtime(manifest: Manifest, artifacts: SyntheticArtifacts, orders: int) -> Runtime:
+    """A runtime for the `finance` group whose scripted model queries its first fact table."""
+    agent = Agent("finance", "Finance", ("group:finance",)).resolve(manifest)
+    node = next(node for node in agent.nodes if node.name.startswith("fct_"))
+    sql = (
+        f"select sum(amount) as amount from {node.database}.{node.schema}.{node.alias} "
+        "where event_date >= '2026-07-01' and event_date < '2026-08-01'"
+    )
+    provider = DuckDBProvider()
+    provider.connection.execute("ATTACH ':memory:' AS analytics")
+    populate_duckdb(provider.connection, artifacts, rows=orders, unique_ids={node.unique_id})
+    (total,) = provider.connection.execute(sql).fetchone()  # type: ignore[misc]
+    connection = ReadOnlyConnection(
+        Target("analytics", "dev", "duckdb", {"type": "duckdb"}), provider
+    )
+    return Runtime(
+        manifest,
+        agent,
+        connection,
+        ScriptedLLM(sql, f"The total amount was ${total:,.2f}."),
+        model_identity="scripted:benchmark",
+    )
+
+
+def measure(function: Callable[[], Any], repeat: int) -> tuple[float, float]:
+    """Best wall time in milliseconds and the tracemalloc peak of one extra run in KiB."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def run_scale(
+    nodes: int, *, columns: int, orders: int, questions: int, repeat: int
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as temporary:
+        directory = Path(temporary)
+        artifacts = generate(SyntheticSpec(models=nodes, columns=columns))
+        path = write_artifacts(artifacts, directory)
+        manifest = Manifest.load(path)
+        answering = runtime(manifest, artifacts, orders)
+        sql = answering.llm.sql  # type: ignore[attr-defined]
+        suite = EvalSuite(
+            "benchmark",
+            "finance",
+            tuple(
+                EvalCase(
+                    f"july_{index}",
+                    QUESTION,
+                    reference_sql=sql,
+                    result=ResultExpectation(comparison="scalar", tolerance=0.01),
+                )
+                for index in range(questions)
+            ),
+        )
+        trace = answering.answer(QUESTION)
+        assert trace.passed, [item for item in trace.verification if not item.passed]
+        operations: dict[str, Callable[[], Any]] = {
+            "manifest_load": lambda: Manifest.load(path),
+            "agent_resolve": lambda: answering.agent.source.resolve(manifest),
+            "selector_options": lambda: selector_options(manifest, "group"),
+            "validate_sql": lambda: validate_sql(
+                sql,
+                manifest,
+                answering.agent.nodes,
+                dialect="duckdb",
+                max_rows=answering.agent.source.max_rows,
+            ),
+            "runtime_answer": lambda: [answering.answer(QUESTION) for _ in range(questions)],
+            "eval_run": lambda: EvalRunner(suite, answering).run(),
+            "trace_write": lambda: trace.write(directory / "runs", "trace.json"),
+        }
+        results: dict[str, Any] = {
+            "nodes": len(manifest.nodes),
+            "agent_nodes": len(answering.agent.nodes),
+        }
+        for name, operation in operations.items():
+            milliseconds, peak = measure(operation, repeat)
+            results[f"{name}_ms"] = round(milliseconds, 3)
+            results[f"{name}_peak_kib"] = round(peak, 1)
+        results["answers_per_second"] = round(questions / results["runtime_answer_ms"] * 1000, 1)
+        results["eval_cases_per_second"] = round(questions / results["eval_run_ms"] * 1000, 1)
+        return results
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float, floor_ms: float
+) -> list[str]:
+    """Describe every timing more than `tolerance` and `floor_ms` slower than the baseline.
+
+    A scale the baseline does not cover is reported too, so it cannot pass unchecked.
+    """
+    regressions = []
+    for scale, figures in results["scales"].items():
+        reference = baseline.get("scales", {}).get(scale)
+        if reference is None:
+            regressions.append(f"{scale} nodes: no baseline entry")
+            continue
+        for name, value in figures.items():
+            before = reference.get(name)
+            if (
+                name.endswith("_ms")
+                and before
+                and value > before * (1 + tolerance)
+                and value - before > floor_ms
+            ):
+                regressions.append(f"{scale} nodes {name}: {before} -> {value} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", default="1000,10000", help="comma-separated model counts")
+    parser.add_argument("--columns", type=int, default=12)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--floor-ms", type=float, default=1.0)
+    arguments = parser.parse_args()
+    results: dict[str, Any] = {
+        "benchmark": "answer_path",
+        "python": sys.version.split()[0],
+        "columns": arguments.columns,
+        "orders": arguments.orders,
+        "questions": arguments.questions,
+        "scales": {
+            scale: run_scale(
+                int(scale),
+                columns=arguments.columns,
+                orders=arguments.orders,
+                questions=arguments.questions,
+                repeat=arguments.repeat,
+            )
+            for scale in arguments.nodes.split(",")
+        },
+    }
+    if arguments.baseline:
+        results["regressions"] = compare(
+            results,
+            json.loads(arguments.baseline.read_text()),
+            arguments.tolerance,
+            arguments.floor_ms,
+        )
+    if arguments.output:
+        arguments.output.parent.mkdir(parents=True, exist_ok=True)
+        arguments.output.write_text(json.dumps(results, indent=2) + "\n")
+    print(json.dumps(results, indent=2))
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Claim verification cost for answers that cite hundreds of result cells.
+
+python -m benchmarks.claim_verification --cells 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+from tabletalk.runtime import Runtime
+from tabletalk.traces import Claim, Evidence
+
+
+def baseline_text_value_present(value: str, claim: str) -> bool:
+    normalized_value = " ".join(re.findall(r"[a-z0-9]+", value.casefold()))
+    normalized_claim = " ".join(re.findall(r"[a-z0-9]+", claim.casefold()))
+    if not normalized_value:
+        return True
+    if " " in normalized_value:
+        return normalized_value in normalized_claim
+    return normalized_value in normalized_claim.split()
+
+
+def baseline_failures(
+    text: str, claims: tuple[Claim, ...], rows: tuple[dict[str, Any], ...], question: str
+) -> list[str]:
+    """The previous per-claim implementation, kept as the comparison baseline."""
+    failures: list[str] = []
+    all_numeric_cells = {
+        float(rows[item.row][item.column])
+        for claim in claims
+        for item in claim.evidence
+        if 0 <= item.row < len(rows)
+        and item.column in rows[item.row]
+        and isinstance(rows[item.row][item.column], (int, float, Decimal))
+        and not isinstance(rows[item.row][item.column], bool)
+    }
+    for claim in claims:
+        if not claim.evidence:
+            failures.append(f"Claim has no evidence: {claim.text}")
+        for evidence in claim.evidence:
+            if evidence.row < 0 or evidence.row >= len(rows):
+                failures.append(f"Evidence row {evidence.row} does not exist")
+            elif evidence.column not in rows[evidence.row]:
+                failures.append(
+                    f"Evidence column '{evidence.column}' does not exist in row {evidence.row}"
+                )
+        claimed_numbers: list[tuple[float, tuple[tuple[float, float], ...]]] = []
+        claim_without_dates = re.sub(r"\b\d{4}-\d{2}-\d{2}\b", "", claim.text)
+        claim_without_dates = re.sub(
+            r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|"
+            r"Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|"
+            r"Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:,\s*\d{4})?\b",
+            "",
+            claim_without_dates,
+            flags=re.IGNORECASE,
+        )
+        for value, percent in re.findall(
+            r"(?<![\w-])\$?(-?\d[\d,]*(?:\.\d+)?)(%)?"
+            r"(?![\d,]|\.\d|-[A-Za-z])",
+            claim_without_dates,
+        ):
+            normalized_number = value.replace(",", "")
+            if len(normalized_number) == 4 and normalized_number.isdigit() and not percent:
+                continue
+            question_numbers = {
+                item.replace(",", "") for item in re.findall(r"-?\d[\d,]*(?:\.\d+)?", question)
+            }
+            if normalized_number in question_numbers:
+                continue
+            decimals = len(normalized_number.partition(".")[2])
+            numeric_value = float(normalized_number)
+            tolerance = 0.5 * (10**-decimals) if decimals else 1e-9
+            candidates = [(numeric_value, tolerance)]
+            if percent:
+                candidates.append((numeric_value / 100, tolerance / 100))
+            claimed_numbers.append((numeric_value, tuple(candidates)))
+        unsupported = {
+            value
+            for value, candidates in claimed_numbers
+            if not any(
+                abs(candidate - cell) <= tolerance + 1e-12
+                for candidate, tolerance in candidates
+                for cell in all_numeric_cells
+            )
+        }
+        if unsupported:
+            failures.append(
+                "Numeric claim is absent from cited evidence: "
+                + ", ".join(str(value) for value in sorted(unsupported))
+            )
+        unsupported_text = {
+            str(rows[item.row][item.column])
+            for item in claim.evidence
+            if 0 <= item.row < len(rows)
+            and item.column in rows[item.row]
+            and isinstance(rows[item.row][item.column], str)
+            and rows[item.row][item.column].strip()
+            and not re.fullmatch(r"\d{4}-\d{2}-\d{2}(?:[ T].*)?", rows[item.row][item.column])
+            and not baseline_text_value_present(rows[item.row][item.column], text)
+        }
+        if unsupported_text:
+            failures.append(
+                "Text claim is absent from cited evidence: " + ", ".join(sorted(unsupported_text))
+            )
+    return failures
+
+
+def sample_answer(cells: int) -> tuple[str, tuple[Claim, ...], tuple[dict[str, Any], ...], str]:
+    """One claim per row, each citing a customer name and a revenue cell."""
+    rows = tuple(
+        {"customer": f"Customer {chr(65 + index % 26)}{index:04d}", "revenue": index * 12.37}
+        for index in range(cells // 2)
+    )
+    claims = tuple(
+        Claim(
+            f"{row['customer']} recognized ${row['revenue']:,.2f} in July 2026.",
+            (Evidence(index, "customer"), Evidence(index, "revenue")),
+        )
+        for index, row in enumerate(rows)
+    )
+    text = " ".join(claim.text for claim in claims)
+    return text, claims, rows, "Which customers recognized revenue in July 2026?"
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(cells: int, repeat: int) -> dict[str, Any]:
+    text, claims, rows, question = sample_answer(cells)
+    current = Runtime._validate_claims(text, claims, rows, question=question)
+    baseline = baseline_failures(text, claims, rows, question)
+    if current[1].message != "; ".join(baseline):
+        raise SystemExit("Claim verification disagrees with the baseline")
+    return {
+        "benchmark": "claim_verification",
+        "cited_cells": sum(len(claim.evidence) for claim in claims),
+        "baseline_ms": measure(lambda: baseline_failures(text, claims, rows, question), repeat),
+        "current_ms": measure(
+            lambda: Runtime._validate_claims(text, claims, rows, question=question), repeat
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    print(json.dumps(run(arguments.cells, arguments.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
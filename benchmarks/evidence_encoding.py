@@ -0,0 +1,131 @@
+"""Answer-prompt tokens for repr evidence versus the tabular evidence encoding.
+
+python -m benchmarks.evidence_encoding --scale 100
+
+Loads the example project's `raw_orders` seed through the `stg_orders` casts, then runs its eval
+reference queries and a few other query shapes. `--scale` repeats the seed rows with fresh order IDs
+for larger results. Token counts use `tiktoken` when installed and a word/punctuation approximation
+otherwise. No model calls are made, so this reports prompt size and build time, not model latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import yaml
+
+from tabletalk.runtime import Runtime
+
+EXAMPLE = Path(__file__).parents[1] / "examples" / "dbt-analytics"
+QUERIES = {
+    "revenue_by_day": (
+        "select order_date, sum(recognized_revenue) as recognized_revenue, "
+        "count(*) as orders from fct_orders group by 1 order by 1"
+    ),
+    "orders": "select order_id, order_date, recognized_revenue, customer_id from fct_orders",
+}
+
+
+def repr_prompt(sql: str, rows: tuple[dict[str, Any], ...]) -> str:
+    """The previous encoding: Python repr of the row dicts."""
+    instructions = Runtime._answer_prompt(sql, ()).split("Evidence rows")[0]
+    return f"{instructions}Evidence rows:\n{rows!r}"
+
+
+def token_counter() -> tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+    except ImportError:
+        pattern = re.compile(r"\w+|[^\w\s]")
+        return "approximate", lambda text: len(pattern.findall(text))
+    encoding = tiktoken.get_encoding("o200k_base")
+    return "o200k_base", lambda text: len(encoding.encode(text))
+
+
+def fixture(scale: int) -> duckdb.DuckDBPyConnection:
+    """`fct_orders` as the example project builds it, with the seed repeated `scale` times."""
+    connection = duckdb.connect()
+    seed = EXAMPLE / "seeds" / "raw_orders.csv"
+    connection.execute(
+        f"create table raw_orders as select * from read_csv('{seed}', all_varchar = true)"
+    )
+    connection.execute(
+        "create table fct_orders as select "
+        "cast(order_id as integer) "
+        "+ cast(copy as integer) * (select max(cast(order_id as integer)) from raw_orders) "
+        "as order_id, "
+        "cast(order_date as date) as order_date, "
+        "cast(recognized_revenue as decimal(18, 2)) as recognized_revenue, "
+        "customer_id "
+        f"from raw_orders, range({scale}) as copies(copy) order by order_id"
+    )
+    return connection
+
+
+def queries() -> dict[str, str]:
+    """The example evals' reference queries, then the other query shapes."""
+    suite = yaml.safe_load((EXAMPLE / "evals" / "revenue.yaml").read_text())
+    references = {
+        case["name"]: re.sub(
+            r"\{\{\s*ref\('(\w+)'\)\s*\}\}", r"\1", case["expect"]["reference_sql"]
+        )
+        for case in suite["cases"]
+        if case.get("expect", {}).get("reference_sql")
+    }
+    return {**references, **QUERIES}
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(scale: int, repeat: int) -> dict[str, Any]:
+    connection = fixture(scale)
+    tokenizer, count = token_counter()
+    results = {}
+    for name, sql in queries().items():
+        cursor = connection.execute(sql)
+        columns = [item[0] for item in cursor.description]
+        rows = tuple(dict(zip(columns, values)) for values in cursor.fetchall())
+        before = repr_prompt(sql, rows)
+        after = Runtime._answer_prompt(sql, rows)
+        before_tokens, after_tokens = count(before), count(after)
+        results[name] = {
+            "rows": len(rows),
+            "repr_prompt_tokens": before_tokens,
+            "tabular_prompt_tokens": after_tokens,
+            "token_reduction": round(1 - after_tokens / before_tokens, 3),
+            "repr_build_ms": measure(lambda: repr_prompt(sql, rows), repeat),
+            "tabular_build_ms": measure(lambda: Runtime._answer_prompt(sql, rows), repeat),
+        }
+    return {
+        "benchmark": "evidence_encoding",
+        "seed_rows": connection.execute("select count(*) from raw_orders").fetchone()[0],
+        "scale": scale,
+        "tokenizer": tokenizer,
+        "queries": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+    print(json.dumps(run(arguments.scale, arguments.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
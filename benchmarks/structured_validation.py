@@ -0,0 +1,121 @@
+"""Structured-output validation cost for answers with hundreds of claims and evidence items.
+
+python -m benchmarks.structured_validation --claims 500 --evidence 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from copy import deepcopy
+from typing import Any
+
+from tabletalk.interfaces import validate_structured_value
+from tabletalk.runtime import _ANSWER_SCHEMA
+
+
+def baseline_validate(value: Any, schema: dict[str, Any], path: str = "$") -> None:
+    """The previous interpreter over schema dicts, kept as the comparison baseline."""
+    expected = schema.get("type")
+    allowed = (expected,) if isinstance(expected, str) else tuple(expected or ())
+    matches = {
+        "object": lambda item: isinstance(item, dict),
+        "array": lambda item: isinstance(item, list),
+        "string": lambda item: isinstance(item, str),
+        "integer": lambda item: isinstance(item, int) and not isinstance(item, bool),
+        "number": lambda item: isinstance(item, (int, float)) and not isinstance(item, bool),
+        "boolean": lambda item: isinstance(item, bool),
+        "null": lambda item: item is None,
+    }
+    if allowed and not any(kind in matches and matches[kind](value) for kind in allowed):
+        raise ValueError(f"Structured output {path} must have type {' or '.join(allowed)}")
+    if isinstance(value, dict) and "object" in allowed:
+        properties = schema.get("properties") or {}
+        missing = [name for name in schema.get("required") or () if name not in value]
+        if missing:
+            raise ValueError(f"Structured output {path} is missing: {', '.join(missing)}")
+        if schema.get("additionalProperties") is False:
+            extras = set(value) - set(properties)
+            if extras:
+                raise ValueError(
+                    f"Structured output {path} has unexpected fields: {', '.join(sorted(extras))}"
+                )
+        for name, item in value.items():
+            if name in properties:
+                baseline_validate(item, properties[name], f"{path}.{name}")
+    if isinstance(value, list) and "array" in allowed and isinstance(schema.get("items"), dict):
+        for index, item in enumerate(value):
+            baseline_validate(item, schema["items"], f"{path}[{index}]")
+
+
+def sample_answer(claims: int, evidence: int) -> dict[str, Any]:
+    return {
+        "text": "Revenue by customer for July 2026.",
+        "claims": [
+            {
+                "text": f"Customer {index} recognized ${index * 12.37:,.2f}.",
+                "evidence": [
+                    {"row": index, "column": f"column_{cell}"} for cell in range(evidence)
+                ],
+            }
+            for index in range(claims)
+        ],
+    }
+
+
+def broken_answers(answer: dict[str, Any]) -> list[dict[str, Any]]:
+    """Invalid variants whose error messages must match the baseline exactly."""
+    last = len(answer["claims"]) - 1
+    variants = [deepcopy(answer) for _ in range(4)]
+    variants[0]["claims"][last]["evidence"][-1]["row"] = "7"
+    del variants[1]["claims"][last]["text"]
+    variants[2]["claims"][last]["evidence"][0]["extra"] = True
+    variants[3]["claims"] = {}
+    return variants
+
+
+def error(function: Callable[[], Any]) -> str | None:
+    try:
+        function()
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(claims: int, evidence: int, repeat: int) -> dict[str, Any]:
+    answer = sample_answer(claims, evidence)
+    for variant in [answer, *broken_answers(answer)]:
+        expected = error(lambda: baseline_validate(variant, _ANSWER_SCHEMA))
+        if error(lambda: validate_structured_value(variant, _ANSWER_SCHEMA)) != expected:
+            raise SystemExit("Compiled validation disagrees with the baseline")
+    return {
+        "benchmark": "structured_validation",
+        "claims": claims,
+        "evidence_items": claims * evidence,
+        "baseline_ms": measure(lambda: baseline_validate(answer, _ANSWER_SCHEMA), repeat),
+        "current_ms": measure(lambda: validate_structured_value(answer, _ANSWER_SCHEMA), repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=500)
+    parser.add_argument("--evidence", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    print(json.dumps(run(arguments.claims, arguments.evidence, arguments.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Trace serialization throughput for large evidence results.
+
+python -m benchmarks.trace_serialization --rows 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from tabletalk import traces
+from tabletalk.traces import (
+    Answer,
+    Claim,
+    DbtContext,
+    Evidence,
+    Interpretation,
+    ResultTrace,
+    SQLTrace,
+    Trace,
+    Usage,
+    Verification,
+)
+
+
+def reflective_json_value(value: Any) -> Any:
+    """The original recursive encoder, kept as the comparison baseline."""
+    if dataclasses.is_dataclass(value):
+        return {
+            item.name: reflective_json_value(getattr(value, item.name))
+            for item in dataclasses.fields(value)
+        }
+    if isinstance(value, dict):
+        return {str(key): reflective_json_value(item) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [reflective_json_value(item) for item in value]
+    if isinstance(value, (Decimal, date, datetime)):
+        return str(value)
+    return value
+
+
+def sample_trace(row_count: int) -> Trace:
+    rows = tuple(
+        {
+            "order_id": index,
+            "order_date": date(2026, 7, 1 + index % 28),
+            "loaded_at": datetime(2026, 7, 1, tzinfo=timezone.utc),
+            "recognized_revenue": Decimal(index) / 4,
+            "customer_id": f"C{index:05d}",
+            "region": None,
+        }
+        for index in range(row_count)
+    )
+    return Trace(
+        question="What was recognized revenue by order?",
+        interpretation=Interpretation("list", ("recognized_revenue",), ("order_id",)),
+        dbt_context=DbtContext(
+            "0" * 64, None, ("model.analytics.fct_orders",), ("order_id", "recognized_revenue")
+        ),
+        sql=SQLTrace("select 1", "select 1", "duckdb"),
+        result=ResultTrace(rows, row_count),
+        answer=Answer("Revenue by order.", (Claim("Order 0 had 0.", (Evidence(0, "order_id"),)),)),
+        verification=(Verification("claims_supported", True),),
+        agent="revenue",
+        agent_digest="0" * 64,
+        model_identity="stub:model",
+        warehouse_identity="duckdb",
+        usage=Usage(latency_ms=1),
+    )
+
+
+def measure(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(rows: int, repeat: int) -> dict[str, Any]:
+    trace = sample_trace(rows)
+    orjson = traces._orjson
+    results = {
+        "reflective_dict_then_json_ms": measure(
+            lambda: json.dumps(reflective_json_value(trace), indent=2, sort_keys=True).encode(),
+            repeat,
+        ),
+        "generated_dict_then_json_ms": measure(
+            lambda: json.dumps(trace.to_dict(), indent=2, sort_keys=True).encode(), repeat
+        ),
+    }
+    if orjson is not None:
+        results["orjson_direct_ms"] = measure(trace.to_json, repeat)
+    return {"benchmark": "trace_serialization", "rows": rows, **results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+    print(json.dumps(run(arguments.rows, arguments.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
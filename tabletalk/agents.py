@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import re
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from tabletalk.evidence import EvidencePolicy
 from tabletalk.manifest import Manifest, Node
 
 
@@ -41,6 +44,8 @@ class Agent:
     reject_if_contains: tuple[str, ...] = ()
     max_rows: int = 1000
     timeout_seconds: int = 60
+    prompt_evidence: EvidencePolicy = EvidencePolicy()
+    trace_evidence: EvidencePolicy = EvidencePolicy()
     source_path: Path | None = None
 
     def __post_init__(self) -> None:
@@ -53,6 +58,10 @@ class Agent:
             raise AgentError("Agent description must be a non-empty string")
         if not self.select:
             raise AgentError("Agent select must contain at least one dbt selector")
+        if self.prompt_evidence.mode == "summary":
+            raise AgentError(
+                "Agent evidence.prompt cannot be summary; the model must see rows to cite them"
+            )
 
     @classmethod
     def load(cls, path: str | Path) -> Agent:
@@ -88,6 +97,14 @@ class Agent:
             or timeout_seconds < 1
         ):
             raise AgentError("Agent timeout_seconds must be a positive integer")
+        evidence = payload.get("evidence") or {}
+        if not isinstance(evidence, dict) or set(evidence) - {"prompt", "trace"}:
+            raise AgentError("Agent evidence must be a mapping with optional prompt and trace")
+        try:
+            prompt_evidence = EvidencePolicy.from_config(evidence.get("prompt"))
+            trace_evidence = EvidencePolicy.from_config(evidence.get("trace"))
+        except ValueError as exc:
+            raise AgentError(f"Agent {exc}") from exc
         return cls(
             name=name.strip(),
             description=" ".join(description.split()),
@@ -101,6 +118,8 @@ class Agent:
             reject_if_contains=_strings(payload.get("reject_if_contains"), "reject_if_contains"),
             max_rows=max_rows,
             timeout_seconds=timeout_seconds,
+            prompt_evidence=prompt_evidence,
+            trace_evidence=trace_evidence,
             source_path=source,
         )
 
@@ -128,6 +147,13 @@ class Agent:
             payload["max_rows"] = self.max_rows
         if self.timeout_seconds != 60:
             payload["timeout_seconds"] = self.timeout_seconds
+        evidence = {
+            name: policy.to_config()
+            for name, policy in (("prompt", self.prompt_evidence), ("trace", self.trace_evidence))
+            if policy != EvidencePolicy()
+        }
+        if evidence:
+            payload["evidence"] = evidence
         return yaml.safe_dump(payload, sort_keys=False, allow_unicode=True)
 
     @property
@@ -207,7 +233,8 @@ class ResolvedAgent:
             values.setdefault(node.alias.lower(), []).append(node.unique_id)
         return {key: tuple(ids) for key, ids in values.items() if len(ids) > 1}
 
-    def prompt_context(self) -> str:
+    @cached_property
+    def _prompt_context(self) -> str:
         lines: list[str] = []
         for node in self.nodes:
             relation = node.relation_name or f"{node.schema}.{node.alias}".strip(".")
@@ -223,9 +250,9 @@ class ResolvedAgent:
             if node.description:
                 lines.append(f"  Description: {node.description}")
             if node.parents:
-                lines.append("  Upstream lineage: " + ", ".join(node.parents))
+                lines.append("  Upstream lineage: " + ", ".join(sorted(node.parents)))
             if node.children:
-                lines.append("  Downstream lineage: " + ", ".join(node.children))
+                lines.append("  Downstream lineage: " + ", ".join(sorted(node.children)))
             if node.columns:
                 lines.append(
                     "  Columns: "
@@ -261,16 +288,30 @@ class ResolvedAgent:
                 lines.append(
                     "  Tests: "
                     + ", ".join(
-                        f"{test.name}({test.arguments})" if test.arguments else test.name
+                        f"{test.name}({_canonical(test.arguments)})"
+                        if test.arguments
+                        else test.name
                         for test in node.tests
                     )
                 )
             if node.constraints:
-                lines.append(f"  Declared constraints: {node.constraints}")
+                lines.append(f"  Declared constraints: {_canonical(node.constraints)}")
             if node.meta.get("joins"):
-                lines.append(f"  Explicit join metadata: {node.meta['joins']}")
+                lines.append(f"  Explicit join metadata: {_canonical(node.meta['joins'])}")
         return "\n".join(lines)
 
+    def prompt_context(self) -> str:
+        """The selected resources for the query prompt, byte-identical for an unchanged manifest.
+
+        Lineage is sorted and metadata mappings are serialized with sorted keys so that a
+        provider's prompt prefix cache survives manifest reloads; the text is built once.
+        """
+        return self._prompt_context
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
 
 def load_agents(directory: str | Path) -> tuple[Agent, ...]:
     root = Path(directory)
@@ -7,7 +7,10 @@ import logging
 import os
 import re
 import sys
+import time
+from collections.abc import Iterator
 from copy import deepcopy
+from dataclasses import replace
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
@@ -30,22 +33,35 @@ from tabletalk.authoring import (
 )
 from tabletalk.connections import available_targets, load_profile_target
 from tabletalk.evals import (
+    EVAL_MODES,
+    AdaptiveTrials,
     EvalCase,
     EvalRunner,
     EvalSuite,
     ResultExpectation,
     SuiteResult,
+    baseline_fingerprints,
+    dumps_results,
+    load_case_latencies,
     load_eval_suite,
+    merge_shard_results,
+    shard_cases,
 )
 from tabletalk.manifest import Manifest, Node
+from tabletalk.profiling import PROFILE_FORMATS, CommandProfiler
 from tabletalk.project import Project
+from tabletalk.responses import RESPONSE_MODES
+from tabletalk.store import TraceStore, parse_time_bound, statistics_rows, summarize_traces
+from tabletalk.synthetic import SyntheticSpec, write_project
 from tabletalk.traces import Interpretation as TraceInterpretation
-from tabletalk.traces import Trace
+from tabletalk.traces import Trace, dumps
 
 console = Console()
+error_console = Console(stderr=True)
 EXIT_OPERATIONAL_FAILURE = 1
 EXIT_EVAL_FAILURE = 3
 EXIT_VALIDATION_FAILURE = 4
+_PROJECT_ROOT = "tabletalk.project_root"
 
 
 def _fail(error: Exception, code: int = EXIT_OPERATIONAL_FAILURE) -> None:
@@ -55,10 +71,15 @@ def _fail(error: Exception, code: int = EXIT_OPERATIONAL_FAILURE) -> None:
 
 def _project(path: str) -> Project:
     try:
-        return Project.load(path)
+        project = Project.load(path)
     except Exception as exc:
         _fail(exc, EXIT_VALIDATION_FAILURE)
         raise AssertionError("unreachable")
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        # Shared by every context of the invocation, so `--profile` can find the project root.
+        ctx.meta[_PROJECT_ROOT] = project.root
+    return project
 
 
 def _find_dbt_project(start: Path) -> Path:
@@ -137,6 +158,31 @@ def _print_trace(trace: Trace) -> None:
     for check in trace.verification:
         checks.add_row(check.name, "PASS" if check.passed else "FAIL", check.message)
     console.print(checks)
+    _print_usage(trace)
+
+
+def _print_usage(trace: Trace) -> None:
+    usage = trace.usage
+    if not usage.stages:
+        return
+    timings = Table(title=f"Latency {usage.latency_ms:.0f} ms", show_header=True)
+    timings.add_column("Stage")
+    timings.add_column("ms", justify="right")
+    timings.add_column("Share", justify="right")
+    for stage, milliseconds in usage.stages.items():
+        share = milliseconds / usage.latency_ms if usage.latency_ms else 0
+        timings.add_row(stage, f"{milliseconds:.1f}", f"{share:.0%}")
+    console.print(timings)
+    if usage.calls:
+        console.print(
+            "Model calls: "
+            + ", ".join(
+                f"{call.stage} {call.latency_ms:.0f} ms "
+                f"({call.prompt_tokens if call.prompt_tokens is not None else '?'} in / "
+                f"{call.completion_tokens if call.completion_tokens is not None else '?'} out)"
+                for call in usage.calls
+            )
+        )
 
 
 def _prompt_selectors(manifest: Manifest) -> tuple[tuple[str, ...], bool, bool]:
@@ -215,19 +261,78 @@ def _print_scope(nodes: tuple[Node, ...], catalog_available: bool) -> None:
 
 def _persist_eval_result(project: Project, result: SuiteResult) -> Path:
     result_dir = project.root / ".tabletalk" / "eval-results" / result.agent
-    timestamp = datetime.now(timezone.utc).isoformat().replace(":", "-")
-    target = result_dir / f"{timestamp}-{result.suite_digest[:12]}.json"
+    created_at = datetime.now(timezone.utc).isoformat()
+    target = result_dir / f"{created_at.replace(':', '-')}-{result.suite_digest[:12]}.json"
     result_dir.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(result.to_dict(), indent=2, sort_keys=True) + "\n")
+    target.write_bytes(result.to_json() + b"\n")
+    if project.trace_store:
+        project.trace_store.add_suite_result(result, created_at)
     return target
 
 
 @click.group()
 @click.version_option(__version__)
 @click.option("--verbose", is_flag=True)
-def cli(verbose: bool) -> None:
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Profile the command, write the profile under .tabletalk/profiles, and print hot spots.",
+)
+@click.option(
+    "--profile-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Write profiles here instead of the project's .tabletalk/profiles.",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(PROFILE_FORMATS),
+    default="pstats",
+    show_default=True,
+    help="pstats uses cProfile; speedscope samples the stacks of every thread.",
+)
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    verbose: bool,
+    profile: bool,
+    profile_dir: Path | None,
+    profile_format: str,
+) -> None:
     """Evaluate and observe natural-language agents over an existing dbt project."""
     logging.basicConfig(level=logging.DEBUG if verbose else logging.WARNING, stream=sys.stderr)
+    if profile:
+        profiler = CommandProfiler(profile_format)
+        profiler.start()
+        ctx.call_on_close(
+            lambda: _finish_profile(ctx, profiler, ctx.invoked_subcommand or "cli", profile_dir)
+        )
+
+
+def _finish_profile(
+    ctx: click.Context, profiler: CommandProfiler, command: str, profile_dir: Path | None
+) -> None:
+    """Stop `profiler` and write it to `profile_dir`, the loaded project, or the current folder."""
+    profiler.stop()
+    root = ctx.meta.get(_PROJECT_ROOT, Path("."))
+    target = profiler.write(profile_dir or root / ".tabletalk" / "profiles", command)
+    summary = profiler.summary()
+    elapsed = sum(cost.self_seconds for cost in summary) or 1
+    table = Table(title=f"Profile: {command}")
+    table.add_column("Subsystem")
+    table.add_column("Self s", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("Hottest functions")
+    for cost in summary:
+        table.add_row(
+            cost.name,
+            f"{cost.self_seconds:.3f}",
+            f"{cost.self_seconds / elapsed:.0%}",
+            "\n".join(
+                f"{function.label} {function.self_seconds:.3f}s" for function in cost.functions
+            ),
+        )
+    error_console.print(table)
+    error_console.print(f"Profile written to {target}")
 
 
 @cli.command()
@@ -621,6 +726,9 @@ def eval_create(
         saved_suite.agent,
         (saved_case_result,),
         saved_suite.digest,
+        node_fingerprints=runtime.manifest.fingerprints(
+            node.unique_id for node in runtime.agent.nodes
+        ),
     )
     result_path = _persist_eval_result(project, saved_result)
     label = "VERIFIED" if saved_case_result.passed else "FAILING REGRESSION"
@@ -629,6 +737,15 @@ def eval_create(
     console.print(f"[dim]Verification record: {result_path}[/dim]")
 
 
+def _shard(value: str | None) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    match = re.fullmatch(r"(\d+)/(\d+)", value.strip())
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise click.BadParameter(f"'{value}' is not I/N with 1 <= I <= N", param_hint="--shard")
+    return int(match.group(1)), int(match.group(2))
+
+
 @eval.command("run")
 @click.argument("agent_name", required=False)
 @click.option("--case", "case_name")
@@ -637,6 +754,46 @@ def eval_create(
     type=click.IntRange(1, 20),
     help="Override the number of independent trials declared by each suite.",
 )
+@click.option(
+    "--adaptive",
+    is_flag=True,
+    help="Stop each case's trials once its pass rate is settled and give the saved budget "
+    "to flaky cases; suites may also declare adaptive.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(1, 32),
+    help="Cases in flight at once; model calls overlap with other cases' queries. "
+    "Defaults to 1, or 32 with --mode sql-replay.",
+)
+@click.option(
+    "--mode",
+    type=click.Choice(EVAL_MODES),
+    default="live",
+    show_default=True,
+    help="sql-replay skips the model and re-runs each case's last passing generated SQL.",
+)
+@click.option(
+    "--responses",
+    type=click.Choice(RESPONSE_MODES),
+    help="Record model responses, replay them, or both; overrides llm.responses.",
+)
+@click.option(
+    "--shard",
+    callback=lambda ctx, param, value: _shard(value),
+    metavar="I/N",
+    help="Run only shard I of N; every runner given the same cases computes the same split.",
+)
+@click.option(
+    "--shard-latencies",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Balance shards by the case latencies in this 'eval latencies' file.",
+)
+@click.option(
+    "--impacted-since",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Run only cases that use dbt nodes changed since this manifest.json or eval result.",
+)
 @click.option("--project-folder", default=".", type=click.Path(file_okay=False))
 @click.option(
     "--format", "output_format", type=click.Choice(["terminal", "json"]), default="terminal"
@@ -645,84 +802,513 @@ def eval_run(
     agent_name: str | None,
     case_name: str | None,
     trials: int | None,
+    adaptive: bool,
+    concurrency: int | None,
+    mode: str,
+    responses: str | None,
+    shard: tuple[int, int] | None,
+    shard_latencies: str | None,
+    impacted_since: str | None,
     project_folder: str,
     output_format: str,
 ) -> None:
     project = _project(project_folder)
-    paths = sorted(
-        (*project.evals_directory.glob("*.yaml"), *project.evals_directory.glob("*.yml"))
-    )
+    shard_label = f"{shard[0]}/{shard[1]}" if shard else None
+    replay = mode == "sql-replay"
+    concurrency = concurrency or (32 if replay else 1)
+    store = _trace_store(project) if replay else None
+    changed: set[str] | None = None
+    if impacted_since:
+        try:
+            changed = project.manifest.changed_nodes(baseline_fingerprints(impacted_since))
+        except Exception as exc:
+            _fail(exc, EXIT_VALIDATION_FAILURE)
+    latencies = None
+    if shard_latencies:
+        try:
+            latencies = load_case_latencies(shard_latencies)
+        except Exception as exc:
+            _fail(exc, EXIT_VALIDATION_FAILURE)
+    skipped = 0
     results = []
     try:
-        for path in paths:
-            suite = load_eval_suite(path)
-            if agent_name and suite.agent != agent_name:
+        suites = [
+            suite
+            for suite in _eval_suites(project)
+            if (not agent_name or suite.agent == agent_name)
+            and (not case_name or any(case.name == case_name for case in suite.cases))
+        ]
+        assigned = None
+        if shard:
+            assigned = shard_cases(
+                [(suite.agent, suite.name, case.name) for suite in suites for case in suite.cases],
+                *shard,
+                latencies,
+            )
+        for suite in suites:
+            # Replayed SQL is deterministic, so sql-replay runs each suite once.
+            trial_count = 1 if replay else trials or suite.trials
+            only: list[str] | None = None
+            if assigned is not None:
+                only = [
+                    case.name
+                    for case in suite.cases
+                    if (suite.agent, suite.name, case.name) in assigned
+                ]
+                if not only:
+                    continue
+            runtime = project.runtime(suite.agent, responses=responses)
+            runner = EvalRunner(suite, runtime, concurrency=concurrency)
+            if changed is not None:
+                case_nodes = (
+                    project.trace_store.case_nodes(suite.agent, suite.name)
+                    if project.trace_store
+                    else {}
+                )
+                impacted = [
+                    name
+                    for name in runner.impacted_cases(changed, case_nodes)
+                    if only is None or name in only
+                ]
+                skipped += len(suite.cases if only is None else only) - len(impacted)
+                only = impacted
+            if only is not None and (not only or (case_name and case_name not in only)):
                 continue
-            if case_name and all(case.name != case_name for case in suite.cases):
+            policy = suite.adaptive or (AdaptiveTrials() if adaptive else None)
+            if policy and not replay:
+                result = runner.run_adaptive(trial_count, case_name, policy=policy, only=only)
+                result = replace(result, shard=shard_label)
+                results.append(result)
+                _persist_eval_result(project, result)
                 continue
-            trial_count = trials or suite.trials
-            runtime = project.runtime(suite.agent)
             for trial in range(1, trial_count + 1):
-                raw_result = EvalRunner(suite, runtime).run(case_name)
-                result = SuiteResult(
-                    raw_result.name,
-                    raw_result.agent,
-                    raw_result.cases,
-                    raw_result.suite_digest,
-                    trial,
-                    trial_count,
+                raw_result = (
+                    runner.replay_sql(
+                        store.approved_sql(suite.agent, suite.name), case_name, only=only
+                    )
+                    if store
+                    else runner.run(case_name, only=only)
                 )
+                result = replace(raw_result, trial=trial, trials=trial_count, shard=shard_label)
                 results.append(result)
                 _persist_eval_result(project, result)
     except Exception as exc:
         _fail(exc)
-    if not results:
+    if not results and changed is None and shard is None:
         _fail(ValueError("No matching eval suites were found"), EXIT_VALIDATION_FAILURE)
     if output_format == "json":
-        click.echo(json.dumps([result.to_dict() for result in results], indent=2, sort_keys=True))
+        click.echo(dumps_results(results).decode())
     else:
-        for result in results:
-            suffix = f" — trial {result.trial}/{result.trials}" if result.trials > 1 else ""
-            console.print(f"[bold]{result.name}{suffix}[/bold]")
-            for case in result.cases:
-                console.print(
-                    f"{'[green]PASS[/green]' if case.passed else '[red]FAIL[/red]'} {case.name}"
-                )
-                for check in case.checks:
-                    console.print(f"  {'✓' if check.passed else '✗'} {check.name} {check.message}")
-        if any(result.trials > 1 for result in results):
-            passed = sum(result.passed for result in results)
-            rate = passed / len(results)
-            console.print(f"[bold]Trial pass rate: {passed}/{len(results)} ({rate:.1%})[/bold]")
+        if changed is not None:
+            console.print(f"[dim]Skipped {skipped} eval cases unaffected by dbt changes[/dim]")
+        if shard_label:
+            cases = sum(len(result.cases) for result in results if result.trial == 1)
+            console.print(f"[dim]Shard {shard_label}: {cases} eval cases[/dim]")
+        _print_eval_results(results)
+    if any(not result.passed for result in results):
+        raise click.exceptions.Exit(EXIT_EVAL_FAILURE)
+
+
+@eval.command("merge")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option("--project-folder", default=".", type=click.Path(file_okay=False))
+@click.option(
+    "--format", "output_format", type=click.Choice(["terminal", "json"]), default="terminal"
+)
+def eval_merge(paths: tuple[str, ...], project_folder: str, output_format: str) -> None:
+    """Combine 'eval run --shard' results into one report.
+
+    PATHS are eval-result files or directories; the default is .tabletalk/eval-results.
+    """
+    project = _project(project_folder)
+    sources = [Path(path) for path in paths] or [project.root / ".tabletalk" / "eval-results"]
+    files = [
+        file
+        for source in sources
+        for file in (sorted(source.rglob("*.json")) if source.is_dir() else [source])
+    ]
+    try:
+        records = []
+        # Persisted names start with their UTC timestamp, so name order is oldest first.
+        for file in sorted(files, key=lambda file: file.name):
+            payload = json.loads(file.read_text())
+            for record in payload if isinstance(payload, list) else [payload]:
+                if isinstance(record, dict) and record.get("shard"):
+                    records.append(SuiteResult.from_dict(record))
+        results = merge_shard_results(records, _eval_suites(project))
+    except (OSError, ValueError) as exc:
+        _fail(exc, EXIT_VALIDATION_FAILURE)
+    if not results:
+        _fail(ValueError("No sharded eval results were found"), EXIT_VALIDATION_FAILURE)
+    if output_format == "json":
+        click.echo(dumps_results(results).decode())
+    else:
+        _print_eval_results(results)
+        cases = [case for result in results for case in result.cases]
+        passed = sum(case.passed for case in cases)
+        console.print(
+            f"[bold]Case pass rate: {passed}/{len(cases)} ({passed / len(cases):.1%})[/bold]"
+        )
     if any(not result.passed for result in results):
         raise click.exceptions.Exit(EXIT_EVAL_FAILURE)
 
 
+@eval.command("latencies")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write to a file, not stdout.")
+@click.option("--project-folder", default=".", type=click.Path(file_okay=False))
+def eval_latencies(output: str | None, project_folder: str) -> None:
+    """Export mean eval case latencies from unsharded trace history.
+
+    Commit the file or share it between CI runners and pass it to 'eval run --shard-latencies',
+    so every shard balances on the same numbers.
+    """
+    store = _trace_store(_project(project_folder))
+    records = [
+        {"agent": agent, "suite": suite, "case": case, "latency_ms": round(latency, 3)}
+        for (agent, suite, case), latency in sorted(store.case_latencies().items())
+    ]
+    text = json.dumps(records, indent=2) + "\n"
+    if output:
+        Path(output).write_text(text)
+        console.print(f"Wrote {len(records)} case latencies to {output}")
+    else:
+        click.echo(text, nl=False)
+
+
+def _eval_suites(project: Project) -> list[EvalSuite]:
+    paths = sorted(
+        (*project.evals_directory.glob("*.yaml"), *project.evals_directory.glob("*.yml"))
+    )
+    return [load_eval_suite(path) for path in paths]
+
+
+def _print_eval_results(results: list[SuiteResult]) -> None:
+    for result in results:
+        suffix = f" — trial {result.trial}/{result.trials}" if result.trials > 1 else ""
+        console.print(f"[bold]{result.name}{suffix}[/bold]")
+        for case in result.cases:
+            console.print(
+                f"{'[green]PASS[/green]' if case.passed else '[red]FAIL[/red]'} {case.name}"
+            )
+            if case.pass_rate:
+                interval = case.pass_rate
+                console.print(
+                    f"  pass rate {interval.passes}/{interval.trials} "
+                    f"(interval {interval.lower:.0%}–{interval.upper:.0%})"
+                )
+            for check in case.checks:
+                console.print(f"  {'✓' if check.passed else '✗'} {check.name} {check.message}")
+    if any(result.trials > 1 for result in results):
+        passed = sum(result.passed for result in results)
+        rate = passed / len(results)
+        console.print(f"[bold]Trial pass rate: {passed}/{len(results)} ({rate:.1%})[/bold]")
+
+
 @cli.command()
 @click.argument("agent_name")
-@click.argument("question", nargs=-1, required=True)
+@click.argument("question", nargs=-1)
 @click.option("--project-folder", default=".", type=click.Path(file_okay=False))
 @click.option(
     "--format", "output_format", type=click.Choice(["terminal", "json"]), default="terminal"
 )
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print the answer as it is generated; with --format json, emit one event per line.",
+)
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    help="Answer every question in a JSON lines file ('-' for stdin) instead of QUESTION.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(1),
+    default=4,
+    show_default=True,
+    help="Concurrent model calls in --batch mode.",
+)
+@click.option(
+    "--rate-limit",
+    type=click.FloatRange(0, min_open=True),
+    help="Most questions to start per second in --batch mode.",
+)
 def ask(
-    agent_name: str, question: tuple[str, ...], project_folder: str, output_format: str
+    agent_name: str,
+    question: tuple[str, ...],
+    project_folder: str,
+    output_format: str,
+    stream: bool,
+    batch: str | None,
+    workers: int,
+    rate_limit: float | None,
 ) -> None:
     """Ask through the same inspected runtime used by eval cases."""
+    if batch is not None:
+        if question or stream:
+            raise click.UsageError("--batch cannot be combined with QUESTION or --stream")
+        _ask_batch(_project(project_folder), agent_name, batch, output_format, workers, rate_limit)
+        return
+    if not question:
+        raise click.UsageError("Missing argument 'QUESTION...' (or use --batch)")
     project = _project(project_folder)
     question_text = " ".join(question)
     try:
-        trace = project.answer(agent_name, question_text)
+        if stream:
+            trace = _stream_answer(project, agent_name, question_text, output_format)
+        else:
+            trace = project.answer(agent_name, question_text)
     except Exception as exc:
         _fail(exc)
-    if output_format == "json":
-        click.echo(json.dumps(trace.to_dict(), indent=2, sort_keys=True))
-    else:
+    if output_format == "terminal":
         _print_trace(trace)
+    elif not stream:
+        click.echo(trace.to_json().decode())
     if not trace.passed:
         raise click.exceptions.Exit(EXIT_VALIDATION_FAILURE)
 
 
+def _batch_questions(path: str) -> Iterator[str]:
+    """Questions from JSON lines that are strings or objects with a `question` field."""
+    with click.open_file(path) as lines:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{number}: invalid JSON: {exc.msg}") from exc
+            if isinstance(record, dict):
+                record = record.get("question")
+            if not isinstance(record, str) or not record.strip():
+                raise ValueError(f"{path}:{number}: expected a question string")
+            yield record
+
+
+def _ask_batch(
+    project: Project,
+    agent_name: str,
+    path: str,
+    output_format: str,
+    workers: int,
+    rate_limit: float | None,
+) -> None:
+    """Stream one trace per line (or one status line in the terminal) and summarize the batch."""
+    traces: list[Trace] = []
+    errors = 0
+    started = time.perf_counter()
+    try:
+        for index, outcome in project.answer_many(
+            agent_name, _batch_questions(path), workers=workers, rate_limit=rate_limit
+        ):
+            if isinstance(outcome, Exception):
+                errors += 1
+                if output_format == "json":
+                    click.echo(json.dumps({"index": index, "error": str(outcome)}))
+                else:
+                    console.print(f"[red]ERROR[/red] #{index}: {outcome}")
+                continue
+            traces.append(outcome)
+            if output_format == "json":
+                click.echo(outcome.to_json(indent=False).decode())
+            else:
+                status = "[green]PASS[/green]" if outcome.passed else "[red]FAIL[/red]"
+                console.print(f"{status} #{index} {outcome.question}")
+    except Exception as exc:
+        _fail(exc)
+    elapsed = time.perf_counter() - started
+    summary = statistics_rows([summarize_traces(traces, "batch")])[0]
+    summary.update(
+        errors=errors,
+        seconds=round(elapsed, 3),
+        questions_per_second=round((len(traces) + errors) / elapsed, 2) if elapsed else None,
+    )
+    if output_format == "json":
+        error_console.print_json(json.dumps(summary))
+    else:
+        table = Table(show_header=True, header_style="bold magenta")
+        for column in ("Answered", "Errors", "Failure rate", "p50 ms", "p95 ms", "p99 ms"):
+            table.add_column(column, justify="right")
+        table.add_column("Tokens in/out", justify="right")
+        table.add_column("Questions/s", justify="right")
+        table.add_row(
+            str(summary["count"]),
+            str(errors),
+            f"{summary['failure_rate']:.1%}",
+            *(
+                f"{summary[name]:.0f}" if summary[name] is not None else "—"
+                for name in ("p50_ms", "p95_ms", "p99_ms")
+            ),
+            f"{summary['prompt_tokens']}/{summary['completion_tokens']}",
+            f"{summary['questions_per_second']}",
+        )
+        error_console.print(table)
+    if errors or summary["failures"]:
+        raise click.exceptions.Exit(EXIT_VALIDATION_FAILURE)
+
+
+def _stream_answer(project: Project, agent_name: str, question: str, output_format: str) -> Trace:
+    trace: Trace | None = None
+    for event in project.answer_stream(agent_name, question):
+        if output_format == "json":
+            click.echo(dumps(event, indent=False).decode())
+        elif event.kind == "interpretation":
+            console.print(f"[dim]Interpretation: {event.value.intent or 'unspecified'}[/dim]")
+        elif event.kind == "sql":
+            console.print(Panel(Syntax(event.value, "sql", word_wrap=True), title="Executed SQL"))
+        elif event.kind == "text":
+            click.echo(event.value, nl=False)
+        if event.kind == "trace":
+            trace = event.value
+    if output_format != "json":
+        click.echo()
+    if trace is None:
+        raise ValueError("The answer stream ended without a trace")
+    return trace
+
+
+def _trace_store(project: Project) -> TraceStore:
+    if project.trace_store is None:
+        _fail(
+            ValueError("The trace store is disabled by trace_store: false"), EXIT_VALIDATION_FAILURE
+        )
+        raise AssertionError("unreachable")
+    return project.trace_store
+
+
+@cli.group()
+def runs() -> None:
+    """Query the indexed history of live runs and eval results."""
+
+
+@runs.command("query")
+@click.option("--project-folder", default=".", type=click.Path(file_okay=False))
+@click.option("--agent", "agent_name")
+@click.option("--kind", type=click.Choice(["run", "eval"]))
+@click.option("--suite")
+@click.option("--model", "model_identity", help="Model identity such as openai:gpt-4o.")
+@click.option("--manifest-digest")
+@click.option("--since", help="ISO date/datetime or a window such as 24h, 7d, or 2w.")
+@click.option("--until", help="ISO date/datetime upper bound (exclusive).")
+@click.option(
+    "--bucket", type=click.Choice(["hour", "day", "month", "all"]), default="day", show_default=True
+)
+@click.option(
+    "--format", "output_format", type=click.Choice(["terminal", "json"]), default="terminal"
+)
+def runs_query(
+    project_folder: str,
+    agent_name: str | None,
+    kind: str | None,
+    suite: str | None,
+    model_identity: str | None,
+    manifest_digest: str | None,
+    since: str | None,
+    until: str | None,
+    bucket: str,
+    output_format: str,
+) -> None:
+    """Report latency percentiles, token usage, and failure rates over time windows."""
+    project = _project(project_folder)
+    store = _trace_store(project)
+    try:
+        statistics = store.statistics(
+            bucket=bucket,
+            since=parse_time_bound(since) if since else None,
+            until=parse_time_bound(until) if until else None,
+            agent=agent_name,
+            kind=kind,
+            suite=suite,
+            model_identity=model_identity,
+            manifest_digest=manifest_digest,
+        )
+    except ValueError as exc:
+        _fail(exc, EXIT_VALIDATION_FAILURE)
+    rows = statistics_rows(statistics)
+    if output_format == "json":
+        click.echo(json.dumps(rows, indent=2, sort_keys=True))
+        return
+    if not rows:
+        console.print("[dim]No indexed runs match these filters.[/dim]")
+        return
+    table = Table(show_header=True, header_style="bold magenta")
+    for column in ("Bucket", "Runs", "Failure rate", "p50 ms", "p95 ms", "p99 ms", "Tokens in/out"):
+        table.add_column(column, justify="left" if column == "Bucket" else "right")
+    for row in rows:
+        table.add_row(
+            row["bucket"],
+            str(row["count"]),
+            f"{row['failure_rate']:.1%}",
+            *(
+                f"{row[name]:.0f}" if row[name] is not None else "—"
+                for name in ("p50_ms", "p95_ms", "p99_ms")
+            ),
+            f"{row['prompt_tokens']}/{row['completion_tokens']}",
+        )
+    console.print(table)
+
+
+@runs.command("list")
+@click.option("--project-folder", default=".", type=click.Path(file_okay=False))
+@click.option("--agent", "agent_name")
+@click.option("--kind", type=click.Choice(["run", "eval"]))
+@click.option("--failed", is_flag=True, help="Only runs with a failing verification.")
+@click.option("--since", help="ISO date/datetime or a window such as 24h, 7d, or 2w.")
+@click.option("--limit", type=click.IntRange(1), default=20, show_default=True)
+def runs_list(
+    project_folder: str,
+    agent_name: str | None,
+    kind: str | None,
+    failed: bool,
+    since: str | None,
+    limit: int,
+) -> None:
+    """List recent traces from the index without loading their evidence rows."""
+    project = _project(project_folder)
+    store = _trace_store(project)
+    try:
+        traces = tuple(
+            store.traces(
+                since=parse_time_bound(since) if since else None,
+                limit=limit,
+                agent=agent_name,
+                kind=kind,
+                passed=False if failed else None,
+            )
+        )
+    except ValueError as exc:
+        _fail(exc, EXIT_VALIDATION_FAILURE)
+    table = Table(show_header=True, header_style="bold magenta")
+    for column in ("Created", "Agent", "Status", "Latency ms", "Rows", "Question"):
+        table.add_column(column)
+    for trace in traces:
+        table.add_row(
+            trace.created_at[:19],
+            trace.agent,
+            "PASS" if trace.passed else "FAIL",
+            f"{trace.usage.latency_ms:.0f}",
+            str(trace.result.row_count),
+            trace.question,
+        )
+    console.print(table)
+
+
+@runs.command("index")
+@click.option("--project-folder", default=".", type=click.Path(file_okay=False))
+def runs_index(project_folder: str) -> None:
+    """Backfill the trace store from JSON records under .tabletalk."""
+    project = _project(project_folder)
+    store = _trace_store(project)
+    try:
+        added = sum(
+            store.import_directory(project.root / ".tabletalk" / folder)
+            for folder in ("runs", "eval-results")
+        )
+    except ValueError as exc:
+        _fail(exc)
+    console.print(f"Indexed {added} new records; {store.count()} total in {store.path}")
+
+
 @cli.command()
 @click.option("--project-folder", default=".", type=click.Path(file_okay=False))
 @click.option("--connect/--no-connect", default=True)
@@ -828,5 +1414,60 @@ def doctor(project_folder: str, connect: bool) -> None:
         raise click.exceptions.Exit(EXIT_VALIDATION_FAILURE)
 
 
+@cli.command()
+@click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--models", default=1000, show_default=True, type=click.IntRange(1))
+@click.option("--columns", default=12, show_default=True, type=click.IntRange(4))
+@click.option("--depth", default=4, show_default=True, type=click.IntRange(1))
+@click.option("--fan-out", default=3, show_default=True, type=click.IntRange(1))
+@click.option("--groups", default=10, show_default=True, type=click.IntRange(1))
+@click.option("--tags", default=25, show_default=True, type=click.IntRange(0))
+@click.option("--packages", default=1, show_default=True, type=click.IntRange(1))
+@click.option("--tests", default=2, show_default=True, type=click.IntRange(0, 4))
+@click.option("--sources", default=0, type=click.IntRange(0), help="Default: one per 50 models.")
+@click.option("--rows", default=100, show_default=True, type=click.IntRange(0))
+@click.option("--seed", default=0, show_default=True, type=int)
+@click.option("--tables/--no-tables", default=True, help="Create matching DuckDB tables.")
+def synthetic(
+    directory: Path,
+    models: int,
+    columns: int,
+    depth: int,
+    fan_out: int,
+    groups: int,
+    tags: int,
+    packages: int,
+    tests: int,
+    sources: int,
+    rows: int,
+    seed: int,
+    tables: bool,
+) -> None:
+    """Generate a deterministic synthetic dbt project for benchmarks and load tests."""
+    try:
+        spec = SyntheticSpec(
+            models=models,
+            columns=columns,
+            depth=depth,
+            fan_out=fan_out,
+            groups=groups,
+            tags=tags,
+            packages=packages,
+            tests=tests,
+            sources=sources,
+            seed=seed,
+        )
+        manifest_path = write_project(spec, directory, rows=rows, tables=tables)
+        summary = Manifest.load(manifest_path).summary
+    except Exception as exc:
+        _fail(exc, EXIT_VALIDATION_FAILURE)
+    console.print(f"[bold green]Synthetic project written to {directory}.[/bold green]")
+    console.print(
+        f"Models: {summary.model_count} · groups: {len(summary.groups)} · "
+        f"tags: {len(summary.tags)} · packages: {len(summary.packages)}"
+    )
+    console.print(f"Manifest: {manifest_path}")
+
+
 if __name__ == "__main__":
     cli()
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import re
+import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from dataclasses import dataclass
 from pathlib import Path
@@ -12,6 +13,7 @@ from typing import Any
 import yaml
 
 from tabletalk.factories import get_db_provider, resolve_env_vars
+from tabletalk.instrumentation import SIZE_BUCKETS, get_instrumentation
 from tabletalk.interfaces import DatabaseProvider
 
 SUPPORTED_ADAPTERS = ("sqlite", "duckdb", "snowflake")
@@ -151,16 +153,53 @@ class ReadOnlyConnection:
         return self.target.identity
 
     def execute(self, sql: str, timeout_seconds: int) -> tuple[dict[str, Any], ...]:
+        return self.execute_timed(sql, timeout_seconds)[0]
+
+    def execute_timed(
+        self, sql: str, timeout_seconds: int
+    ) -> tuple[tuple[dict[str, Any], ...], dict[str, float]]:
+        """Execute with a timeout, returning rows and the provider's execute/fetch milliseconds."""
+        instrumentation = get_instrumentation()
+        adapter = self.target.adapter
+        started = time.perf_counter()
+        with instrumentation.span("tabletalk.warehouse.query", adapter=adapter) as span:
+            try:
+                rows, timings = self._execute_timed(sql, timeout_seconds)
+            except Exception as exc:
+                instrumentation.count(
+                    "tabletalk_query_errors_total", adapter=adapter, error=type(exc).__name__
+                )
+                raise
+            finally:
+                instrumentation.observe(
+                    "tabletalk_query_duration_ms",
+                    (time.perf_counter() - started) * 1000,
+                    adapter=adapter,
+                )
+            if instrumentation.enabled:
+                size = sum(len(str(value)) for row in rows for value in row.values())
+                span.set(rows=len(rows), bytes=size)
+                instrumentation.observe(
+                    "tabletalk_query_rows", len(rows), buckets=SIZE_BUCKETS, adapter=adapter
+                )
+                instrumentation.observe(
+                    "tabletalk_query_bytes", size, buckets=SIZE_BUCKETS, adapter=adapter
+                )
+        return rows, timings
+
+    def _execute_timed(
+        self, sql: str, timeout_seconds: int
+    ) -> tuple[tuple[dict[str, Any], ...], dict[str, float]]:
         executor = ThreadPoolExecutor(max_workers=1)
-        future = executor.submit(self.provider.execute_query, sql)
+        future = executor.submit(self.provider.execute_query_timed, sql)
         try:
-            rows = future.result(timeout=timeout_seconds)
+            rows, timings = future.result(timeout=timeout_seconds)
         except TimeoutError as exc:
             future.cancel()
             executor.shutdown(wait=False, cancel_futures=True)
             raise ConnectionError(f"Query exceeded the {timeout_seconds}s timeout") from exc
         executor.shutdown(wait=True)
-        return tuple(dict(row) for row in rows)
+        return tuple(dict(row) for row in rows), timings
 
     def ping(self) -> None:
         self.execute("select 1 as tabletalk_health", 10)
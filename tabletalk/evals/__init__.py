@@ -3,21 +3,29 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import math
 import re
-from collections.abc import Iterable
-from dataclasses import dataclass, replace
+from collections.abc import Collection, Hashable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Any
+from statistics import NormalDist, median
+from typing import Any, TypeVar
 
 import yaml
 
 from tabletalk.manifest import Manifest
 from tabletalk.runtime import RejectionError, Runtime
-from tabletalk.traces import Trace, Verification
-from tabletalk.validation import SQLValidationError, validate_sql
+from tabletalk.traces import Trace, Verification, dumps
+from tabletalk.validation import SQLValidationError, ValidatedSQL, validate_sql
+
+EVAL_MODES = ("live", "sql-replay")
+MAX_CASE_TRIALS = 20
+
+K = TypeVar("K", bound=Hashable)
 
 
 class EvalError(ValueError):
@@ -84,6 +92,62 @@ class EvalCase:
         return bool(self.reference_sql) or self.result.rows is not None or self.result.value_set
 
 
+@dataclass(frozen=True)
+class AdaptiveTrials:
+    """Stop a case's trials once its Wilson pass-rate interval lies above or below `threshold`."""
+
+    threshold: float = 0.5
+    confidence: float = 0.95
+    min_trials: int = 2
+
+    def __post_init__(self) -> None:
+        if not 0 < self.threshold < 1 or not 0 < self.confidence < 1:
+            raise EvalError("adaptive threshold and confidence must be between 0 and 1")
+        if (
+            not isinstance(self.min_trials, int)
+            or isinstance(self.min_trials, bool)
+            or not 1 <= self.min_trials <= MAX_CASE_TRIALS
+        ):
+            raise EvalError(
+                f"adaptive min_trials must be an integer from 1 through {MAX_CASE_TRIALS}"
+            )
+        if self.trials_to_pass > MAX_CASE_TRIALS:
+            raise EvalError(
+                f"adaptive threshold {self.threshold} cannot be reached at confidence "
+                f"{self.confidence} within {MAX_CASE_TRIALS} trials"
+            )
+
+    @property
+    def trials_to_pass(self) -> int:
+        """Fewest consecutive passes whose interval lies above the threshold."""
+        return next(
+            (
+                trials
+                for trials in range(self.min_trials, MAX_CASE_TRIALS + 1)
+                if wilson_interval(trials, trials, self.confidence)[0] >= self.threshold
+            ),
+            MAX_CASE_TRIALS + 1,
+        )
+
+    def settled(self, passes: int, trials: int) -> bool:
+        if trials < self.min_trials:
+            return False
+        lower, upper = wilson_interval(passes, trials, self.confidence)
+        return lower >= self.threshold or upper < self.threshold
+
+
+def wilson_interval(passes: int, trials: int, confidence: float = 0.95) -> tuple[float, float]:
+    """Wilson score interval for a pass rate; `(0.0, 1.0)` before any trial."""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rate = passes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
 @dataclass(frozen=True)
 class EvalSuite:
     name: str
@@ -93,6 +157,7 @@ class EvalSuite:
     description: str = ""
     kind: str = "regression"
     trials: int = 1
+    adaptive: AdaptiveTrials | None = None
 
     def __post_init__(self) -> None:
         if not self.name.strip() or not self.agent.strip():
@@ -104,9 +169,11 @@ class EvalSuite:
         if (
             not isinstance(self.trials, int)
             or isinstance(self.trials, bool)
-            or not 1 <= self.trials <= 20
+            or not 1 <= self.trials <= MAX_CASE_TRIALS
         ):
-            raise EvalError("Eval suite trials must be an integer from 1 through 20")
+            raise EvalError(
+                f"Eval suite trials must be an integer from 1 through {MAX_CASE_TRIALS}"
+            )
         names = [case.name for case in self.cases]
         if len(names) != len(set(names)):
             raise EvalError("Eval case names must be unique within a suite")
@@ -117,6 +184,14 @@ class EvalSuite:
         return hashlib.sha256(raw).hexdigest()
 
 
+@dataclass(frozen=True)
+class PassRate:
+    passes: int
+    trials: int
+    lower: float
+    upper: float
+
+
 @dataclass(frozen=True)
 class CaseResult:
     name: str
@@ -124,6 +199,7 @@ class CaseResult:
     checks: tuple[Verification, ...]
     trace: Trace | None = None
     error: str | None = None
+    pass_rate: PassRate | None = None
 
 
 @dataclass(frozen=True)
@@ -134,12 +210,51 @@ class SuiteResult:
     suite_digest: str
     trial: int = 1
     trials: int = 1
+    node_fingerprints: dict[str, str] = field(default_factory=dict)
+    shard: str | None = None
 
     @property
     def passed(self) -> bool:
         return all(case.passed for case in self.cases)
 
+    @classmethod
+    def from_dict(cls, record: dict[str, Any]) -> SuiteResult:
+        """Rebuild a persisted eval-result record."""
+        try:
+            cases = tuple(
+                CaseResult(
+                    str(case["name"]),
+                    bool(case["passed"]),
+                    tuple(Verification(**check) for check in case.get("checks") or ()),
+                    Trace.from_dict(case["trace"]) if case.get("trace") else None,
+                    case.get("error"),
+                    PassRate(**case["pass_rate"]) if case.get("pass_rate") else None,
+                )
+                for case in record["cases"]
+            )
+            return cls(
+                str(record["name"]),
+                str(record["agent"]),
+                cases,
+                str(record["suite_digest"]),
+                int(record.get("trial") or 1),
+                int(record.get("trials") or 1),
+                dict(record.get("node_fingerprints") or {}),
+                record.get("shard"),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise EvalError(f"Invalid eval-result record: {exc}") from exc
+
     def to_dict(self) -> dict[str, Any]:
+        record = self._record()
+        for case in record["cases"]:
+            case["trace"] = case["trace"].to_dict() if case["trace"] else None
+        return record
+
+    def to_json(self, *, indent: bool = True) -> bytes:
+        return dumps(self._record(), indent=indent)
+
+    def _record(self) -> dict[str, Any]:
         return {
             "name": self.name,
             "agent": self.agent,
@@ -153,13 +268,21 @@ class SuiteResult:
                     "passed": case.passed,
                     "error": case.error,
                     "checks": [vars(check) for check in case.checks],
-                    "trace": case.trace.to_dict() if case.trace else None,
+                    "trace": case.trace,
+                    **({"pass_rate": vars(case.pass_rate)} if case.pass_rate else {}),
                 }
                 for case in self.cases
             ],
+            "node_fingerprints": self.node_fingerprints,
+            "shard": self.shard,
         }
 
 
+def dumps_results(results: Iterable[SuiteResult], *, indent: bool = True) -> bytes:
+    """Serialize several suite results as one JSON array without intermediate trace dicts."""
+    return dumps([result._record() for result in results], indent=indent)
+
+
 def _strings(value: Any, field_name: str) -> tuple[str, ...]:
     if value is None:
         return ()
@@ -236,6 +359,17 @@ def load_eval_suite(path: str | Path) -> EvalSuite:
     trials = payload.get("trials", 1)
     if not isinstance(description, str) or not isinstance(kind, str):
         raise EvalError("Eval suite description and kind must be strings")
+    adaptive_raw = payload.get("adaptive")
+    adaptive = None
+    if adaptive_raw is True:
+        adaptive = AdaptiveTrials()
+    elif adaptive_raw is not None and adaptive_raw is not False:
+        options = _mapping(adaptive_raw, "adaptive")
+        adaptive = AdaptiveTrials(
+            threshold=float(options.get("threshold", 0.5)),
+            confidence=float(options.get("confidence", 0.95)),
+            min_trials=options.get("min_trials", 2),
+        )
     return EvalSuite(
         name,
         agent,
@@ -244,9 +378,117 @@ def load_eval_suite(path: str | Path) -> EvalSuite:
         description.strip(),
         kind.strip(),
         trials,
+        adaptive,
     )
 
 
+def baseline_fingerprints(path: str | Path) -> dict[str, str]:
+    """Node fingerprints from a previous dbt manifest.json or persisted eval-result JSON."""
+    source = Path(path).expanduser().resolve()
+    try:
+        payload = json.loads(source.read_text())
+    except (OSError, json.JSONDecodeError) as exc:
+        raise EvalError(f"Could not load baseline {source}: {exc}") from exc
+    if isinstance(payload, dict) and "nodes" in payload and "metadata" in payload:
+        return Manifest(source, payload).fingerprints()
+    fingerprints: dict[str, str] = {}
+    for record in payload if isinstance(payload, list) else [payload]:
+        if not isinstance(record, dict) or "cases" not in record:
+            raise EvalError(f"{source} is not a dbt manifest or eval-result record")
+        fingerprints.update(record.get("node_fingerprints") or {})
+    if not fingerprints:
+        raise EvalError(f"{source} records no node fingerprints; use a newer eval result")
+    return fingerprints
+
+
+def shard_cases(
+    keys: Sequence[K],
+    shard: int,
+    shards: int,
+    latencies: Mapping[K, float] | None = None,
+) -> set[K]:
+    """Keys assigned to 1-based `shard` of `shards`, balanced by latency when it is given.
+
+    Keys are placed longest first on the least loaded shard, with ties broken by a stable hash of
+    the key, so every process given the same keys and latencies computes the same partition.
+    Without latencies every key weighs the same and the split depends on the keys alone; keys
+    missing from `latencies` count as its median.
+    """
+    if not 1 <= shard <= shards:
+        raise EvalError(f"Shard {shard}/{shards} is out of range")
+    known = latencies or {}
+    default = median(known.values()) if known else 1.0
+    loads = [0.0] * shards
+    assigned: set[K] = set()
+    for key in sorted(
+        keys,
+        key=lambda key: (-known.get(key, default), hashlib.sha256(repr(key).encode()).digest()),
+    ):
+        target = min(range(shards), key=lambda index: (loads[index], index))
+        loads[target] += known.get(key, default)
+        if target == shard - 1:
+            assigned.add(key)
+    return assigned
+
+
+def load_case_latencies(path: str | Path) -> dict[tuple[str, str, str], float]:
+    """Case latencies written by `tabletalk eval latencies`, keyed by agent, suite, and case."""
+    source = Path(path).expanduser()
+    try:
+        records = json.loads(source.read_text())
+        if not isinstance(records, list):
+            raise TypeError("expected a JSON list of case latencies")
+        return {
+            (str(record["agent"]), str(record["suite"]), str(record["case"])): float(
+                record["latency_ms"]
+            )
+            for record in records
+        }
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
+        raise EvalError(f"Could not load case latencies {source}: {exc}") from exc
+
+
+def merge_shard_results(
+    results: Iterable[SuiteResult], suites: Iterable[EvalSuite] = ()
+) -> list[SuiteResult]:
+    """Combine sharded suite results, given oldest first, into one result per suite trial.
+
+    A later result for the same shard replaces an earlier one, and only the shard count of the
+    latest result of each suite trial is kept. Cases of a matching `suites` definition that no
+    shard ran are reported as failed, so merged pass rates count every case.
+    """
+    groups: dict[tuple[str, str, str, int, int], dict[str, SuiteResult]] = {}
+    for result in results:
+        if result.shard is None:
+            continue
+        key = (result.agent, result.name, result.suite_digest, result.trial, result.trials)
+        shards = groups.setdefault(key, {})
+        shards.pop(result.shard, None)
+        shards[result.shard] = result
+    definitions = {(suite.agent, suite.name, suite.digest): suite for suite in suites}
+    merged: list[SuiteResult] = []
+    for (agent, name, digest, trial, trials), shards in groups.items():
+        count = next(reversed(shards)).split("/")[1]
+        parts = [result for label, result in shards.items() if label.split("/")[1] == count]
+        cases = {case.name: case for result in parts for case in result.cases}
+        suite = definitions.get((agent, name, digest))
+        if suite is not None:
+            missing = "Case was not run by any shard"
+            for case in suite.cases:
+                if case.name not in cases:
+                    check = Verification("shard_coverage", False, missing)
+                    cases[case.name] = CaseResult(case.name, False, (check,), error=missing)
+            order = {case.name: index for index, case in enumerate(suite.cases)}
+            cases = dict(sorted(cases.items(), key=lambda item: order.get(item[0], len(order))))
+        fingerprints: dict[str, str] = {}
+        for result in parts:
+            fingerprints.update(result.node_fingerprints)
+        merged.append(
+            SuiteResult(name, agent, tuple(cases.values()), digest, trial, trials, fingerprints)
+        )
+    return merged
+
+
 def render_reference_sql(sql: str, manifest: Manifest) -> str:
     pattern = re.compile(r"\{\{\s*ref\(['\"]([^'\"]+)['\"]\)\s*\}\}")
 
@@ -263,31 +505,147 @@ def render_reference_sql(sql: str, manifest: Manifest) -> str:
 
 
 class EvalRunner:
-    def __init__(self, suite: EvalSuite, runtime: Runtime) -> None:
+    def __init__(self, suite: EvalSuite, runtime: Runtime, *, concurrency: int = 1) -> None:
         self.suite = suite
         self.runtime = runtime
-
-    def run(self, case_name: str | None = None) -> SuiteResult:
-        cases = [case for case in self.suite.cases if case_name is None or case.name == case_name]
+        self.concurrency = concurrency
+
+    def run(
+        self, case_name: str | None = None, *, only: Collection[str] | None = None
+    ) -> SuiteResult:
+        cases = [
+            case
+            for case in self.suite.cases
+            if case_name in {None, case.name} and (only is None or case.name in only)
+        ]
         if not cases:
             raise EvalError(f"Eval case '{case_name}' was not found")
-        results = tuple(self._run_case(case) for case in cases)
-        return SuiteResult(self.suite.name, self.suite.agent, results, self.suite.digest)
+        if self.concurrency > 1 and len(cases) > 1:
+            outcomes = self.runtime.answer_many(
+                [case.question for case in cases],
+                llm_workers=self.concurrency,
+                warehouse_workers=self.concurrency,
+            )
+            results = tuple(
+                self._failed_case(case, outcome)
+                if isinstance(outcome, Exception)
+                else self.evaluate_trace(case, outcome)
+                for case, outcome in zip(cases, outcomes)
+            )
+        else:
+            results = tuple(self._run_case(case) for case in cases)
+        return self._suite_result(results)
+
+    def run_adaptive(
+        self,
+        trials: int,
+        case_name: str | None = None,
+        *,
+        policy: AdaptiveTrials | None = None,
+        only: Collection[str] | None = None,
+    ) -> SuiteResult:
+        """Spend `trials` per case on average, stopping each case once its pass rate is settled.
+
+        Every round runs one more trial of each unsettled case, least certain first, until the
+        budget is spent or no case can be settled further. Trials saved on stable cases go to
+        flaky ones, up to MAX_CASE_TRIALS each. A case passes when its interval lies above the
+        threshold, so `trials` below `policy.trials_to_pass` is rejected: such a budget could
+        never pass every case.
+        """
+        policy = policy or self.suite.adaptive or AdaptiveTrials()
+        if trials < policy.trials_to_pass:
+            raise EvalError(
+                f"Adaptive runs of '{self.suite.name}' need trials of at least "
+                f"{policy.trials_to_pass} to pass a case at threshold {policy.threshold} and "
+                f"confidence {policy.confidence}; got {trials}. Set trials explicitly."
+            )
+        names = [
+            case.name
+            for case in self.suite.cases
+            if case_name in {None, case.name} and (only is None or case.name in only)
+        ]
+        if not names:
+            raise EvalError(f"Eval case '{case_name}' was not found")
+        budget = trials * len(names)
+        outcomes: dict[str, list[CaseResult]] = {name: [] for name in names}
+
+        def width(name: str) -> float:
+            passes = sum(result.passed for result in outcomes[name])
+            lower, upper = wilson_interval(passes, len(outcomes[name]), policy.confidence)
+            return upper - lower
+
+        while budget > 0:
+            unsettled = [
+                name
+                for name in names
+                if len(outcomes[name]) < MAX_CASE_TRIALS
+                and not policy.settled(
+                    sum(result.passed for result in outcomes[name]), len(outcomes[name])
+                )
+            ]
+            if not unsettled:
+                break
+            batch = sorted(unsettled, key=width, reverse=True)[:budget]
+            budget -= len(batch)
+            for result in self.run(only=batch).cases:
+                outcomes[result.name].append(result)
+        return self._suite_result(
+            tuple(_aggregate(outcomes[name], policy) for name in names),
+        )
+
+    def _suite_result(self, cases: tuple[CaseResult, ...]) -> SuiteResult:
+        scope = (node.unique_id for node in self.runtime.agent.nodes)
+        return SuiteResult(
+            self.suite.name,
+            self.suite.agent,
+            cases,
+            self.suite.digest,
+            node_fingerprints=self.runtime.manifest.fingerprints(scope),
+        )
+
+    def impacted_cases(
+        self, changed: Collection[str], case_nodes: Mapping[str, Iterable[str]]
+    ) -> tuple[str, ...]:
+        """Names of cases that could be affected by the `changed` dbt unique IDs.
+
+        A case is impacted when a changed node appears in its last traced nodes (`case_nodes`,
+        normally from `TraceStore.case_nodes`), its reference SQL, or its required models. Cases
+        with none of these, or whose reference SQL no longer validates, are always impacted.
+        """
+        impacted: list[str] = []
+        for case in self.suite.cases:
+            used = set(case_nodes.get(case.name, ())) | set(case.required_models)
+            if case.reference_sql:
+                try:
+                    validated = self._validate(
+                        render_reference_sql(case.reference_sql, self.runtime.manifest)
+                    )
+                except ValueError:
+                    impacted.append(case.name)
+                    continue
+                used.update(node.unique_id for node in validated.nodes)
+            if not used or not used.isdisjoint(changed):
+                impacted.append(case.name)
+        return tuple(impacted)
 
     def _run_case(self, case: EvalCase) -> CaseResult:
         try:
             trace = self.runtime.answer(case.question)
         except Exception as exc:
-            expected_exception = (
-                case.expected_outcome == "ambiguity" and isinstance(exc, RejectionError)
-            ) or (
-                case.expected_outcome == "rejection"
-                and isinstance(exc, (RejectionError, SQLValidationError))
-            )
-            check = Verification("expected_outcome", expected_exception, str(exc))
-            return CaseResult(case.name, check.passed, (check,), error=str(exc))
+            return self._failed_case(case, exc)
         return self.evaluate_trace(case, trace)
 
+    @staticmethod
+    def _failed_case(case: EvalCase, exc: Exception) -> CaseResult:
+        expected_exception = (
+            case.expected_outcome == "ambiguity" and isinstance(exc, RejectionError)
+        ) or (
+            case.expected_outcome == "rejection"
+            and isinstance(exc, (RejectionError, SQLValidationError))
+        )
+        check = Verification("expected_outcome", expected_exception, str(exc))
+        return CaseResult(case.name, check.passed, (check,), error=str(exc))
+
     def evaluate_trace(self, case: EvalCase, trace: Trace) -> CaseResult:
         """Apply deterministic expectations to an already executed live trace."""
         expected_failure = case.expected_outcome in {"ambiguity", "rejection"}
@@ -298,52 +656,127 @@ class EvalRunner:
                 "Agent answered" if not expected_failure else "Expected rejection",
             )
         ]
-        selected = set(trace.dbt_context.selected_nodes)
-        used_columns = set(trace.dbt_context.columns)
         checks.extend(
-            [
-                Verification(
-                    "required_models",
-                    set(case.required_models) <= selected,
-                    _difference(case.required_models, selected),
-                ),
-                Verification(
-                    "forbidden_models",
-                    not (set(case.forbidden_models) & selected),
-                    _intersection(case.forbidden_models, selected),
-                ),
-                Verification(
-                    "required_columns",
-                    set(case.required_columns) <= used_columns,
-                    _difference(case.required_columns, used_columns),
-                ),
-                Verification(
-                    "forbidden_columns",
-                    not (set(case.forbidden_columns) & used_columns),
-                    _intersection(case.forbidden_columns, used_columns),
-                ),
-                Verification(
-                    "supported_claims",
-                    trace.passed,
-                    "; ".join(
-                        f"{check.name}: {check.message or 'failed'}"
-                        for check in trace.verification
-                        if not check.passed
-                    ),
+            self._scope_checks(
+                case, set(trace.dbt_context.selected_nodes), set(trace.dbt_context.columns)
+            )
+        )
+        checks.append(
+            Verification(
+                "supported_claims",
+                trace.passed,
+                "; ".join(
+                    f"{check.name}: {check.message or 'failed'}"
+                    for check in trace.verification
+                    if not check.passed
                 ),
-            ]
+            )
         )
+        checks.extend(self._result_checks(case, trace.result.rows))
+        # Comparisons above used the complete result; the recorded trace follows the agent's
+        # trace evidence policy.
+        trace = self.runtime.persistable(replace(trace, eval_suite_digest=self.suite.digest))
+        return CaseResult(case.name, all(check.passed for check in checks), tuple(checks), trace)
+
+    def replay_sql(
+        self,
+        approved_sql: Mapping[str, str],
+        case_name: str | None = None,
+        *,
+        only: Collection[str] | None = None,
+    ) -> SuiteResult:
+        """Re-validate and execute each case's approved generated SQL without calling the model.
+
+        `approved_sql` maps case names to SQL, normally from `TraceStore.approved_sql`. Only
+        cases that expect an answer are replayed; up to `concurrency` cases run at once.
+        """
+        cases = [
+            case
+            for case in self.suite.cases
+            if case.expected_outcome == "answer"
+            and case_name in {None, case.name}
+            and (only is None or case.name in only)
+        ]
+        if not cases:
+            raise EvalError(f"Eval case '{case_name}' was not found or does not expect an answer")
+        with ThreadPoolExecutor(
+            min(self.concurrency, len(cases)), thread_name_prefix="tabletalk-replay"
+        ) as pool:
+            results = tuple(
+                pool.map(lambda case: self._replay_case(case, approved_sql.get(case.name)), cases)
+            )
+        return self._suite_result(results)
+
+    def _replay_case(self, case: EvalCase, sql: str | None) -> CaseResult:
+        if not sql:
+            message = "No passing eval trace recorded generated SQL for this case"
+            check = Verification("approved_sql", False, message)
+            return CaseResult(case.name, False, (check,), error=message)
+        try:
+            validated = self._validate(sql)
+            rows = tuple(
+                self.runtime.connection.execute(
+                    validated.executed, self.runtime.agent.source.timeout_seconds
+                )
+            )
+        except Exception as exc:
+            check = Verification("approved_sql", False, str(exc))
+            return CaseResult(case.name, False, (check,), error=str(exc))
+        checks = [
+            Verification("approved_sql", True, "Replayed without a model call"),
+            *self._scope_checks(
+                case, {node.unique_id for node in validated.nodes}, set(validated.columns)
+            ),
+            *self._result_checks(case, rows),
+        ]
+        return CaseResult(case.name, all(check.passed for check in checks), tuple(checks))
+
+    def _validate(self, sql: str) -> ValidatedSQL:
+        return validate_sql(
+            sql,
+            self.runtime.manifest,
+            self.runtime.agent.nodes,
+            dialect=self.runtime.connection.dialect,
+            max_rows=self.runtime.agent.source.max_rows,
+            allow_sensitive=self.runtime.agent.source.allow_sensitive,
+        )
+
+    @staticmethod
+    def _scope_checks(
+        case: EvalCase, selected: set[str], used_columns: set[str]
+    ) -> tuple[Verification, ...]:
+        return (
+            Verification(
+                "required_models",
+                set(case.required_models) <= selected,
+                _difference(case.required_models, selected),
+            ),
+            Verification(
+                "forbidden_models",
+                not (set(case.forbidden_models) & selected),
+                _intersection(case.forbidden_models, selected),
+            ),
+            Verification(
+                "required_columns",
+                set(case.required_columns) <= used_columns,
+                _difference(case.required_columns, used_columns),
+            ),
+            Verification(
+                "forbidden_columns",
+                not (set(case.forbidden_columns) & used_columns),
+                _intersection(case.forbidden_columns, used_columns),
+            ),
+        )
+
+    def _result_checks(
+        self, case: EvalCase, rows: tuple[dict[str, Any], ...]
+    ) -> list[Verification]:
+        checks: list[Verification] = []
         expected_rows = case.result.rows or ()
         if case.reference_sql:
             try:
-                sql = render_reference_sql(case.reference_sql, self.runtime.manifest)
-                validated_reference = validate_sql(
-                    sql,
-                    self.runtime.manifest,
-                    self.runtime.agent.nodes,
-                    dialect=self.runtime.connection.dialect,
-                    max_rows=self.runtime.agent.source.max_rows,
-                    allow_sensitive=self.runtime.agent.source.allow_sensitive,
+                validated_reference = self._validate(
+                    render_reference_sql(case.reference_sql, self.runtime.manifest)
                 )
                 expected_rows = self.runtime.connection.execute(
                     validated_reference.executed,
@@ -353,17 +786,17 @@ class EvalRunner:
             except Exception as exc:
                 checks.append(Verification("reference_query", False, str(exc)))
         if case.reference_sql or case.result.rows is not None or case.result.value_set:
-            checks.append(_compare_result(trace.result.rows, expected_rows, case.result))
+            checks.append(_compare_result(rows, expected_rows, case.result))
         if case.result.row_count is not None:
             checks.append(
                 Verification(
                     "row_count",
-                    len(trace.result.rows) == case.result.row_count,
-                    f"expected {case.result.row_count}, got {len(trace.result.rows)}",
+                    len(rows) == case.result.row_count,
+                    f"expected {case.result.row_count}, got {len(rows)}",
                 )
             )
         if case.result.columns:
-            actual_columns = set(trace.result.rows[0]) if trace.result.rows else set()
+            actual_columns = set(rows[0]) if rows else set()
             checks.append(
                 Verification(
                     "shape",
@@ -371,8 +804,22 @@ class EvalRunner:
                     f"expected {case.result.columns}, got {tuple(actual_columns)}",
                 )
             )
-        trace = replace(trace, eval_suite_digest=self.suite.digest)
-        return CaseResult(case.name, all(check.passed for check in checks), tuple(checks), trace)
+        return checks
+
+
+def _aggregate(results: list[CaseResult], policy: AdaptiveTrials) -> CaseResult:
+    passes = sum(result.passed for result in results)
+    lower, upper = wilson_interval(passes, len(results), policy.confidence)
+    passed = lower >= policy.threshold
+    # Report the latest trial that agrees with the verdict, so its checks explain it.
+    representative = next(
+        (result for result in reversed(results) if result.passed == passed), results[-1]
+    )
+    return replace(
+        representative,
+        passed=passed,
+        pass_rate=PassRate(passes, len(results), lower, upper),
+    )
 
 
 def _difference(required: Iterable[str], actual: set[str]) -> str:
@@ -529,10 +976,20 @@ def _unordered_equal(
 
 
 __all__ = [
+    "EVAL_MODES",
+    "MAX_CASE_TRIALS",
+    "AdaptiveTrials",
     "EvalCase",
     "EvalRunner",
     "EvalSuite",
+    "PassRate",
     "SuiteResult",
+    "baseline_fingerprints",
+    "dumps_results",
+    "load_case_latencies",
     "load_eval_suite",
+    "merge_shard_results",
     "render_reference_sql",
+    "shard_cases",
+    "wilson_interval",
 ]
@@ -0,0 +1,224 @@
+"""Evidence row policies for the answer prompt and for persisted traces."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from tabletalk.traces import ResultTrace, Trace, result_digest
+
+EVIDENCE_MODES = ("full", "head_tail", "sample", "summary")
+
+
+@dataclass(frozen=True)
+class EvidencePolicy:
+    """How many result rows to keep: all, the first/last, a stratified sample, or none.
+
+    Every mode that drops rows also records a per-column aggregate summary.
+    """
+
+    mode: str = "full"
+    rows: int = 50
+    stratify_by: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.mode not in EVIDENCE_MODES:
+            raise ValueError(f"evidence mode must be one of: {', '.join(EVIDENCE_MODES)}")
+        if not isinstance(self.rows, int) or isinstance(self.rows, bool) or self.rows < 1:
+            raise ValueError("evidence rows must be a positive integer")
+
+    @classmethod
+    def from_config(cls, value: Any) -> EvidencePolicy:
+        if value is None:
+            return cls()
+        if isinstance(value, str):
+            return cls(mode=value)
+        if not isinstance(value, dict):
+            raise ValueError("evidence policy must be a mode name or a mapping")
+        unknown = set(value) - {"mode", "rows", "stratify_by"}
+        if unknown:
+            raise ValueError(f"evidence policy has unknown fields: {', '.join(sorted(unknown))}")
+        stratify_by = value.get("stratify_by")
+        return cls(
+            mode=str(value.get("mode") or "full"),
+            rows=value.get("rows", 50),
+            stratify_by=str(stratify_by) if stratify_by else None,
+        )
+
+    def to_config(self) -> dict[str, Any]:
+        config: dict[str, Any] = {"mode": self.mode, "rows": self.rows}
+        if self.stratify_by:
+            config["stratify_by"] = self.stratify_by
+        return config
+
+    def select(self, rows: tuple[dict[str, Any], ...]) -> tuple[int, ...]:
+        """Return the original row indexes this policy keeps, in result order."""
+        count = len(rows)
+        if self.mode == "full" or (self.mode != "summary" and count <= self.rows):
+            return tuple(range(count))
+        if self.mode == "summary":
+            return ()
+        if self.mode == "head_tail":
+            head = (self.rows + 1) // 2
+            return tuple(range(head)) + tuple(range(count - (self.rows - head), count))
+        return _stratified(rows, self.rows, self.stratify_by)
+
+
+def summarize(rows: tuple[dict[str, Any], ...]) -> dict[str, dict[str, Any]]:
+    summary: dict[str, dict[str, Any]] = {}
+    for column in rows[0] if rows else ():
+        values = [row.get(column) for row in rows]
+        present = [value for value in values if value is not None]
+        stats: dict[str, Any] = {"nulls": len(values) - len(present)}
+        if present and all(_numeric(value) for value in present):
+            total = sum(present)
+            stats.update(
+                min=min(present), max=max(present), sum=total, mean=float(total) / len(present)
+            )
+        elif present:
+            try:
+                stats.update(min=min(present), max=max(present))
+            except TypeError:
+                stats.update(min=min(map(str, present)), max=max(map(str, present)))
+            stats["distinct"] = len({_stratum(value) for value in present})
+        summary[column] = stats
+    return summary
+
+
+def compact_result(
+    result: ResultTrace, policy: EvidencePolicy, keep: Iterable[int] = ()
+) -> ResultTrace:
+    """Apply `policy` to a complete result, always retaining the `keep` row indexes."""
+    rows = result.rows
+    if policy.mode == "full" or result.indexes is not None:
+        return result
+    indexes = sorted(set(policy.select(rows)) | {index for index in keep if 0 <= index < len(rows)})
+    if len(indexes) == len(rows):
+        return result
+    return replace(
+        result,
+        rows=tuple(rows[index] for index in indexes),
+        digest=result.digest or result_digest(rows),
+        indexes=tuple(indexes),
+        summary=summarize(rows),
+    )
+
+
+def compact_trace(trace: Trace, policy: EvidencePolicy) -> Trace:
+    """The persisted form of `trace`: policy rows plus every row a claim cites."""
+    cited = (item.row for claim in trace.answer.claims for item in claim.evidence)
+    compacted = compact_result(trace.result, policy, cited)
+    return trace if compacted is trace.result else replace(trace, result=compacted)
+
+
+def encode_rows(rows: tuple[dict[str, Any], ...], indexes: Iterable[int] | None = None) -> str:
+    """Pipe-delimited evidence table: one header, then `row|cell|...` with original row indexes.
+
+    Nulls are `NULL`; decimals, dates, and times use their plain text form; strings are JSON-quoted
+    only when they would otherwise be ambiguous.
+    """
+    selected = range(len(rows)) if indexes is None else indexes
+    columns = tuple(rows[0]) if rows else ()
+    lines = ["|".join(["row", *map(_cell, columns)])]
+    lines.extend(
+        "|".join([str(index), *(_cell(rows[index].get(column)) for column in columns)])
+        for index in selected
+    )
+    return "\n".join(lines)
+
+
+def encode_summary(summary: dict[str, dict[str, Any]]) -> str:
+    """One `column: stat=value ...` line per summarized column."""
+    return "\n".join(
+        f"{column}: " + " ".join(f"{name}={_cell(value)}" for name, value in stats.items())
+        for column, stats in summary.items()
+    )
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, Decimal)):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    text = value if isinstance(value, str) else str(value)
+    if (
+        not text
+        or text != text.strip()
+        or text in {"NULL", "true", "false"}
+        or any(character in text for character in '|"\n\r\\')
+    ):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def _stratum(value: Any) -> Hashable:
+    if isinstance(value, (date, datetime, Decimal)):
+        return str(value)
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+def _stratified(
+    rows: tuple[dict[str, Any], ...], limit: int, column: str | None
+) -> tuple[int, ...]:
+    """Deterministic proportional sample with at least one row from each stratum."""
+    if column is None:
+        column = next(
+            (
+                name
+                for name, value in (rows[0] if rows else {}).items()
+                if isinstance(value, str) and not _numeric(value)
+            ),
+            None,
+        )
+    groups: dict[Hashable, list[int]] = {}
+    for index, row in enumerate(rows):
+        key = _stratum(row.get(column)) if column else None
+        groups.setdefault(key, []).append(index)
+    ordered = sorted(groups.values(), key=lambda group: (-len(group), group[0]))
+    if len(ordered) >= limit:
+        return tuple(sorted(group[0] for group in ordered[:limit]))
+    quotas = [1] * len(ordered)
+    spare = limit - len(ordered)
+    capacity = sum(len(group) - 1 for group in ordered)
+    for position, group in enumerate(ordered):
+        quotas[position] += min(len(group) - 1, spare * (len(group) - 1) // capacity)
+    leftover = limit - sum(quotas)
+    for position, group in enumerate(ordered):
+        if leftover <= 0:
+            break
+        extra = min(leftover, len(group) - quotas[position])
+        quotas[position] += extra
+        leftover -= extra
+    picked = (
+        group[int(step * len(group) / quota)]
+        for group, quota in zip(ordered, quotas)
+        for step in range(quota)
+    )
+    return tuple(sorted(picked))
+
+
+__all__ = [
+    "EVIDENCE_MODES",
+    "EvidencePolicy",
+    "compact_result",
+    "compact_trace",
+    "encode_rows",
+    "encode_summary",
+    "summarize",
+]
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import json
 import os
 import re
-from typing import Any
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from tabletalk.interfaces import DatabaseProvider, LLMProvider
+from tabletalk.responses import ResponseStore
+
+if TYPE_CHECKING:
+    from tabletalk.providers.openai_provider import OpenAIProvider
 
 SUPPORTED_LLM_PROVIDERS = ("ollama", "openai", "openai-compatible")
 SUPPORTED_DB_PROVIDERS = ("duckdb", "snowflake", "sqlite")
@@ -28,14 +35,116 @@ def resolve_env_vars(value: str) -> str:
     return value
 
 
-def get_llm_provider(config: dict[str, Any]) -> LLMProvider:
+def get_response_store(config: Any, root: Path | None = None) -> ResponseStore | None:
+    """The `llm.responses` store: a mode string or a mapping with `mode` and optional `path`."""
+    if not config:
+        return None
+    settings = {"mode": config} if isinstance(config, str) else config
+    if not isinstance(settings, dict):
+        raise ValueError("llm.responses must be a mode or a mapping with mode and path")
+    mode = str(settings.get("mode") or "replay-or-record")
+    if mode == "off":
+        return None
+    path = Path(str(settings.get("path") or ".tabletalk/responses")).expanduser()
+    if not path.is_absolute() and root is not None:
+        path = root / path
+    return ResponseStore(path, mode)
+
+
+_HTTP_SETTINGS = {
+    "max_connections": int,
+    "max_keepalive_connections": int,
+    "keepalive_expiry": float,
+    "http2": bool,
+}
+_LIMIT_SETTINGS = {"requests_per_minute": float, "tokens_per_minute": float, "max_in_flight": int}
+_RETRY_SETTINGS = {
+    "max_retries": int,
+    "initial_delay_seconds": float,
+    "max_delay_seconds": float,
+}
+_HEDGE_SETTINGS = {"percentile": float, "min_samples": int, "window": int}
+_llm_providers: dict[str, LLMProvider] = {}
+_llm_providers_lock = threading.Lock()
+
+
+def _settings(section: str, config: Any, supported: dict[str, type]) -> dict[str, Any]:
+    """Validated, typed settings from an optional `llm` sub-mapping such as `llm.http`."""
+    if config is None:
+        return {}
+    if not isinstance(config, dict):
+        raise ValueError(f"{section} must be a mapping")
+    unknown = sorted(set(config) - set(supported))
+    if unknown:
+        raise ValueError(
+            f"Unsupported {section} settings: {', '.join(unknown)}. Supported: "
+            + ", ".join(supported)
+        )
+    settings = {name: supported[name](value) for name, value in config.items()}
+    if any(value < 0 for value in settings.values() if not isinstance(value, bool)):
+        raise ValueError(f"{section} values must not be negative")
+    return settings
+
+
+def get_llm_provider(config: dict[str, Any], root: Path | None = None) -> LLMProvider:
+    """The provider for a resolved `llm` block, built once per process and then reused.
+
+    Runtimes with the same configuration share one provider and its pooled HTTP connections;
+    `clear_llm_providers` drops every cached provider.
+    """
+    # Resolved credentials are part of the key, so a rotated ${NAME} builds a new provider.
+    secrets = re.findall(r"\${([^}]+)}", str(config.get("api_key") or ""))
+    key = json.dumps(
+        [config, str(root), [os.environ.get(name) for name in secrets]], sort_keys=True, default=str
+    )
+    with _llm_providers_lock:
+        provider = _llm_providers.get(key)
+        if provider is None:
+            provider = _build_llm_provider(config, root)
+            _llm_providers[key] = provider
+        return provider
+
+
+def clear_llm_providers() -> None:
+    with _llm_providers_lock:
+        _llm_providers.clear()
+
+
+def _build_llm_provider(config: dict[str, Any], root: Path | None) -> LLMProvider:
+    """One endpoint, or a `RoutedLLM` when `llm` configures `fallbacks` or `hedge`.
+
+    Each fallback entry overrides keys of the primary block, so `{model: gpt-4o-mini}` reuses its
+    provider, credentials, and limits.
+    """
+    fallbacks = config.get("fallbacks") or []
+    hedge = config.get("hedge")
+    if not fallbacks and hedge is None:
+        return _build_endpoint(config, root)
+    if not isinstance(fallbacks, list) or not all(isinstance(item, dict) for item in fallbacks):
+        raise ValueError("llm.fallbacks must be a list of llm mappings")
+    from tabletalk.providers.routing import HedgePolicy, RoutedLLM
+
+    primary = {key: value for key, value in config.items() if key not in {"fallbacks", "hedge"}}
+    endpoints = []
+    for entry in [{}, *fallbacks]:
+        nested = sorted({"fallbacks", "hedge"} & set(entry))
+        if nested:
+            raise ValueError(f"llm.fallbacks entries cannot set {', '.join(nested)}")
+        endpoint = _build_endpoint({**primary, **entry}, root)
+        endpoints.append((f"{endpoint.provider_name}:{endpoint.model}", endpoint))
+    settings = _settings("llm.hedge", hedge, _HEDGE_SETTINGS) if hedge is not None else None
+    return RoutedLLM(endpoints, hedge=HedgePolicy(**settings) if settings is not None else None)
+
+
+def _build_endpoint(config: dict[str, Any], root: Path | None) -> OpenAIProvider:
     provider = str(config.get("provider") or "")
     if provider not in SUPPORTED_LLM_PROVIDERS:
         raise ValueError(
             f"Unsupported LLM provider '{provider}'. Supported: "
             + ", ".join(SUPPORTED_LLM_PROVIDERS)
         )
-    from tabletalk.providers.openai_provider import OpenAIProvider
+    from tabletalk.providers.limits import RequestLimiter, RetryPolicy
+    from tabletalk.providers.openai_provider import OpenAIProvider, shared_http_client
 
     if provider == "openai-compatible":
         missing = [name for name in ("base_url", "api_key", "model") if not config.get(name)]
@@ -44,6 +153,9 @@ def get_llm_provider(config: dict[str, Any]) -> LLMProvider:
     if provider == "openai" and not config.get("api_key"):
         raise ValueError("openai requires api_key, normally ${OPENAI_API_KEY}")
 
+    limits = _settings("llm.limits", config.get("limits"), _LIMIT_SETTINGS)
+    if not all(limits.values()):
+        raise ValueError("llm.limits values must be positive; omit a limit to disable it")
     ollama = provider == "ollama"
     api_key = "ollama" if ollama else resolve_env_vars(str(config["api_key"]))
     return OpenAIProvider(
@@ -55,6 +167,10 @@ def get_llm_provider(config: dict[str, Any]) -> LLMProvider:
         request_timeout_seconds=float(config.get("request_timeout_seconds", 60)),
         provider_name=provider,
         reasoning_effort=config.get("reasoning_effort"),
+        response_store=get_response_store(config.get("responses"), root),
+        http_client=shared_http_client(**_settings("llm.http", config.get("http"), _HTTP_SETTINGS)),
+        limiter=RequestLimiter(**limits) if limits else None,
+        retry=RetryPolicy(**_settings("llm.retry", config.get("retry"), _RETRY_SETTINGS)),
     )
 
 
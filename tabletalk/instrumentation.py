@@ -0,0 +1,555 @@
+"""Spans and metrics for the runtime, warehouse, model, validation, and manifest paths.
+
+Instrumentation is process-wide and does nothing until sinks are configured, either in Python with
+`set_instrumentation(Instrumentation([MemorySink()]))` or through `instrumentation:` in
+tabletalk.yaml. Spans nest through context variables; metrics aggregate in memory and are exported
+to every sink on `flush()` and at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+DURATION_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+SINKS = ("memory", "prometheus", "otlp_file", "otlp_http")
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int
+    attributes: dict[str, Any]
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A counter value, or a histogram's sum, count, and per-bucket (not cumulative) counts."""
+
+    name: str
+    kind: str
+    labels: tuple[tuple[str, str], ...]
+    value: float
+    count: int = 0
+    bounds: tuple[float, ...] = ()
+    bucket_counts: tuple[int, ...] = ()
+
+
+class ActiveSpan:
+    """A started span; `end` records it once, with an optional error message."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+
+    def __init__(
+        self,
+        instrumentation: Instrumentation,
+        name: str,
+        parent: ActiveSpan | None,
+        attributes: dict[str, Any],
+    ) -> None:
+        self.instrumentation = instrumentation
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self._ended = False
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, error: str | None = None) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        self.instrumentation._finish(
+            Span(
+                self.name,
+                self.trace_id,
+                self.span_id,
+                self.parent_id,
+                self.start_ns,
+                time.time_ns(),
+                dict(self.attributes),
+                error,
+            )
+        )
+
+
+class _NoopSpan(ActiveSpan):
+    def __init__(self) -> None:
+        self.name = self.trace_id = self.span_id = ""
+        self.parent_id = None
+        self.attributes = {}
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def end(self, error: str | None = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_CURRENT_SPAN: ContextVar[ActiveSpan | None] = ContextVar("tabletalk_span", default=None)
+
+
+class Sink(ABC):
+    @abstractmethod
+    def export(self, spans: Sequence[Span], metrics: Sequence[Metric]) -> None:
+        """Receive spans finished since the last flush and the current cumulative metrics."""
+
+
+class MemorySink(Sink):
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self.metrics: tuple[Metric, ...] = ()
+
+    def export(self, spans: Sequence[Span], metrics: Sequence[Metric]) -> None:
+        self.spans.extend(spans)
+        self.metrics = tuple(metrics)
+
+    def metric(self, name: str, **labels: str) -> Metric | None:
+        wanted = tuple(sorted(labels.items()))
+        return next(
+            (
+                metric
+                for metric in self.metrics
+                if metric.name == name and set(wanted) <= set(metric.labels)
+            ),
+            None,
+        )
+
+
+class PrometheusFileSink(Sink):
+    """Rewrite a Prometheus text-exposition file, e.g. for the node_exporter textfile collector."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def export(self, spans: Sequence[Span], metrics: Sequence[Metric]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        temporary.write_text(prometheus_text(metrics))
+        temporary.replace(self.path)
+
+
+class OTLPFileSink(Sink):
+    """Append OTLP/JSON `resourceSpans` and `resourceMetrics` export requests, one per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def export(self, spans: Sequence[Span], metrics: Sequence[Metric]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as handle:
+            if spans:
+                handle.write(json.dumps(otlp_traces(spans), separators=(",", ":")) + "\n")
+            if metrics:
+                handle.write(json.dumps(otlp_metrics(metrics), separators=(",", ":")) + "\n")
+
+
+class OTLPHTTPSink(Sink):
+    """POST OTLP/JSON to a collector's `/v1/traces` and `/v1/metrics` endpoints."""
+
+    def __init__(self, endpoint: str, *, timeout_seconds: float = 5) -> None:
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+
+    def export(self, spans: Sequence[Span], metrics: Sequence[Metric]) -> None:
+        if spans:
+            self._post("/v1/traces", otlp_traces(spans))
+        if metrics:
+            self._post("/v1/metrics", otlp_metrics(metrics))
+
+    def _post(self, path: str, payload: dict[str, Any]) -> None:
+        request = urllib.request.Request(
+            self.endpoint + path,
+            data=json.dumps(payload, separators=(",", ":")).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout_seconds) as response:
+            response.read()
+
+
+class Instrumentation:
+    """Collects spans and aggregates counters and histograms for a set of sinks."""
+
+    def __init__(self, sinks: Sequence[Sink] = ()) -> None:
+        self.sinks = tuple(sinks)
+        self.enabled = bool(self.sinks)
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], list[float]] = {}
+        self._bounds: dict[str, tuple[float, ...]] = {}
+
+    def start_span(
+        self, name: str, *, parent: ActiveSpan | None = None, **attributes: Any
+    ) -> ActiveSpan:
+        """Start a span that the caller must `end`; the parent defaults to the current span."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        parent = parent or _CURRENT_SPAN.get()
+        return ActiveSpan(self, name, parent if parent is not _NOOP_SPAN else None, attributes)
+
+    @contextmanager
+    def span(
+        self, name: str, *, parent: ActiveSpan | None = None, **attributes: Any
+    ) -> Iterator[ActiveSpan]:
+        """Run a block inside a span that becomes the parent of spans started within it."""
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+        active = self.start_span(name, parent=parent, **attributes)
+        token = _CURRENT_SPAN.set(active)
+        try:
+            yield active
+        except BaseException as exc:
+            active.end(f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            _CURRENT_SPAN.reset(token)
+            active.end()
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        *,
+        buckets: tuple[float, ...] = DURATION_BUCKETS,
+        **labels: Any,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            bounds = self._bounds.setdefault(name, buckets)
+            state = self._histograms.get(key)
+            if state is None:
+                state = self._histograms[key] = [0.0, 0.0] + [0.0] * (len(bounds) + 1)
+            state[0] += value
+            state[1] += 1
+            position = next(
+                (index for index, bound in enumerate(bounds) if value <= bound), len(bounds)
+            )
+            state[2 + position] += 1
+
+    def metrics(self) -> tuple[Metric, ...]:
+        with self._lock:
+            counters = [
+                Metric(name, "counter", labels, value)
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                Metric(
+                    name,
+                    "histogram",
+                    labels,
+                    state[0],
+                    int(state[1]),
+                    self._bounds[name],
+                    tuple(int(count) for count in state[2:]),
+                )
+                for (name, labels), state in sorted(self._histograms.items())
+            ]
+        return (*counters, *histograms)
+
+    def flush(self) -> None:
+        """Export finished spans and current metrics to every sink."""
+        if not self.enabled:
+            return
+        with self._lock:
+            spans, self._spans = self._spans, []
+        metrics = self.metrics()
+        for sink in self.sinks:
+            sink.export(spans, metrics)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+
+_current = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    return _current
+
+
+def set_instrumentation(instrumentation: Instrumentation) -> Instrumentation:
+    """Install process-wide instrumentation and return the previous one."""
+    global _current
+    previous, _current = _current, instrumentation
+    return previous
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    _current.flush()
+
+
+def configure_instrumentation(config: Any, root: Path) -> Instrumentation:
+    """Install the sinks described by tabletalk.yaml `instrumentation:`.
+
+    Without configuration the current instrumentation is left in place.
+    """
+    if not config:
+        return _current
+    entries = config if isinstance(config, list) else [config]
+    sinks: list[Sink] = []
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get("sink") not in SINKS:
+            raise ValueError(
+                f"instrumentation sinks must be mappings with sink: {', '.join(SINKS)}"
+            )
+        kind = entry["sink"]
+        if kind == "memory":
+            sinks.append(MemorySink())
+        elif kind == "otlp_http":
+            if not entry.get("endpoint"):
+                raise ValueError("instrumentation sink otlp_http requires endpoint")
+            sinks.append(OTLPHTTPSink(str(entry["endpoint"])))
+        else:
+            default = "metrics.prom" if kind == "prometheus" else "telemetry.jsonl"
+            path = Path(str(entry.get("path") or f".tabletalk/{default}")).expanduser()
+            path = path if path.is_absolute() else root / path
+            sinks.append(PrometheusFileSink(path) if kind == "prometheus" else OTLPFileSink(path))
+    instrumentation = Instrumentation(sinks)
+    set_instrumentation(instrumentation)
+    return instrumentation
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def instrumented(operation: str) -> Callable[[F], F]:
+    """Wrap a function in a `tabletalk.OPERATION` span with duration and error metrics."""
+
+    def decorate(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            instrumentation = _current
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                with instrumentation.span(f"tabletalk.{operation}"):
+                    return function(*args, **kwargs)
+            except Exception as exc:
+                instrumentation.count(
+                    "tabletalk_operation_errors_total",
+                    operation=operation,
+                    error=type(exc).__name__,
+                )
+                raise
+            finally:
+                instrumentation.observe(
+                    "tabletalk_operation_duration_ms",
+                    (time.perf_counter() - started) * 1000,
+                    operation=operation,
+                )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def prometheus_text(metrics: Sequence[Metric]) -> str:
+    lines: list[str] = []
+    typed: set[str] = set()
+    for metric in metrics:
+        if metric.name not in typed:
+            typed.add(metric.name)
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if metric.kind == "counter":
+            lines.append(
+                f"{metric.name}{_prometheus_labels(metric.labels)} {_number(metric.value)}"
+            )
+            continue
+        cumulative = 0
+        for bound, count in zip((*metric.bounds, float("inf")), metric.bucket_counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _number(bound)
+            labels = _prometheus_labels((*metric.labels, ("le", le)))
+            lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+        labels = _prometheus_labels(metric.labels)
+        lines.append(f"{metric.name}_sum{labels} {_number(metric.value)}")
+        lines.append(f"{metric.name}_count{labels} {metric.count}")
+    return "\n".join(lines) + "\n"
+
+
+def otlp_traces(spans: Sequence[Span]) -> dict[str, Any]:
+    return {
+        "resourceSpans": [
+            {
+                "resource": _OTLP_RESOURCE,
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "tabletalk"},
+                        "spans": [
+                            {
+                                "traceId": span.trace_id,
+                                "spanId": span.span_id,
+                                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                                "name": span.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(span.start_ns),
+                                "endTimeUnixNano": str(span.end_ns),
+                                "attributes": _otlp_attributes(span.attributes.items()),
+                                "status": (
+                                    {"code": 2, "message": span.error}
+                                    if span.error
+                                    else {"code": 1}
+                                ),
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def otlp_metrics(metrics: Sequence[Metric]) -> dict[str, Any]:
+    now = str(time.time_ns())
+    grouped: dict[str, list[Metric]] = {}
+    for metric in metrics:
+        grouped.setdefault(metric.name, []).append(metric)
+    exported = []
+    for name, points in grouped.items():
+        if points[0].kind == "counter":
+            exported.append(
+                {
+                    "name": name,
+                    "sum": {
+                        "aggregationTemporality": 2,
+                        "isMonotonic": True,
+                        "dataPoints": [
+                            {
+                                "attributes": _otlp_attributes(point.labels),
+                                "timeUnixNano": now,
+                                "asDouble": point.value,
+                            }
+                            for point in points
+                        ],
+                    },
+                }
+            )
+        else:
+            exported.append(
+                {
+                    "name": name,
+                    "histogram": {
+                        "aggregationTemporality": 2,
+                        "dataPoints": [
+                            {
+                                "attributes": _otlp_attributes(point.labels),
+                                "timeUnixNano": now,
+                                "count": str(point.count),
+                                "sum": point.value,
+                                "bucketCounts": [str(count) for count in point.bucket_counts],
+                                "explicitBounds": list(point.bounds),
+                            }
+                            for point in points
+                        ],
+                    },
+                }
+            )
+    return {
+        "resourceMetrics": [
+            {
+                "resource": _OTLP_RESOURCE,
+                "scopeMetrics": [{"scope": {"name": "tabletalk"}, "metrics": exported}],
+            }
+        ]
+    }
+
+
+_OTLP_RESOURCE = {"attributes": [{"key": "service.name", "value": {"stringValue": "tabletalk"}}]}
+
+
+def _labels(labels: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _prometheus_labels(labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _otlp_attributes(items: Any) -> list[dict[str, Any]]:
+    attributes = []
+    for key, value in items:
+        if isinstance(value, bool):
+            encoded: dict[str, Any] = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": encoded})
+    return attributes
+
+
+__all__ = [
+    "DURATION_BUCKETS",
+    "SIZE_BUCKETS",
+    "ActiveSpan",
+    "Instrumentation",
+    "MemorySink",
+    "Metric",
+    "OTLPFileSink",
+    "OTLPHTTPSink",
+    "PrometheusFileSink",
+    "Sink",
+    "Span",
+    "configure_instrumentation",
+    "get_instrumentation",
+    "instrumented",
+    "set_instrumentation",
+]
@@ -3,42 +3,121 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from abc import ABC, abstractmethod
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from typing import Any
 
+StructuredValidator = Callable[[Any, str], None]
 
-def validate_structured_value(value: Any, schema: dict[str, Any], path: str = "$") -> None:
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "object": lambda item: isinstance(item, dict),
+    "array": lambda item: isinstance(item, list),
+    "string": lambda item: isinstance(item, str),
+    "integer": lambda item: isinstance(item, int) and not isinstance(item, bool),
+    "number": lambda item: isinstance(item, (int, float)) and not isinstance(item, bool),
+    "boolean": lambda item: isinstance(item, bool),
+    "null": lambda item: item is None,
+}
+_CACHE_LIMIT = 1024
+# Keyed by id() for the common case of module-level schema constants; the entry keeps the schema
+# alive so its id cannot be reused. Equal schemas built per call share one compiled validator.
+_compiled_by_identity: dict[int, tuple[dict[str, Any], StructuredValidator]] = {}
+_compiled_by_content: dict[str, StructuredValidator] = {}
+_compile_lock = threading.Lock()
+
+
+def compile_structured_schema(schema: dict[str, Any]) -> StructuredValidator:
+    """Validator closure for `schema`, compiled once and cached; schemas must not be mutated."""
+    cached = _compiled_by_identity.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    key = json.dumps(schema, sort_keys=True, default=str)
+    with _compile_lock:
+        validator = _compiled_by_content.get(key)
+        if validator is None:
+            validator = _entry(_compile(schema))
+            if len(_compiled_by_content) < _CACHE_LIMIT:
+                _compiled_by_content[key] = validator
+        if len(_compiled_by_identity) < _CACHE_LIMIT:
+            _compiled_by_identity[id(schema)] = (schema, validator)
+    return validator
+
+
+class _Violation(Exception):
+    """Raised inside compiled validators; the path is assembled only when validation fails."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+        self.segments: list[str] = []
+
+
+def _entry(check: Callable[[Any], None]) -> StructuredValidator:
+    def validate(value: Any, path: str = "$") -> None:
+        try:
+            check(value)
+        except _Violation as exc:
+            location = path + "".join(reversed(exc.segments))
+            raise ValueError(f"Structured output {location} {exc.message}") from None
+
+    return validate
+
+
+def _compile(schema: dict[str, Any]) -> Callable[[Any], None]:
     expected = schema.get("type")
     allowed = (expected,) if isinstance(expected, str) else tuple(expected or ())
-    matches = {
-        "object": lambda item: isinstance(item, dict),
-        "array": lambda item: isinstance(item, list),
-        "string": lambda item: isinstance(item, str),
-        "integer": lambda item: isinstance(item, int) and not isinstance(item, bool),
-        "number": lambda item: isinstance(item, (int, float)) and not isinstance(item, bool),
-        "boolean": lambda item: isinstance(item, bool),
-        "null": lambda item: item is None,
-    }
-    if allowed and not any(kind in matches and matches[kind](value) for kind in allowed):
-        raise ValueError(f"Structured output {path} must have type {' or '.join(allowed)}")
-    if isinstance(value, dict) and "object" in allowed:
-        properties = schema.get("properties") or {}
-        missing = [name for name in schema.get("required") or () if name not in value]
-        if missing:
-            raise ValueError(f"Structured output {path} is missing: {', '.join(missing)}")
-        if schema.get("additionalProperties") is False:
-            extras = set(value) - set(properties)
-            if extras:
-                raise ValueError(
-                    f"Structured output {path} has unexpected fields: {', '.join(sorted(extras))}"
-                )
-        for name, item in value.items():
-            if name in properties:
-                validate_structured_value(item, properties[name], f"{path}.{name}")
-    if isinstance(value, list) and "array" in allowed and isinstance(schema.get("items"), dict):
-        for index, item in enumerate(value):
-            validate_structured_value(item, schema["items"], f"{path}[{index}]")
+    checks = tuple(_TYPE_CHECKS[kind] for kind in allowed if kind in _TYPE_CHECKS)
+    matches: Callable[[Any], bool] | None = None
+    if len(checks) == 1:
+        matches = checks[0]
+    elif allowed:
+        matches = lambda item: any(check(item) for check in checks)  # noqa: E731
+    type_message = f"must have type {' or '.join(allowed)}"
+    objects = "object" in allowed
+    properties = {name: _compile(child) for name, child in (schema.get("properties") or {}).items()}
+    names = frozenset(properties)
+    required = tuple(schema.get("required") or ())
+    required_names = frozenset(required)
+    closed = schema.get("additionalProperties") is False
+    items = (
+        _compile(schema["items"])
+        if "array" in allowed and isinstance(schema.get("items"), dict)
+        else None
+    )
+
+    def validate(value: Any) -> None:
+        if matches is not None and not matches(value):
+            raise _Violation(type_message)
+        if objects and isinstance(value, dict):
+            keys = value.keys()
+            if not keys >= required_names:
+                missing = [name for name in required if name not in value]
+                raise _Violation(f"is missing: {', '.join(missing)}")
+            if closed and not keys <= names:
+                raise _Violation(f"has unexpected fields: {', '.join(sorted(keys - names))}")
+            for name, item in value.items():
+                child = properties.get(name)
+                if child is not None:
+                    try:
+                        child(item)
+                    except _Violation as exc:
+                        exc.segments.append(f".{name}")
+                        raise
+        elif items is not None and isinstance(value, list):
+            for index, item in enumerate(value):
+                try:
+                    items(item)
+                except _Violation as exc:
+                    exc.segments.append(f"[{index}]")
+                    raise
+
+    return validate
+
+
+def validate_structured_value(value: Any, schema: dict[str, Any], path: str = "$") -> None:
+    compile_structured_schema(schema)(value, path)
 
 
 class DatabaseProvider(ABC):
@@ -50,10 +129,53 @@ class DatabaseProvider(ABC):
     def get_client(self) -> Any:
         """Return the native connection for health checks."""
 
+    def execute_query_timed(self, sql_query: str) -> tuple[list[dict[str, Any]], dict[str, float]]:
+        """Execute a query, also returning milliseconds spent in `execute` and `fetch`.
+
+        Providers that cannot separate the two attribute all time to `execute`.
+        """
+        started = time.perf_counter()
+        rows = self.execute_query(sql_query)
+        return rows, {"execute": (time.perf_counter() - started) * 1000, "fetch": 0.0}
+
 
 class LLMProvider(ABC):
     def __init__(self) -> None:
-        self.last_usage: dict[str, int] = {}
+        self._usage = threading.local()
+
+    @property
+    def last_usage(self) -> dict[str, int]:
+        """Token usage of the latest call made from the current thread."""
+        usage = getattr(self, "_usage", None)
+        return getattr(usage, "value", {})
+
+    @last_usage.setter
+    def last_usage(self, value: dict[str, int]) -> None:
+        if getattr(self, "_usage", None) is None:
+            self._usage = threading.local()
+        self._usage.value = value
+
+    @property
+    def last_model(self) -> str | None:
+        """Identity of the model that served the latest call from this thread, if it can vary."""
+        return getattr(getattr(self, "_usage", None), "model", None)
+
+    @last_model.setter
+    def last_model(self, value: str | None) -> None:
+        if getattr(self, "_usage", None) is None:
+            self._usage = threading.local()
+        self._usage.model = value
+
+    @property
+    def last_replayed(self) -> bool:
+        """Whether the latest call from this thread was answered from a response store."""
+        return getattr(getattr(self, "_usage", None), "replayed", False)
+
+    @last_replayed.setter
+    def last_replayed(self, value: bool) -> None:
+        if getattr(self, "_usage", None) is None:
+            self._usage = threading.local()
+        self._usage.replayed = value
 
     @abstractmethod
     def generate_response(self, prompt: str) -> str:
@@ -76,3 +198,11 @@ class LLMProvider(ABC):
             raise ValueError("Model structured output must be an object")
         validate_structured_value(value, json_schema)
         return value
+
+    def generate_structured_stream(
+        self,
+        messages: list[dict[str, str]],
+        json_schema: dict[str, Any],
+    ) -> Generator[str, None, None]:
+        """Yield a structured response as JSON text chunks; streaming providers override this."""
+        yield json.dumps(self.generate_structured(messages, json_schema))
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import hashlib
 import json
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field, replace
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+from tabletalk.instrumentation import instrumented
+
 
 class ManifestError(ValueError):
     """Raised when a dbt artifact cannot define an unambiguous query scope."""
@@ -30,6 +33,20 @@ def _relation_key(value: str) -> str:
     return ".".join(_relation_part(part).lower() for part in value.split(".") if part.strip())
 
 
+def _fingerprint(node: Node) -> str:
+    definition = {
+        "checksum": node.checksum,
+        "relation": node.relation_name,
+        "materialized": node.materialized,
+        "enabled": node.enabled,
+        "columns": [
+            [column.name, column.data_type, column.constraints] for column in node.columns.values()
+        ],
+    }
+    canonical = json.dumps(definition, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
 @dataclass(frozen=True)
 class Column:
     name: str
@@ -136,11 +153,14 @@ class Manifest:
         self.manifest_version = str(metadata.get("dbt_schema_version") or "")
         self.dbt_version = str(metadata.get("dbt_version") or "")
         self.nodes = self._normalize()
+        # Fingerprints cover manifest definitions only, so catalog types never read as changes.
+        self._definitions = dict(self.nodes)
         self._enrich_catalog(catalog or {})
         self._enrich_run_results(run_results or {})
         self._queryable = {uid: node for uid, node in self.nodes.items() if node.queryable}
 
     @classmethod
+    @instrumented("manifest.load")
     def load(
         cls,
         path: str | Path,
@@ -431,7 +451,37 @@ class Manifest:
                 result.add(node.unique_id)
         return result
 
-    def _walk(self, starts: Iterable[str], direction: str) -> set[str]:
+    @cached_property
+    def _fingerprints(self) -> dict[str, str]:
+        """Computed on first use, so loads that never compare manifests skip hashing every node."""
+        return {uid: _fingerprint(node) for uid, node in self._definitions.items()}
+
+    def fingerprints(self, unique_ids: Iterable[str] | None = None) -> dict[str, str]:
+        """Digest of each node's dbt checksum, relation, and declared column definitions.
+
+        With `unique_ids`, only those nodes and everything upstream of them are included.
+        """
+        if unique_ids is None:
+            wanted = set(self.nodes)
+        else:
+            starts = set(unique_ids)
+            wanted = (starts | self._closure(starts, "parents")) & self.nodes.keys()
+        return {uid: self._fingerprints[uid] for uid in sorted(wanted)}
+
+    def changed_nodes(self, previous: Mapping[str, str]) -> set[str]:
+        """IDs whose fingerprint differs from `previous`, plus every current descendant of them.
+
+        That covers nodes redefined since `previous`, nodes new in this manifest (including any
+        that a partial `previous` mapping omits), and IDs only `previous` has. Removed IDs are
+        returned but contribute no descendants, since they are no longer in the graph.
+        """
+        current = self.fingerprints()
+        changed = {
+            uid for uid in current.keys() | previous.keys() if current.get(uid) != previous.get(uid)
+        }
+        return changed | self._closure(changed, "children")
+
+    def _closure(self, starts: Iterable[str], direction: str) -> set[str]:
         found: set[str] = set()
         pending = list(starts)
         while pending:
@@ -443,9 +493,12 @@ class Manifest:
                 if adjacent not in found:
                     found.add(adjacent)
                     pending.append(adjacent)
+        return found
+
+    def _walk(self, starts: Iterable[str], direction: str) -> set[str]:
         return {
             uid
-            for uid in found
+            for uid in self._closure(starts, direction)
             if uid in self._queryable and self._queryable[uid].resource_type != "source"
         }
 
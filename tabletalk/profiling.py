@@ -0,0 +1,232 @@
+"""Command profiling: cProfile statistics or sampled stacks, summarized by TableTalk subsystem."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+PROFILE_FORMATS = ("pstats", "speedscope")
+SUBSYSTEMS = (
+    ("manifest", ("tabletalk/manifest.py", "tabletalk/authoring.py", "tabletalk/agents.py")),
+    ("validation", ("tabletalk/validation.py", "/sqlglot/")),
+    ("runtime", ("tabletalk/runtime/", "tabletalk/evidence.py")),
+    (
+        "provider",
+        (
+            "tabletalk/providers/",
+            "tabletalk/connections.py",
+            "tabletalk/interfaces.py",
+            "/openai/",
+            "/httpx/",
+            "/httpcore/",
+            "/snowflake/",
+        ),
+    ),
+    ("evals", ("tabletalk/evals/",)),
+    ("traces", ("tabletalk/traces.py", "tabletalk/store.py")),
+)
+
+
+@dataclass(frozen=True)
+class FunctionCost:
+    name: str
+    filename: str
+    line: int
+    self_seconds: float
+    total_seconds: float
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({Path(self.filename).name}:{self.line})"
+
+
+@dataclass(frozen=True)
+class SubsystemCost:
+    name: str
+    self_seconds: float
+    functions: tuple[FunctionCost, ...]
+
+
+def subsystem(filename: str) -> str:
+    """The TableTalk subsystem a source file belongs to, or `other`."""
+    path = filename.replace("\\", "/")
+    for name, markers in SUBSYSTEMS:
+        if any(marker in path for marker in markers):
+            return name
+    return "other"
+
+
+class CommandProfiler:
+    """Profile one command with cProfile (`pstats`) or a stack sampler (`speedscope`).
+
+    cProfile sees only the command's own thread; the sampler records every thread, so it also
+    covers pipelined model and warehouse workers.
+    """
+
+    def __init__(self, output_format: str = "pstats", *, interval_seconds: float = 0.001) -> None:
+        if output_format not in PROFILE_FORMATS:
+            raise ValueError(f"profile format must be one of: {', '.join(PROFILE_FORMATS)}")
+        self.output_format = output_format
+        self.interval_seconds = interval_seconds
+        self._profile: Any = None
+        self._sampler: _StackSampler | None = None
+
+    def start(self) -> None:
+        if self.output_format == "pstats":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _StackSampler(self.interval_seconds)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def write(self, directory: Path, name: str) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        if self._profile is not None:
+            target = directory / f"{stamp}-{name}.pstats"
+            self._profile.dump_stats(str(target))
+            return target
+        assert self._sampler is not None
+        target = directory / f"{stamp}-{name}.speedscope.json"
+        target.write_text(json.dumps(self._sampler.speedscope(name), separators=(",", ":")))
+        return target
+
+    def functions(self) -> tuple[FunctionCost, ...]:
+        if self._profile is not None:
+            import pstats
+
+            stats: dict[Any, Any] = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+            return tuple(
+                FunctionCost(name, filename, line, self_seconds, total_seconds)
+                for (filename, line, name), (_, _, self_seconds, total_seconds, _) in stats.items()
+            )
+        assert self._sampler is not None
+        return self._sampler.functions()
+
+    def summary(self, *, top: int = 3) -> tuple[SubsystemCost, ...]:
+        """Self time per subsystem, largest first, with each subsystem's `top` hottest functions."""
+        grouped: dict[str, list[FunctionCost]] = {}
+        for function in self.functions():
+            grouped.setdefault(subsystem(function.filename), []).append(function)
+        costs = [
+            SubsystemCost(
+                name,
+                sum(function.self_seconds for function in functions),
+                tuple(
+                    sorted(functions, key=lambda function: function.self_seconds, reverse=True)[
+                        :top
+                    ]
+                ),
+            )
+            for name, functions in grouped.items()
+            if any(function.self_seconds for function in functions)
+        ]
+        return tuple(sorted(costs, key=lambda cost: cost.self_seconds, reverse=True))
+
+
+_Frame = tuple[str, str, int]
+
+
+class _StackSampler:
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.samples: list[tuple[int, tuple[_Frame, ...], float]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tabletalk-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        previous = time.perf_counter()
+        while not self._stop.wait(self.interval_seconds):
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            self.samples.extend(
+                (thread, _stack(frame), now - previous)
+                for thread, frame in frames.items()
+                if thread != own
+            )
+            previous = now
+
+    def functions(self) -> tuple[FunctionCost, ...]:
+        self_seconds: dict[_Frame, float] = {}
+        total_seconds: dict[_Frame, float] = {}
+        for _, stack, weight in self.samples:
+            self_seconds[stack[-1]] = self_seconds.get(stack[-1], 0) + weight
+            for frame in set(stack):
+                total_seconds[frame] = total_seconds.get(frame, 0) + weight
+        return tuple(
+            FunctionCost(name, filename, line, self_seconds.get(frame, 0), total)
+            for frame, total in total_seconds.items()
+            for name, filename, line in (frame,)
+        )
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        indexes: dict[_Frame, int] = {}
+        threads: dict[int, tuple[list[list[int]], list[float]]] = {}
+        for thread, stack, weight in self.samples:
+            samples, weights = threads.setdefault(thread, ([], []))
+            samples.append([indexes.setdefault(frame, len(indexes)) for frame in stack])
+            weights.append(weight)
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "tabletalk",
+            "shared": {
+                "frames": [
+                    {"name": function, "file": filename, "line": line}
+                    for function, filename, line in indexes
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": names.get(thread, f"thread {thread}"),
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in threads.items()
+            ],
+        }
+
+
+def _stack(frame: FrameType | None) -> tuple[_Frame, ...]:
+    frames: list[_Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(frames))
+
+
+__all__ = [
+    "PROFILE_FORMATS",
+    "CommandProfiler",
+    "FunctionCost",
+    "SubsystemCost",
+    "subsystem",
+]
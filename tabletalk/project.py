@@ -2,19 +2,28 @@
 
 from __future__ import annotations
 
+import time
+from collections.abc import Iterable, Iterator
 from dataclasses import replace
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
 from tabletalk.agents import Agent, ResolvedAgent, load_agents
 from tabletalk.connections import ReadOnlyConnection, load_profile_target
 from tabletalk.factories import get_llm_provider
+from tabletalk.instrumentation import configure_instrumentation
 from tabletalk.manifest import Manifest
-from tabletalk.runtime import Runtime
+from tabletalk.runtime import AnswerEvent, Runtime
+from tabletalk.runtime.pipeline import PipelineScheduler
+from tabletalk.store import TraceStore
 from tabletalk.traces import Trace, Verification
 
+if TYPE_CHECKING:
+    from tabletalk.evals import EvalSuite
+
 
 class Project:
     def __init__(self, root: Path, config: dict[str, Any]) -> None:
@@ -23,6 +32,7 @@ class Project:
         dbt = config.get("dbt")
         if not isinstance(dbt, dict):
             raise ValueError("tabletalk.yaml requires a dbt mapping")
+        self.instrumentation = configure_instrumentation(config.get("instrumentation"), root)
         project_dir = Path(str(dbt.get("project_dir") or ".")).expanduser()
         self.dbt_project_dir = (
             project_dir.resolve() if project_dir.is_absolute() else (root / project_dir).resolve()
@@ -78,6 +88,15 @@ class Project:
     def evals_directory(self) -> Path:
         return self.root / str(self.config.get("evals_dir") or "evals")
 
+    @cached_property
+    def trace_store(self) -> TraceStore | None:
+        """The indexed run history, unless `trace_store: false` disables it."""
+        configured = self.config.get("trace_store", ".tabletalk/traces.sqlite")
+        if configured is False or configured is None:
+            return None
+        path = Path(str(configured)).expanduser()
+        return TraceStore(path if path.is_absolute() else self.root / path)
+
     def agents(self) -> tuple[Agent, ...]:
         return load_agents(self.agents_directory)
 
@@ -106,34 +125,86 @@ class Project:
     def connection(self) -> ReadOnlyConnection:
         return ReadOnlyConnection(self.target())
 
-    def runtime(self, agent_name: str) -> Runtime:
+    def runtime(self, agent_name: str, *, responses: str | None = None) -> Runtime:
+        """A runtime for one agent; `responses` overrides the `llm.responses` record/replay mode."""
         llm_config = self.config.get("llm")
         if not isinstance(llm_config, dict):
             raise ValueError("tabletalk.yaml requires an llm mapping")
+        if responses is not None:
+            configured = llm_config.get("responses")
+            settings = configured if isinstance(configured, dict) else {}
+            llm_config = {**llm_config, "responses": {**settings, "mode": responses}}
         model = str(llm_config.get("model") or "unknown")
         provider = str(llm_config.get("provider") or "unknown")
         return Runtime(
             self.manifest,
             self.resolve_agent(agent_name),
             self.connection(),
-            get_llm_provider(llm_config),
+            get_llm_provider(llm_config, self.root),
             model_identity=f"{provider}:{model}",
         )
 
     def answer(self, agent_name: str, question: str) -> Trace:
         runtime = self.runtime(agent_name)
-        trace = runtime.answer(question)
+        return self._record(runtime, agent_name, runtime.answer(question))
+
+    def answer_stream(self, agent_name: str, question: str) -> Iterator[AnswerEvent]:
+        """Stream an answer; the final `trace` event is eval-checked and recorded like `answer`."""
+        runtime = self.runtime(agent_name)
+        for event in runtime.answer_stream(question):
+            if event.kind == "trace":
+                event = replace(event, value=self._record(runtime, agent_name, event.value))
+            yield event
+
+    def answer_many(
+        self,
+        agent_name: str,
+        questions: Iterable[str],
+        *,
+        workers: int = 4,
+        warehouse_workers: int = 2,
+        rate_limit: float | None = None,
+    ) -> Iterator[tuple[int, Trace | Exception]]:
+        """Answer questions concurrently and yield `(index, trace or exception)` as each finishes.
+
+        The manifest, agent, connection, provider, and eval suites are loaded once for the batch.
+        `workers` bounds concurrent model calls and `rate_limit` caps questions started per second.
+        Every trace is eval-checked and recorded like `answer`.
+        """
+        runtime = self.runtime(agent_name)
+        suites = self._answer_suites(agent_name)
+        scheduler = PipelineScheduler(
+            runtime,
+            llm_workers=workers,
+            warehouse_workers=warehouse_workers,
+            rate_limit=rate_limit,
+        )
+        for index, outcome in scheduler.run(questions):
+            if isinstance(outcome, Trace):
+                outcome = self._record(runtime, agent_name, outcome, suites)
+            yield index, outcome
+
+    def _answer_suites(self, agent_name: str) -> tuple[EvalSuite, ...]:
+        from tabletalk.evals import load_eval_suite
+
+        paths = sorted((*self.evals_directory.glob("*.yaml"), *self.evals_directory.glob("*.yml")))
+        return tuple(suite for suite in map(load_eval_suite, paths) if suite.agent == agent_name)
+
+    def _record(
+        self,
+        runtime: Runtime,
+        agent_name: str,
+        trace: Trace,
+        suites: tuple[EvalSuite, ...] | None = None,
+    ) -> Trace:
+        question = trace.question
         checks: list[Verification] = []
         matched_digest: str | None = None
         normalized_question = " ".join(question.split()).casefold()
 
-        from tabletalk.evals import EvalRunner, load_eval_suite
+        from tabletalk.evals import EvalRunner
 
-        paths = sorted((*self.evals_directory.glob("*.yaml"), *self.evals_directory.glob("*.yml")))
-        for path in paths:
-            suite = load_eval_suite(path)
-            if suite.agent != agent_name:
-                continue
+        for suite in self._answer_suites(agent_name) if suites is None else suites:
             for case in suite.cases:
                 if case.expected_outcome != "answer" or not case.verifies_result:
                     continue
@@ -166,7 +237,14 @@ class Project:
             verification=trace.verification + tuple(checks),
             eval_suite_digest=matched_digest,
         )
-        trace.write(self.root / ".tabletalk" / "runs")
+        started = time.perf_counter()
+        persisted = runtime.persistable(trace)
+        persisted.write(self.root / ".tabletalk" / "runs")
+        # The JSON record cannot contain its own write time; the returned and indexed traces do.
+        usage = trace.usage.with_stage("write", (time.perf_counter() - started) * 1000)
+        trace = replace(trace, usage=usage)
+        if self.trace_store:
+            self.trace_store.add_trace(replace(persisted, usage=usage))
         return trace
 
     ask = answer
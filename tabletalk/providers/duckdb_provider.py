@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from tabletalk.interfaces import DatabaseProvider
@@ -18,9 +19,24 @@ class DuckDBProvider(DatabaseProvider):
         self.connection = duckdb.connect(database_path, read_only=read_only)
 
     def execute_query(self, sql_query: str) -> list[dict[str, Any]]:
-        result = self.connection.execute(sql_query)
-        columns = [column[0] for column in result.description] if result.description else []
-        return [dict(zip(columns, row)) for row in result.fetchall()]
+        return self.execute_query_timed(sql_query)[0]
+
+    def execute_query_timed(self, sql_query: str) -> tuple[list[dict[str, Any]], dict[str, float]]:
+        # A cursor is a separate connection to the same database, so concurrent queries from
+        # pipelined runtimes never share one connection.
+        cursor = self.connection.cursor()
+        try:
+            started = time.perf_counter()
+            result = cursor.execute(sql_query)
+            executed = time.perf_counter()
+            columns = [column[0] for column in result.description] if result.description else []
+            rows = [dict(zip(columns, row)) for row in result.fetchall()]
+        finally:
+            cursor.close()
+        return rows, {
+            "execute": (executed - started) * 1000,
+            "fetch": (time.perf_counter() - executed) * 1000,
+        }
 
     def get_client(self) -> Any:
         return self.connection
@@ -0,0 +1,158 @@
+"""Client-side request, token, and concurrency budgets plus retry backoff for LLM endpoints."""
+
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from openai import APIConnectionError
+
+from tabletalk.instrumentation import get_instrumentation
+
+RETRY_STATUSES = frozenset({408, 409, 429})
+
+
+class _Bucket:
+    """A token bucket refilled at `per_minute / 60` per second and holding one second's share.
+
+    Requests larger than the bucket wait for a full bucket and leave it in debt, so the average
+    rate still holds without admitting a minute's budget in one burst.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait(self, amount: float, now: float) -> float:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+
+class RequestLimiter:
+    """Requests per minute, tokens per minute, and in-flight requests for one `llm` block.
+
+    `acquire` blocks until all three budgets admit a request, charging an estimate of its tokens;
+    `release` frees the in-flight slot and replaces the estimate with the reported usage. `pause`
+    holds every caller back, for example for an endpoint's `Retry-After`.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_in_flight: int | None = None,
+    ) -> None:
+        self._requests = _Bucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute) if tokens_per_minute else None
+        self._slots = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self, tokens: int, *, model: str) -> None:
+        waited: dict[str, float] = {}
+        if self._slots is not None:
+            started = time.monotonic()
+            self._slots.acquire()
+            waited["in_flight"] = time.monotonic() - started
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    waits = {
+                        "paused": self._paused_until - now,
+                        "requests": self._requests.wait(1, now) if self._requests else 0.0,
+                        "tokens": self._tokens.wait(tokens, now) if self._tokens else 0.0,
+                    }
+                    reason, delay = max(waits.items(), key=lambda item: item[1])
+                    if delay <= 0:
+                        if self._requests is not None:
+                            self._requests.level -= 1
+                        if self._tokens is not None:
+                            self._tokens.level -= tokens
+                        break
+                waited[reason] = waited.get(reason, 0.0) + delay
+                time.sleep(delay)
+        except BaseException:
+            if self._slots is not None:
+                self._slots.release()
+            raise
+        for reason, seconds in waited.items():
+            if seconds > 0:
+                _record_delay(model, reason, seconds)
+
+    def release(self, estimated: int, used: int) -> None:
+        if self._tokens is not None and used != estimated:
+            with self._lock:
+                self._tokens.level = min(
+                    self._tokens.capacity, self._tokens.level + estimated - used
+                )
+        if self._slots is not None:
+            self._slots.release()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries for rate limits, timeouts, conflicts, server errors, and dropped connections.
+
+    Waits honour the endpoint's `retry-after-ms` or `Retry-After` header, and otherwise back off
+    exponentially from `initial_delay_seconds` with jitter between half and all of the step. A
+    requested wait longer than `max_delay_seconds` fails the request instead.
+    """
+
+    max_retries: int = 2
+    initial_delay_seconds: float = 0.5
+    max_delay_seconds: float = 30.0
+
+    def delay(self, attempt: int, error: BaseException) -> float | None:
+        """Seconds to wait before retrying after `error` on zero-based `attempt`, or None."""
+        if attempt >= self.max_retries or not retryable(error):
+            return None
+        requested = retry_after(error)
+        if requested is not None:
+            return requested if requested <= self.max_delay_seconds else None
+        step = min(self.max_delay_seconds, self.initial_delay_seconds * 2**attempt)
+        return random.uniform(step / 2, step)
+
+
+def retryable(error: BaseException) -> bool:
+    if isinstance(error, APIConnectionError):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status in RETRY_STATUSES or status >= 500)
+
+
+def retry_after(error: BaseException) -> float | None:
+    """The wait an error response asks for, in seconds."""
+    headers: Any = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            moment = email.utils.parsedate_to_datetime(value)
+            return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _record_delay(model: str, reason: str, seconds: float) -> None:
+    get_instrumentation().observe(
+        "tabletalk_llm_throttle_delay_ms", seconds * 1000, model=model, reason=reason
+    )
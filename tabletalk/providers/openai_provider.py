@@ -1,16 +1,67 @@
 """
 openai_provider.py — OpenAI and Ollama LLM provider.
 
-Token usage is captured from the response and attached to the shared answer trace.
+Token usage, including prompt tokens served from the provider's prefix cache, is captured from
+the response and attached to the shared answer trace.
 """
 
+import importlib.util
+import itertools
 import json
+import re
+import sys
+import threading
+import time
+import weakref
 from collections.abc import Generator
 from typing import Any
 
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
+from tabletalk.instrumentation import get_instrumentation
 from tabletalk.interfaces import LLMProvider, validate_structured_value
+from tabletalk.providers.limits import RequestLimiter, RetryPolicy
+from tabletalk.responses import ResponseStore, ResponseStoreError, response_key
+
+_STRUCTURE = re.compile(r'[{}"\\\n]')
+_OBJECT_START = re.compile(r'\{\s*["}]')
+
+
+def _object_spans(text: str) -> list[tuple[int, int]]:
+    """Start and end of every brace-balanced span, found in one pass over the structural characters.
+
+    Only braces that open like an object start a span, and quotes only open strings inside one
+    and where JSON allows a value or key. A quote anywhere else, such as prose after an unmatched
+    brace, abandons the open spans. A raw newline ends a string because JSON strings cannot contain
+    one. Stray braces and quotes in surrounding prose therefore do not hide later objects.
+    """
+    spans: list[tuple[int, int]] = []
+    opens: list[int] = []
+    in_string = False
+    escaped = -1
+    for match in _STRUCTURE.finditer(text):
+        index = match.start()
+        character = match.group()
+        if index == escaped:
+            continue
+        if in_string:
+            if character == "\\":
+                escaped = index + 1
+            elif character in {'"', "\n"}:
+                in_string = False
+        elif character == '"' and opens:
+            before = index - 1
+            while before >= 0 and text[before] in " \t\r\n":
+                before -= 1
+            in_string = before >= 0 and text[before] in "{[,:"
+            if not in_string:
+                opens.clear()
+        elif character == "{" and _OBJECT_START.match(text, index):
+            opens.append(index)
+        elif character == "}" and opens:
+            spans.append((opens.pop(), index + 1))
+    spans.sort()
+    return spans
 
 
 def _json_object(content: str, model: str) -> dict[str, Any]:
@@ -25,18 +76,16 @@ def _json_object(content: str, model: str) -> dict[str, Any]:
         # Some OpenAI-compatible cloud endpoints occasionally wrap an otherwise
         # valid structured response in a short preamble or Markdown. Recover the
         # first complete JSON object without attempting to repair invalid JSON.
-        decoder = json.JSONDecoder()
+        # Only balanced spans that open like an object are decoded, each from its own slice:
+        # JSONDecodeError counts lines from the start of the document it was given, so failed
+        # attempts against the whole text would again be quadratic.
         value = None
-        for start, character in enumerate(candidate):
-            if character != "{":
-                continue
+        for start, end in _object_spans(candidate):
             try:
-                decoded, _ = decoder.raw_decode(candidate[start:])
+                value = json.loads(candidate[start:end])
             except json.JSONDecodeError:
                 continue
-            if isinstance(decoded, dict):
-                value = decoded
-                break
+            break
         if value is None:
             raise ValueError(f"Configured model '{model}' returned malformed JSON") from error
     if not isinstance(value, dict):
@@ -44,6 +93,87 @@ def _json_object(content: str, model: str) -> dict[str, Any]:
     return value
 
 
+def _usage(usage: Any) -> dict[str, int]:
+    """Token counts from a response `usage`; `cached_tokens` only when the endpoint reports it."""
+    counts = {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "completion_tokens": usage.completion_tokens or 0,
+    }
+    cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+    if cached is not None:
+        counts["cached_tokens"] = cached
+    return counts
+
+
+def _estimated_tokens(request: dict) -> int:
+    """A pre-request token charge: about four characters per prompt token plus the output cap."""
+    characters = sum(len(str(message.get("content") or "")) for message in request["messages"])
+    return characters // 4 + int(request.get("max_tokens") or 0)
+
+
+def _total_tokens(usage: dict[str, int], estimate: int) -> int:
+    if not usage:
+        return estimate
+    return usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+
+
+_http_clients: dict[tuple[int, int, float, bool], Any] = {}
+_http_clients_lock = threading.Lock()
+
+
+def shared_http_client(
+    *,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 30.0,
+    http2: bool = False,
+) -> Any:
+    """One pooled HTTP client per transport setting, shared by every provider in the process.
+
+    Connections are kept alive across providers and runtimes, so later requests skip the TCP and
+    TLS handshakes. HTTP/2 is negotiated only when the optional `h2` package is installed.
+    """
+    http2 = http2 and importlib.util.find_spec("h2") is not None
+    key = (max_connections, max_keepalive_connections, keepalive_expiry, http2)
+    with _http_clients_lock:
+        client = _http_clients.get(key)
+        if client is None:
+            # Limits come from the httpx release the installed openai client is built on.
+            httpx = sys.modules[DefaultHttpxClient.__mro__[1].__module__.partition(".")[0]]
+            client = DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                http2=http2,
+                event_hooks={"response": [_ConnectionTracker()]},
+            )
+            _http_clients[key] = client
+        return client
+
+
+class _ConnectionTracker:
+    """Counts responses served over a new or an already open pooled connection."""
+
+    def __init__(self) -> None:
+        self._streams: weakref.WeakSet[Any] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def __call__(self, response: Any) -> None:
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        with self._lock:
+            reused = stream in self._streams
+            self._streams.add(stream)
+        get_instrumentation().count(
+            "tabletalk_llm_connections_total",
+            outcome="reused" if reused else "new",
+            http_version=str(response.http_version),
+        )
+
+
 class OpenAIProvider(LLMProvider):
     def __init__(
         self,
@@ -55,8 +185,13 @@ class OpenAIProvider(LLMProvider):
         request_timeout_seconds: float = 60,
         provider_name: str = "openai-compatible",
         reasoning_effort: str | None = None,
+        response_store: ResponseStore | None = None,
+        http_client: Any = None,
+        limiter: RequestLimiter | None = None,
+        retry: RetryPolicy | None = None,
     ):
         super().__init__()
+        self.response_store = response_store
         self.provider_name = provider_name
         self.model = model
         self.base_url = base_url
@@ -64,12 +199,18 @@ class OpenAIProvider(LLMProvider):
         self.temperature = temperature
         self.request_timeout_seconds = request_timeout_seconds
         self.reasoning_effort = reasoning_effort
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy()
         client_kwargs: dict = {
             "api_key": api_key,
             "timeout": request_timeout_seconds,
+            # Retries happen in `_create`, where they are throttled and measured.
+            "max_retries": 0,
         }
         if base_url:
             client_kwargs["base_url"] = base_url
+        if http_client is not None:
+            client_kwargs["http_client"] = http_client
         self.client = OpenAI(**client_kwargs)
 
     def generate_response(self, prompt: str) -> str:
@@ -81,14 +222,9 @@ class OpenAIProvider(LLMProvider):
         }
         if self.reasoning_effort:
             request["reasoning_effort"] = self.reasoning_effort
-        response = self.client.chat.completions.create(
-            **request,
-        )
+        response = self._create(request)
         if response.usage:
-            self.last_usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-            }
+            self.last_usage = _usage(response.usage)
         content = response.choices[0].message.content
         result = content.strip() if content is not None else ""
         if not result:
@@ -103,39 +239,54 @@ class OpenAIProvider(LLMProvider):
         messages: list[dict[str, str]],
         json_schema: dict[str, Any],
     ) -> dict[str, Any]:
-        schema_instruction = (
-            "Return only a JSON object matching this exact JSON Schema. "
-            "Do not use Markdown or code fences.\n"
-            + json.dumps(json_schema, separators=(",", ":"), sort_keys=True)
+        store = self.response_store
+        self.last_replayed = False
+        if store is None or store.mode == "off":
+            return self._generate_structured(messages, json_schema)
+        identity = f"{self.provider_name}:{self.model}"
+        key = response_key(
+            identity,
+            messages,
+            json_schema,
+            temperature=self.temperature,
+            reasoning_effort=self.reasoning_effort,
         )
-        schema_messages = [
-            {"role": "system", "content": schema_instruction},
-            *messages,
-        ]
-        request: dict = {
-            "model": self.model,
-            "messages": schema_messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "response_format": {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "tabletalk_response",
-                    "strict": True,
-                    "schema": json_schema,
-                },
-            },
-        }
-        if self.reasoning_effort:
-            request["reasoning_effort"] = self.reasoning_effort
+        if store.reads:
+            value = store.get(key)
+            get_instrumentation().count(
+                "tabletalk_llm_responses_total",
+                mode=store.mode,
+                outcome="miss" if value is None else "hit",
+            )
+            if value is not None:
+                # A replayed response spends no tokens.
+                self.last_usage = {}
+                self.last_replayed = True
+                return value
+            if not store.writes:
+                raise ResponseStoreError(
+                    f"No recorded response {key[:12]} for model '{self.model}' in replay mode; "
+                    "record it with --responses record or replay-or-record"
+                )
+        value = self._generate_structured(messages, json_schema)
+        store.put(key, value, model_identity=identity, usage=self.last_usage)
+        return value
+
+    def _generate_structured(
+        self,
+        messages: list[dict[str, str]],
+        json_schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        schema_messages, request = self._structured_request(messages, json_schema)
         last_error: ValueError | None = None
+        usage: dict[str, int] = {}
         for attempt in range(2):
-            response = self.client.chat.completions.create(**request)
+            response = self._create(request)
             if response.usage:
-                self.last_usage = {
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                }
+                # A schema retry is part of the same logical call; report both attempts' tokens.
+                counts = _usage(response.usage)
+                usage = {key: usage.get(key, 0) + counts.get(key, 0) for key in {*usage, *counts}}
+                self.last_usage = usage
             content = response.choices[0].message.content
             if not content:
                 last_error = ValueError(
@@ -149,6 +300,9 @@ class OpenAIProvider(LLMProvider):
                 except ValueError as exc:
                     last_error = exc
             if attempt == 0:
+                get_instrumentation().count(
+                    "tabletalk_llm_retries_total", model=self.model, reason="schema"
+                )
                 request["messages"] = [
                     *schema_messages,
                     {
@@ -164,6 +318,47 @@ class OpenAIProvider(LLMProvider):
             f"{last_error}"
         ) from last_error
 
+    def generate_structured_stream(
+        self,
+        messages: list[dict[str, str]],
+        json_schema: dict[str, Any],
+    ) -> Generator[str, None, None]:
+        """Stream a schema-constrained response. Callers validate the complete object."""
+        _, request = self._structured_request(messages, json_schema)
+        yield from self._stream({**request, "stream": True})
+
+    def _structured_request(
+        self,
+        messages: list[dict[str, str]],
+        json_schema: dict[str, Any],
+    ) -> tuple[list[dict[str, str]], dict]:
+        schema_instruction = (
+            "Return only a JSON object matching this exact JSON Schema. "
+            "Do not use Markdown or code fences.\n"
+            + json.dumps(json_schema, separators=(",", ":"), sort_keys=True)
+        )
+        schema_messages = [
+            {"role": "system", "content": schema_instruction},
+            *messages,
+        ]
+        request: dict = {
+            "model": self.model,
+            "messages": schema_messages,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "tabletalk_response",
+                    "strict": True,
+                    "schema": json_schema,
+                },
+            },
+        }
+        if self.reasoning_effort:
+            request["reasoning_effort"] = self.reasoning_effort
+        return schema_messages, request
+
     def generate_chat_stream(self, messages: list[dict[str, str]]) -> Generator[str, None, None]:
         request: dict = {
             "model": self.model,
@@ -174,23 +369,102 @@ class OpenAIProvider(LLMProvider):
         }
         if self.reasoning_effort:
             request["reasoning_effort"] = self.reasoning_effort
+        yield from self._stream(request)
+
+    def _stream(self, request: dict) -> Generator[str, None, None]:
         try:
-            stream = self.client.chat.completions.create(
-                **request,
-                stream_options={"include_usage": True},
-            )
+            stream = self._create(request, stream_options={"include_usage": True})
         except TypeError:
-            stream = self.client.chat.completions.create(**request)
+            stream = self._create(request)
 
         emitted = False
         for chunk in stream:
             if chunk.usage:
-                self.last_usage = {
-                    "prompt_tokens": chunk.usage.prompt_tokens,
-                    "completion_tokens": chunk.usage.completion_tokens,
-                }
+                self.last_usage = _usage(chunk.usage)
             if chunk.choices and chunk.choices[0].delta.content:
                 emitted = True
                 yield chunk.choices[0].delta.content
         if not emitted:
             raise ValueError(f"Configured model '{self.model}' returned an empty response")
+
+    def _create(self, request: dict, **options: Any) -> Any:
+        """Send one chat completion request within the limits, retrying transient failures.
+
+        A streamed response keeps its in-flight slot until the stream is exhausted or closed.
+        """
+        limiter = self.limiter
+        estimate = _estimated_tokens(request)
+        for attempt in itertools.count():
+            if limiter is not None:
+                limiter.acquire(estimate, model=self.model)
+            try:
+                response = self._send(request, options)
+            except Exception as exc:
+                if limiter is not None:
+                    limiter.release(estimate, 0)
+                delay = self.retry.delay(attempt, exc)
+                if delay is None:
+                    raise
+                status = getattr(exc, "status_code", None)
+                instrumentation = get_instrumentation()
+                instrumentation.count(
+                    "tabletalk_llm_retries_total",
+                    model=self.model,
+                    reason=str(status) if status else type(exc).__name__,
+                )
+                if limiter is not None and status == 429:
+                    # Hold every caller sharing this endpoint, not only the one that was refused.
+                    limiter.pause(delay)
+                instrumentation.observe(
+                    "tabletalk_llm_throttle_delay_ms",
+                    delay * 1000,
+                    model=self.model,
+                    reason="retry",
+                )
+                time.sleep(delay)
+                continue
+            if limiter is None:
+                return response
+            if request.get("stream"):
+                return self._released(response, limiter, estimate)
+            usage = _usage(response.usage) if response.usage else {}
+            limiter.release(estimate, _total_tokens(usage, estimate))
+            return response
+
+    def _released(
+        self, stream: Any, limiter: RequestLimiter, estimate: int
+    ) -> Generator[Any, None, None]:
+        usage: dict[str, int] = {}
+        try:
+            for chunk in stream:
+                if chunk.usage:
+                    usage = _usage(chunk.usage)
+                yield chunk
+        finally:
+            limiter.release(estimate, _total_tokens(usage, estimate))
+
+    def _send(self, request: dict, options: dict[str, Any]) -> Any:
+        """Send one chat completion request inside an instrumentation span."""
+        instrumentation = get_instrumentation()
+        started = time.perf_counter()
+        with instrumentation.span(
+            "tabletalk.llm.request",
+            provider=self.provider_name,
+            model=self.model,
+            stream=bool(request.get("stream")),
+        ):
+            try:
+                response = self.client.chat.completions.create(**request, **options)
+            except Exception as exc:
+                instrumentation.count(
+                    "tabletalk_llm_requests_total", model=self.model, outcome=type(exc).__name__
+                )
+                raise
+            finally:
+                instrumentation.observe(
+                    "tabletalk_llm_request_duration_ms",
+                    (time.perf_counter() - started) * 1000,
+                    model=self.model,
+                )
+        instrumentation.count("tabletalk_llm_requests_total", model=self.model, outcome="ok")
+        return response
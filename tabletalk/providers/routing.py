@@ -0,0 +1,222 @@
+"""Hedged requests and ordered fallbacks across several configured LLM endpoints."""
+
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from tabletalk.instrumentation import get_instrumentation
+from tabletalk.interfaces import LLMProvider
+from tabletalk.responses import ResponseStoreError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class _Served(Generic[T]):
+    """A provider's value with the token usage read on the thread that made the call."""
+
+    value: T
+    usage: dict[str, int]
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """Send a duplicate structured request once the first outlives `percentile` of recent calls.
+
+    The delay comes from the latest `window` successful calls to the same model that reached the
+    endpoint rather than a response store, and applies once `min_samples` have completed; before
+    that, requests are not hedged.
+    """
+
+    percentile: float = 95
+    min_samples: int = 20
+    window: int = 200
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 100:
+            raise ValueError("llm.hedge.percentile must be between 0 and 100")
+        if self.min_samples < 1 or self.window < self.min_samples:
+            raise ValueError("llm.hedge requires 1 <= min_samples <= window")
+
+
+class RoutedLLM(LLMProvider):
+    """Tries each `(identity, provider)` in order, optionally hedging structured requests.
+
+    A provider that fails, for example by timing out after its own retries, hands the call to the
+    next one. Streams fall back only before their first chunk. Replay misses from a response store
+    are raised at once, since every fallback would miss too. `last_model` reports the identity that
+    served the latest call from the current thread.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[tuple[str, LLMProvider]],
+        *,
+        hedge: HedgePolicy | None = None,
+    ) -> None:
+        super().__init__()
+        if not providers:
+            raise ValueError("RoutedLLM requires at least one provider")
+        self.providers = tuple(providers)
+        self.hedge = hedge
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def generate_response(self, prompt: str) -> str:
+        return self._route(
+            lambda identity, provider: _Served(
+                provider.generate_response(prompt), provider.last_usage
+            )
+        )
+
+    def generate_structured(
+        self,
+        messages: list[dict[str, str]],
+        json_schema: dict[str, Any],
+    ) -> dict[str, Any]:
+        return self._route(
+            lambda identity, provider: self._hedged(
+                identity, lambda: provider.generate_structured(messages, json_schema), provider
+            )
+        )
+
+    def generate_response_stream(self, prompt: str) -> Generator[str, None, None]:
+        yield from self._stream(lambda provider: provider.generate_response_stream(prompt))
+
+    def generate_chat_stream(self, messages: list[dict[str, str]]) -> Generator[str, None, None]:
+        yield from self._stream(lambda provider: provider.generate_chat_stream(messages))
+
+    def generate_structured_stream(
+        self,
+        messages: list[dict[str, str]],
+        json_schema: dict[str, Any],
+    ) -> Generator[str, None, None]:
+        yield from self._stream(
+            lambda provider: provider.generate_structured_stream(messages, json_schema)
+        )
+
+    def _route(self, call: Callable[[str, LLMProvider], _Served[T]]) -> T:
+        for index, (identity, provider) in enumerate(self.providers):
+            try:
+                served = call(identity, provider)
+            except Exception as exc:
+                self._fall_back(index, identity, exc)
+                continue
+            self.last_usage = served.usage
+            self.last_model = identity
+            return served.value
+        raise AssertionError("unreachable: the last provider's error is raised")
+
+    def _stream(
+        self, start: Callable[[LLMProvider], Generator[str, None, None]]
+    ) -> Generator[str, None, None]:
+        for index, (identity, provider) in enumerate(self.providers):
+            chunks = start(provider)
+            try:
+                first = next(chunks, None)
+            except Exception as exc:
+                self._fall_back(index, identity, exc)
+                continue
+            self.last_model = identity
+            if first is not None:
+                yield first
+                yield from chunks
+            self.last_usage = provider.last_usage
+            return
+
+    def _fall_back(self, index: int, identity: str, error: Exception) -> None:
+        """Re-raise `error` unless another provider remains to try."""
+        if isinstance(error, ResponseStoreError) or index + 1 == len(self.providers):
+            raise error
+        get_instrumentation().count(
+            "tabletalk_llm_fallbacks_total",
+            model=identity,
+            to=self.providers[index + 1][0],
+            error=type(error).__name__,
+        )
+
+    def _hedged(self, identity: str, call: Callable[[], T], provider: LLMProvider) -> _Served[T]:
+        """Run `call`, adding one duplicate if it is still running after the hedge delay."""
+        delay = self._hedge_delay(identity)
+        if delay is None:
+            return self._timed(identity, call, provider)
+        first = self._start(identity, call, provider)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        second = self._start(identity, call, provider)
+        pending = {first, second}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    get_instrumentation().count(
+                        "tabletalk_llm_hedges_total",
+                        model=identity,
+                        winner="hedge" if future is second else "original",
+                    )
+                    # The slower request cannot be cancelled; its tokens are counted when it ends.
+                    for loser in pending:
+                        loser.add_done_callback(lambda done: _record_wasted(identity, done))
+                    return future.result()
+        assert error is not None
+        raise error
+
+    def _start(
+        self, identity: str, call: Callable[[], T], provider: LLMProvider
+    ) -> Future[_Served[T]]:
+        future: Future[_Served[T]] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self._timed(identity, call, provider))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        # Daemon threads, so an abandoned slow request never delays interpreter exit; each copies
+        # the caller's context to keep request spans under the calling stage.
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(run,), daemon=True).start()
+        return future
+
+    def _timed(self, identity: str, call: Callable[[], T], provider: LLMProvider) -> _Served[T]:
+        started = time.perf_counter()
+        value = call()
+        elapsed = time.perf_counter() - started
+        # Replayed responses return in microseconds and would collapse the hedge delay to zero.
+        if self.hedge is not None and not provider.last_replayed:
+            with self._lock:
+                samples = self._latencies.setdefault(identity, deque(maxlen=self.hedge.window))
+                samples.append(elapsed)
+        return _Served(value, provider.last_usage)
+
+    def _hedge_delay(self, identity: str) -> float | None:
+        if self.hedge is None:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(identity, ()))
+        if len(samples) < self.hedge.min_samples:
+            return None
+        return samples[math.ceil(self.hedge.percentile / 100 * len(samples)) - 1]
+
+
+def _record_wasted(identity: str, future: Future[_Served[Any]]) -> None:
+    """Count the tokens of a hedge loser, which never reach the caller's usage."""
+    if future.exception() is not None:
+        return
+    for kind, tokens in future.result().usage.items():
+        get_instrumentation().count(
+            "tabletalk_llm_hedge_wasted_tokens", tokens, model=identity, kind=kind
+        )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from typing import Any
 
 from tabletalk.interfaces import DatabaseProvider
@@ -37,10 +38,19 @@ class SnowflakeProvider(DatabaseProvider):
         self.connection = snowflake.connector.connect(**arguments)
 
     def execute_query(self, sql_query: str) -> list[dict[str, Any]]:
+        return self.execute_query_timed(sql_query)[0]
+
+    def execute_query_timed(self, sql_query: str) -> tuple[list[dict[str, Any]], dict[str, float]]:
         cursor = self.connection.cursor()
+        started = time.perf_counter()
         cursor.execute(sql_query)
+        executed = time.perf_counter()
         columns = [column[0] for column in cursor.description] if cursor.description else []
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return rows, {
+            "execute": (executed - started) * 1000,
+            "fetch": (time.perf_counter() - executed) * 1000,
+        }
 
     def get_client(self) -> Any:
         return self.connection
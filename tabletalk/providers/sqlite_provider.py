@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 from pathlib import Path
 from typing import Any
 
@@ -21,10 +23,21 @@ class SQLiteProvider(DatabaseProvider):
         else:
             self.connection = sqlite3.connect(database_path, check_same_thread=False)
         self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
 
     def execute_query(self, sql_query: str) -> list[dict[str, Any]]:
-        cursor = self.connection.execute(sql_query)
-        return [dict(row) for row in cursor.fetchall()]
+        return self.execute_query_timed(sql_query)[0]
+
+    def execute_query_timed(self, sql_query: str) -> tuple[list[dict[str, Any]], dict[str, float]]:
+        with self._lock:
+            started = time.perf_counter()
+            cursor = self.connection.execute(sql_query)
+            executed = time.perf_counter()
+            rows = [dict(row) for row in cursor.fetchall()]
+        return rows, {
+            "execute": (executed - started) * 1000,
+            "fetch": (time.perf_counter() - executed) * 1000,
+        }
 
     def get_client(self) -> sqlite3.Connection:
         return self.connection
@@ -0,0 +1,103 @@
+"""Content-addressed structured model responses for recording and replaying LLM calls."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+RESPONSE_MODES = ("off", "record", "replay", "replay-or-record")
+
+
+class ResponseStoreError(ValueError):
+    pass
+
+
+def response_key(
+    model_identity: str,
+    messages: list[dict[str, str]],
+    json_schema: dict[str, Any],
+    *,
+    temperature: float,
+    reasoning_effort: str | None,
+) -> str:
+    """SHA-256 of everything that determines a structured response, in canonical JSON."""
+    payload = {
+        "model": model_identity,
+        "messages": messages,
+        "schema": json_schema,
+        "temperature": temperature,
+        "reasoning_effort": reasoning_effort,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseStore:
+    """Structured responses stored as `<key[:2]>/<key>.json` under `path`.
+
+    `record` always calls the model and stores the response, `replay` only reads and fails on a
+    missing response, and `replay-or-record` reads when it can and records otherwise. Entries
+    are written atomically, so concurrent workers and interrupted runs never leave partial files.
+    """
+
+    def __init__(self, path: str | Path, mode: str = "replay-or-record") -> None:
+        if mode not in RESPONSE_MODES:
+            raise ResponseStoreError(
+                f"Unsupported response mode '{mode}'; use {', '.join(RESPONSE_MODES)}"
+            )
+        self.path = Path(path)
+        self.mode = mode
+
+    @property
+    def reads(self) -> bool:
+        return self.mode in {"replay", "replay-or-record"}
+
+    @property
+    def writes(self) -> bool:
+        return self.mode in {"record", "replay-or-record"}
+
+    def _entry(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            record = json.loads(self._entry(key).read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as exc:
+            raise ResponseStoreError(f"Could not read recorded response {key}: {exc}") from exc
+        value = record.get("value") if isinstance(record, dict) else None
+        if not isinstance(value, dict):
+            raise ResponseStoreError(f"Recorded response {key} is not a structured object")
+        return value
+
+    def put(
+        self,
+        key: str,
+        value: dict[str, Any],
+        *,
+        model_identity: str,
+        usage: dict[str, int] | None = None,
+    ) -> Path:
+        target = self._entry(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        record = {"key": key, "model": model_identity, "usage": usage or {}, "value": value}
+        descriptor, temporary = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as handle:
+                json.dump(record, handle, sort_keys=True)
+            os.replace(temporary, target)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        return target
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.path.glob("*/*.json"))
+
+
+__all__ = ["RESPONSE_MODES", "ResponseStore", "ResponseStoreError", "response_key"]
@@ -4,29 +4,56 @@ from __future__ import annotations
 
 import re
 import time
-from collections.abc import Callable
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import replace
 from decimal import Decimal
 from difflib import SequenceMatcher
-from typing import Any
+from functools import cached_property
+from typing import Any, cast
 
 from tabletalk.agents import ResolvedAgent
 from tabletalk.connections import ReadOnlyConnection
+from tabletalk.evidence import (
+    EvidencePolicy,
+    compact_trace,
+    encode_rows,
+    encode_summary,
+    summarize,
+)
+from tabletalk.instrumentation import get_instrumentation
 from tabletalk.interfaces import LLMProvider
 from tabletalk.manifest import Manifest
+from tabletalk.runtime.pipeline import AnswerJob, PipelineScheduler
+from tabletalk.runtime.streaming import AnswerEvent, StructuredAnswerParser
 from tabletalk.traces import (
     Answer,
     Claim,
     DbtContext,
     Evidence,
     Interpretation,
+    LLMCall,
     ResultTrace,
     SQLTrace,
     Trace,
     Usage,
     Verification,
+    result_digest,
 )
 from tabletalk.validation import SQLValidationError, validate_sql
 
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+_ISO_DATE_CELL = re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T].*)?")
+_MONTH_DAY = re.compile(
+    r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|"
+    r"Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|"
+    r"Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:,\s*\d{4})?\b",
+    re.IGNORECASE,
+)
+_CLAIM_NUMBER = re.compile(r"(?<![\w-])\$?(-?\d[\d,]*(?:\.\d+)?)(%)?(?![\d,]|\.\d|-[A-Za-z])")
+_QUESTION_NUMBER = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+_WORD = re.compile(r"[a-z0-9]+")
+
 _QUERY_SCHEMA: dict[str, Any] = {
     "type": "object",
     "additionalProperties": False,
@@ -89,6 +116,25 @@ _ANSWER_SCHEMA: dict[str, Any] = {
     },
 }
 
+# Prompts put fixed text first and the question last so that providers with automatic prefix
+# caching reuse everything before the question: the query prompt is stable per agent and
+# manifest, and the answer instructions are one constant message ahead of the evidence.
+_QUERY_INSTRUCTIONS = (
+    "Interpret the question and produce exactly one read-only SQL query. "
+    "Use only the dbt resources and declared columns below. Never infer "
+    "that a lineage edge is a safe join. Disclose exact date boundaries "
+    "and assumptions."
+)
+_ANSWER_INSTRUCTIONS = (
+    "Answer only from the executed SQL and returned evidence. Every factual "
+    "or numeric claim must cite one or more zero-based row indexes and exact "
+    "result column names. The text of each individual claim must contain the "
+    "values it cites, and each claim must cite every result column needed to "
+    "support it. Do not cite a name column for a numeric-only claim or a numeric "
+    "column for a name-only claim. The final answer text must state every claim "
+    "and directly include every output the user requested. Do not invent evidence."
+)
+
 
 class RejectionError(ValueError):
     """A deliberate model or policy rejection, not an operational failure."""
@@ -118,7 +164,90 @@ class Runtime:
         *,
         before_execute: Callable[[Interpretation, str, str], None] | None = None,
     ) -> Trace:
+        job = self.start(question)
+        while job.stage != "done":
+            if job.stage == "execute" and before_execute:
+                self._before_execute(job, before_execute)
+            self.advance(job)
+        assert job.trace is not None
+        return job.trace
+
+    def answer_many(
+        self,
+        questions: Sequence[str],
+        *,
+        llm_workers: int = 4,
+        warehouse_workers: int = 2,
+        rate_limit: float | None = None,
+    ) -> list[Trace | Exception]:
+        """Answer several questions with pipelined stages; outcomes keep the question order."""
+        outcomes: list[Trace | Exception | None] = [None] * len(questions)
+        scheduler = PipelineScheduler(
+            self,
+            llm_workers=llm_workers,
+            warehouse_workers=warehouse_workers,
+            rate_limit=rate_limit,
+        )
+        for index, outcome in scheduler.run(questions):
+            outcomes[index] = outcome
+        return cast(list[Trace | Exception], outcomes)
+
+    def answer_stream(
+        self,
+        question: str,
+        *,
+        before_execute: Callable[[Interpretation, str, str], None] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[AnswerEvent]:
+        """Answer like `answer`, yielding each stage as soon as it is available.
+
+        Answer text and claims are parsed from the model's streamed JSON. Each claim event carries
+        a check of that claim against its own text; the final `trace` event carries the same
+        verification `answer` would record for the complete answer.
+        """
+        job = self.start(question)
+        while job.stage in {"plan", "validate"}:
+            self.advance(job)
+        assert job.interpretation is not None and job.validated is not None
+        yield AnswerEvent("interpretation", job.interpretation)
+        yield AnswerEvent("sql", job.validated.executed)
+        if before_execute:
+            self._before_execute(job, before_execute)
+        self.advance(job)
+        for offset in range(0, len(job.rows), batch_size):
+            yield AnswerEvent("rows", job.rows[offset : offset + batch_size], offset=offset)
+        messages = self._answer_messages(job)
         started = time.perf_counter()
+        self.llm.last_usage = {}
+        parser = StructuredAnswerParser(_ANSWER_SCHEMA["properties"]["claims"]["items"])
+        # A generator cannot hold the current-span context across yields, so the streamed answer
+        # stage is started and ended explicitly.
+        span = get_instrumentation().start_span("tabletalk.stage.answer", parent=job.span)
+        try:
+            for chunk in self.llm.generate_structured_stream(messages, _ANSWER_SCHEMA):
+                for kind, value in parser.feed(chunk):
+                    if kind == "text":
+                        yield AnswerEvent("text", value)
+                        continue
+                    claim = _claim(value)
+                    checks = self._validate_claims(
+                        claim.text, (claim,), job.rows, question=question
+                    )
+                    yield AnswerEvent("claim", claim, verification=checks)
+            job.answer_payload = parser.close(_ANSWER_SCHEMA)
+        except Exception as exc:
+            span.end(f"{type(exc).__name__}: {exc}")
+            self._instrument_failure(job, exc)
+            raise
+        span.end()
+        self._record_call(job, "answer", started)
+        job.stage = "verify"
+        self.advance(job)
+        assert job.trace is not None
+        yield AnswerEvent("trace", job.trace)
+
+    def start(self, question: str) -> AnswerJob:
+        """Apply the question guardrails and return a job ready for its `plan` stage."""
         if not isinstance(question, str) or not question.strip():
             raise ValueError("Question must be a non-empty string")
         normalized_question = question.casefold()
@@ -134,73 +263,230 @@ class Runtime:
             raise RejectionError(
                 f"Question rejected: '{blocked_term}' requires data this agent does not have"
             )
-        query_messages = [
-            {"role": "system", "content": self._query_prompt()},
-            {"role": "user", "content": question},
-        ]
-        for attempt in range(2):
-            query = self.llm.generate_structured(query_messages, _QUERY_SCHEMA)
-            raw_interpretation = query["interpretation"]
-            interpretation = Interpretation(
-                intent=str(raw_interpretation["intent"]),
-                metrics=tuple(raw_interpretation["metrics"]),
-                dimensions=tuple(raw_interpretation["dimensions"]),
-                start_date=raw_interpretation["start_date"],
-                end_date=raw_interpretation["end_date"],
-                assumptions=tuple(raw_interpretation["assumptions"]),
-            )
-            if query.get("rejection"):
-                raise RejectionError(f"Question rejected: {query['rejection']}")
-            if not query.get("sql"):
-                raise ValueError("Model did not provide SQL or an explicit rejection")
-            try:
-                validated = validate_sql(
-                    str(query["sql"]),
-                    self.manifest,
-                    self.agent.nodes,
-                    dialect=self.connection.dialect,
-                    max_rows=self.agent.source.max_rows,
-                    allow_sensitive=self.agent.source.allow_sensitive,
-                )
-                break
-            except SQLValidationError as exc:
-                if attempt:
-                    raise
-                query_messages.append(
-                    {
-                        "role": "system",
-                        "content": (
-                            "The proposed SQL failed the deterministic safety/schema "
-                            f"validator: {exc}. Correct the SQL using the declared dbt "
-                            "resources and return the complete structured response again."
-                        ),
-                    }
-                )
-        if before_execute:
-            before_execute(interpretation, validated.generated, validated.executed)
-        try:
-            rows = self.connection.execute(validated.executed, self.agent.source.timeout_seconds)
-            execution = Verification("execution_succeeded", True)
-        except Exception as exc:
-            raise RuntimeError(f"Read-only query execution failed: {exc}") from exc
-        answer_payload = self.llm.generate_structured(
+        started = time.perf_counter()
+        job = AnswerJob(
+            question,
             [
-                {"role": "system", "content": self._answer_prompt(validated.executed, rows)},
+                {"role": "system", "content": self._query_prompt()},
                 {"role": "user", "content": question},
             ],
-            _ANSWER_SCHEMA,
+            started=started,
         )
-        claims = tuple(
-            Claim(
-                text=str(raw["text"]),
-                evidence=tuple(
-                    Evidence(int(item["row"]), str(item["column"])) for item in raw["evidence"]
-                ),
+        job.record("query_prompt", started)
+        job.span = get_instrumentation().start_span(
+            "tabletalk.answer", agent=self.agent.source.name, model=self.model_identity
+        )
+        return job
+
+    def advance(self, job: AnswerJob) -> None:
+        """Run the job's next stage; stages record their own timings and model calls."""
+        stage = job.stage
+        try:
+            with get_instrumentation().span(f"tabletalk.stage.{stage}", parent=job.span):
+                self._stages[stage](job)
+        except Exception as exc:
+            self._instrument_failure(job, exc)
+            raise
+        if job.stage != "done":
+            return
+        assert job.trace is not None
+        calls = tuple(job.calls)
+        job.trace = replace(
+            job.trace,
+            usage=replace(
+                job.trace.usage,
+                latency_ms=(time.perf_counter() - job.started) * 1000,
+                prompt_tokens=_total(call.prompt_tokens for call in calls),
+                completion_tokens=_total(call.completion_tokens for call in calls),
+                cached_tokens=_total(call.cached_tokens for call in calls),
+                stages=dict(job.timings),
+                calls=calls,
+            ),
+        )
+        if self.run_directory:
+            started = time.perf_counter()
+            self.persistable(job.trace).write(self.run_directory)
+            job.trace = replace(
+                job.trace, usage=job.trace.usage.with_stage("write", job.record("write", started))
             )
-            for raw in answer_payload["claims"]
+        self._instrument_success(job)
+
+    def _instrument_success(self, job: AnswerJob) -> None:
+        instrumentation = get_instrumentation()
+        if not instrumentation.enabled:
+            return
+        assert job.trace is not None
+        agent, usage = self.agent.source.name, job.trace.usage
+        outcome = "verified" if all(check.passed for check in job.trace.verification) else "failed"
+        instrumentation.count("tabletalk_answers_total", agent=agent, outcome=outcome)
+        instrumentation.observe("tabletalk_answer_duration_ms", usage.latency_ms, agent=agent)
+        for stage, milliseconds in usage.stages.items():
+            instrumentation.observe("tabletalk_stage_duration_ms", milliseconds, stage=stage)
+        for call in usage.calls:
+            for kind, tokens in (
+                ("prompt", call.prompt_tokens),
+                ("completion", call.completion_tokens),
+                ("cached", call.cached_tokens),
+            ):
+                if tokens:
+                    instrumentation.count(
+                        "tabletalk_llm_tokens_total",
+                        tokens,
+                        agent=agent,
+                        stage=call.stage,
+                        kind=kind,
+                    )
+        if job.span is not None:
+            job.span.set(
+                outcome=outcome,
+                rows=job.trace.result.row_count,
+                prompt_tokens=usage.prompt_tokens or 0,
+                completion_tokens=usage.completion_tokens or 0,
+            )
+            job.span.end()
+
+    def _instrument_failure(self, job: AnswerJob, exc: Exception) -> None:
+        instrumentation = get_instrumentation()
+        if not instrumentation.enabled:
+            return
+        rejected = isinstance(exc, RejectionError)
+        instrumentation.count(
+            "tabletalk_answers_total",
+            agent=self.agent.source.name,
+            outcome="rejected" if rejected else "error",
         )
+        if job.span is not None:
+            job.span.set(outcome="rejected" if rejected else "error", stage=job.stage)
+            job.span.end(None if rejected else f"{type(exc).__name__}: {exc}")
+
+    @cached_property
+    def _stages(self) -> dict[str, Callable[[AnswerJob], None]]:
+        return {
+            "plan": self._plan,
+            "validate": self._validate,
+            "execute": self._execute,
+            "answer": self._answer,
+            "verify": self._verify,
+        }
+
+    def _plan(self, job: AnswerJob) -> None:
+        started = time.perf_counter()
+        self.llm.last_usage = {}
+        query = self.llm.generate_structured(job.messages, _QUERY_SCHEMA)
+        self._record_call(job, "plan", started)
+        raw_interpretation = query["interpretation"]
+        job.interpretation = Interpretation(
+            intent=str(raw_interpretation["intent"]),
+            metrics=tuple(raw_interpretation["metrics"]),
+            dimensions=tuple(raw_interpretation["dimensions"]),
+            start_date=raw_interpretation["start_date"],
+            end_date=raw_interpretation["end_date"],
+            assumptions=tuple(raw_interpretation["assumptions"]),
+        )
+        if query.get("rejection"):
+            raise RejectionError(f"Question rejected: {query['rejection']}")
+        if not query.get("sql"):
+            raise ValueError("Model did not provide SQL or an explicit rejection")
+        job.query = query
+        job.stage = "validate"
+
+    def _validate(self, job: AnswerJob) -> None:
+        assert job.query is not None
+        started = time.perf_counter()
+        try:
+            job.validated = validate_sql(
+                str(job.query["sql"]),
+                self.manifest,
+                self.agent.nodes,
+                dialect=self.connection.dialect,
+                max_rows=self.agent.source.max_rows,
+                allow_sensitive=self.agent.source.allow_sensitive,
+            )
+        except SQLValidationError as exc:
+            job.record("validate", started, per_attempt=True)
+            if job.attempt:
+                raise
+            job.attempt += 1
+            get_instrumentation().count("tabletalk_sql_repairs_total", agent=self.agent.source.name)
+            job.messages.append(
+                {
+                    "role": "system",
+                    "content": (
+                        "The proposed SQL failed the deterministic safety/schema "
+                        f"validator: {exc}. Correct the SQL using the declared dbt "
+                        "resources and return the complete structured response again."
+                    ),
+                }
+            )
+            job.stage = "plan"
+            return
+        job.record("validate", started, per_attempt=True)
+        job.stage = "execute"
+
+    def _execute(self, job: AnswerJob) -> None:
+        assert job.validated is not None
+        try:
+            job.rows, timings = self.connection.execute_timed(
+                job.validated.executed, self.agent.source.timeout_seconds
+            )
+        except Exception as exc:
+            raise RuntimeError(f"Read-only query execution failed: {exc}") from exc
+        job.timings.update(timings)
+        job.stage = "answer"
+
+    def _answer(self, job: AnswerJob) -> None:
+        messages = self._answer_messages(job)
+        started = time.perf_counter()
+        self.llm.last_usage = {}
+        job.answer_payload = self.llm.generate_structured(messages, _ANSWER_SCHEMA)
+        self._record_call(job, "answer", started)
+        job.stage = "verify"
+
+    def _record_call(self, job: AnswerJob, stage: str, started: float) -> None:
+        usage = self.llm.last_usage or {}
+        job.calls.append(
+            LLMCall(
+                stage,
+                job.record(stage, started, per_attempt=stage == "plan"),
+                usage.get("prompt_tokens"),
+                usage.get("completion_tokens"),
+                usage.get("cached_tokens"),
+                self.llm.last_model or self.model_identity,
+            )
+        )
+
+    @staticmethod
+    def _before_execute(
+        job: AnswerJob, callback: Callable[[Interpretation, str, str], None]
+    ) -> None:
+        assert job.interpretation is not None and job.validated is not None
+        callback(job.interpretation, job.validated.generated, job.validated.executed)
+
+    def _answer_messages(self, job: AnswerJob) -> list[dict[str, str]]:
+        assert job.validated is not None
+        started = time.perf_counter()
+        messages = [
+            {"role": "system", "content": _ANSWER_INSTRUCTIONS},
+            {
+                "role": "system",
+                "content": self._answer_prompt(
+                    job.validated.executed, job.rows, self.agent.source.prompt_evidence
+                ),
+            },
+            {"role": "user", "content": job.question},
+        ]
+        job.record("answer_prompt", started)
+        return messages
+
+    def _verify(self, job: AnswerJob) -> None:
+        assert job.validated is not None and job.interpretation is not None
+        assert job.query is not None and job.answer_payload is not None
+        started = time.perf_counter()
+        validated, rows, answer_payload = job.validated, job.rows, job.answer_payload
+        execution = Verification("execution_succeeded", True)
+        claims = tuple(_claim(raw) for raw in answer_payload["claims"])
         claim_checks = self._validate_claims(
-            str(answer_payload["text"]), claims, rows, question=question
+            str(answer_payload["text"]), claims, rows, question=job.question
         )
         disclosure_checks = (
             Verification(
@@ -218,10 +504,9 @@ class Runtime:
         test_health = {
             test.name: test.status for node in validated.nodes for test in node.tests if test.status
         }
-        usage_raw = getattr(self.llm, "last_usage", {}) or {}
-        trace = Trace(
-            question=question,
-            interpretation=interpretation,
+        job.trace = Trace(
+            question=job.question,
+            interpretation=job.interpretation,
             dbt_context=DbtContext(
                 manifest_digest=self.manifest.digest,
                 catalog_digest=self.manifest.catalog_digest,
@@ -230,46 +515,47 @@ class Runtime:
                 relevant_tests=used_tests,
                 test_health=test_health,
             ),
-            sql=SQLTrace(str(query["sql"]), validated.executed, self.connection.dialect),
-            result=ResultTrace(rows, len(rows)),
+            sql=SQLTrace(str(job.query["sql"]), validated.executed, self.connection.dialect),
+            result=ResultTrace(rows, len(rows), digest=result_digest(rows)),
             answer=Answer(str(answer_payload["text"]), claims),
             verification=validated.checks + (execution,) + claim_checks + disclosure_checks,
             agent=self.agent.source.name,
             agent_digest=self.agent.source.digest,
             model_identity=self.model_identity,
             warehouse_identity=self.connection.identity,
-            usage=Usage(
-                latency_ms=(time.perf_counter() - started) * 1000,
-                prompt_tokens=usage_raw.get("prompt_tokens"),
-                completion_tokens=usage_raw.get("completion_tokens"),
-            ),
+            usage=Usage(),
         )
-        if self.run_directory:
-            trace.write(self.run_directory)
-        return trace
+        job.record("verify", started)
+        job.stage = "done"
+
+    def persistable(self, trace: Trace) -> Trace:
+        """Apply the agent's trace evidence policy before a trace is written anywhere."""
+        return compact_trace(trace, self.agent.source.trace_evidence)
 
     def _query_prompt(self) -> str:
         instructions = "\n".join(f"- {item}" for item in self.agent.source.instructions) or "- None"
         return (
-            "Interpret the question and produce exactly one read-only SQL query. "
-            "Use only the dbt resources and declared columns below. Never infer "
-            "that a lineage edge is a safe join. Disclose exact date boundaries "
-            f"and assumptions.\nAgent instructions:\n{instructions}\nResources:\n"
+            f"{_QUERY_INSTRUCTIONS}\nAgent instructions:\n{instructions}\nResources:\n"
             f"{self.agent.prompt_context()}"
         )
 
     @staticmethod
-    def _answer_prompt(sql: str, rows: tuple[dict[str, Any], ...]) -> str:
-        return (
-            "Answer only from the executed SQL and returned evidence. Every factual "
-            "or numeric claim must cite one or more zero-based row indexes and exact "
-            "result column names. The text of each individual claim must contain the "
-            "values it cites, and each claim must cite every result column needed to "
-            "support it. Do not cite a name column for a numeric-only claim or a numeric "
-            "column for a name-only claim. The final answer text must state every claim "
-            "and directly include every output the user requested. Do not invent evidence.\n"
-            f"Executed SQL:\n{sql}\nEvidence rows:\n{rows!r}"
-        )
+    def _answer_prompt(
+        sql: str,
+        rows: tuple[dict[str, Any], ...],
+        policy: EvidencePolicy = EvidencePolicy(),
+    ) -> str:
+        indexes = policy.select(rows)
+        table = "Evidence rows (pipe-delimited; `row` is the zero-based row index to cite"
+        if len(indexes) == len(rows):
+            evidence = f"{table}):\n{encode_rows(rows)}"
+        else:
+            evidence = (
+                f"{table}; {len(indexes)} of {len(rows)} rows shown, cite only shown rows):\n"
+                f"{encode_rows(rows, indexes)}\n"
+                f"Column summary of all {len(rows)} rows:\n{encode_summary(summarize(rows))}"
+            )
+        return f"Executed SQL:\n{sql}\n{evidence}"
 
     @staticmethod
     def _validate_claims(
@@ -286,15 +572,21 @@ class Runtime:
                 ),
             )
         failures: list[str] = []
-        all_numeric_cells = {
-            float(rows[item.row][item.column])
-            for claim in claims
-            for item in claim.evidence
-            if 0 <= item.row < len(rows)
-            and item.column in rows[item.row]
-            and isinstance(rows[item.row][item.column], (int, float, Decimal))
-            and not isinstance(rows[item.row][item.column], bool)
-        }
+        question_numbers = {item.replace(",", "") for item in _QUESTION_NUMBER.findall(question)}
+        numeric_cells = sorted(
+            {
+                float(rows[item.row][item.column])
+                for claim in claims
+                for item in claim.evidence
+                if 0 <= item.row < len(rows)
+                and item.column in rows[item.row]
+                and isinstance(rows[item.row][item.column], (int, float, Decimal))
+                and not isinstance(rows[item.row][item.column], bool)
+            }
+        )
+        answer_words = _words(text)
+        answer_tokens = frozenset(answer_words.split())
+        text_present: dict[str, bool] = {}
         for claim in claims:
             if not claim.evidence:
                 failures.append(f"Claim has no evidence: {claim.text}")
@@ -305,43 +597,12 @@ class Runtime:
                     failures.append(
                         f"Evidence column '{evidence.column}' does not exist in row {evidence.row}"
                     )
-            claimed_numbers: list[tuple[float, tuple[tuple[float, float], ...]]] = []
-            claim_without_dates = re.sub(r"\b\d{4}-\d{2}-\d{2}\b", "", claim.text)
-            claim_without_dates = re.sub(
-                r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|"
-                r"Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|"
-                r"Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:,\s*\d{4})?\b",
-                "",
-                claim_without_dates,
-                flags=re.IGNORECASE,
-            )
-            for value, percent in re.findall(
-                r"(?<![\w-])\$?(-?\d[\d,]*(?:\.\d+)?)(%)?"
-                r"(?![\d,]|\.\d|-[A-Za-z])",
-                claim_without_dates,
-            ):
-                normalized_number = value.replace(",", "")
-                if len(normalized_number) == 4 and normalized_number.isdigit() and not percent:
-                    continue
-                question_numbers = {
-                    item.replace(",", "") for item in re.findall(r"-?\d[\d,]*(?:\.\d+)?", question)
-                }
-                if normalized_number in question_numbers:
-                    continue
-                decimals = len(normalized_number.partition(".")[2])
-                numeric_value = float(normalized_number)
-                tolerance = 0.5 * (10**-decimals) if decimals else 1e-9
-                candidates = [(numeric_value, tolerance)]
-                if percent:
-                    candidates.append((numeric_value / 100, tolerance / 100))
-                claimed_numbers.append((numeric_value, tuple(candidates)))
             unsupported = {
                 value
-                for value, candidates in claimed_numbers
+                for value, candidates in _claimed_numbers(claim.text, question_numbers)
                 if not any(
-                    abs(candidate - cell) <= tolerance + 1e-12
+                    _near(numeric_cells, candidate, tolerance + 1e-12)
                     for candidate, tolerance in candidates
-                    for cell in all_numeric_cells
                 )
             }
             if unsupported:
@@ -349,16 +610,21 @@ class Runtime:
                     "Numeric claim is absent from cited evidence: "
                     + ", ".join(str(value) for value in sorted(unsupported))
                 )
-            unsupported_text = {
-                str(rows[item.row][item.column])
-                for item in claim.evidence
-                if 0 <= item.row < len(rows)
-                and item.column in rows[item.row]
-                and isinstance(rows[item.row][item.column], str)
-                and rows[item.row][item.column].strip()
-                and not re.fullmatch(r"\d{4}-\d{2}-\d{2}(?:[ T].*)?", rows[item.row][item.column])
-                and not _text_value_present(rows[item.row][item.column], text)
-            }
+            unsupported_text = set()
+            for item in claim.evidence:
+                if not 0 <= item.row < len(rows) or item.column not in rows[item.row]:
+                    continue
+                value = rows[item.row][item.column]
+                if (
+                    not isinstance(value, str)
+                    or not value.strip()
+                    or _ISO_DATE_CELL.fullmatch(value)
+                ):
+                    continue
+                if value not in text_present:
+                    text_present[value] = _words_present(_words(value), answer_words, answer_tokens)
+                if not text_present[value]:
+                    unsupported_text.add(value)
             if unsupported_text:
                 failures.append(
                     "Text claim is absent from cited evidence: "
@@ -380,11 +646,8 @@ class Runtime:
 
 
 def _claim_covered(claim: str, context: str) -> bool:
-    def normalize(value: str) -> str:
-        return " ".join(re.findall(r"[a-z0-9]+", value.casefold()))
-
-    normalized_claim = normalize(claim)
-    normalized_context = normalize(context)
+    normalized_claim = _words(claim)
+    normalized_context = _words(context)
     ignored = {
         "a",
         "an",
@@ -421,14 +684,74 @@ def _claim_covered(claim: str, context: str) -> bool:
     )
 
 
-def _text_value_present(value: str, claim: str) -> bool:
-    normalized_value = " ".join(re.findall(r"[a-z0-9]+", value.casefold()))
-    normalized_claim = " ".join(re.findall(r"[a-z0-9]+", claim.casefold()))
-    if not normalized_value:
+def _claim(raw: dict[str, Any]) -> Claim:
+    return Claim(
+        text=str(raw["text"]),
+        evidence=tuple(Evidence(int(item["row"]), str(item["column"])) for item in raw["evidence"]),
+    )
+
+
+def _total(values: Iterable[int | None]) -> int | None:
+    reported = [value for value in values if value is not None]
+    return sum(reported) if reported else None
+
+
+def _claimed_numbers(
+    claim: str, question_numbers: set[str]
+) -> list[tuple[float, tuple[tuple[float, float], ...]]]:
+    """Numbers a claim asserts, with their rounding tolerance and any percent-scaled reading.
+
+    Dates, bare four-digit years, and numbers repeated from the question are not claims.
+    """
+    claimed = []
+    for value, percent in _CLAIM_NUMBER.findall(_MONTH_DAY.sub("", _ISO_DATE.sub("", claim))):
+        normalized_number = value.replace(",", "")
+        if len(normalized_number) == 4 and normalized_number.isdigit() and not percent:
+            continue
+        if normalized_number in question_numbers:
+            continue
+        decimals = len(normalized_number.partition(".")[2])
+        numeric_value = float(normalized_number)
+        tolerance = 0.5 * (10**-decimals) if decimals else 1e-9
+        candidates = [(numeric_value, tolerance)]
+        if percent:
+            candidates.append((numeric_value / 100, tolerance / 100))
+        claimed.append((numeric_value, tuple(candidates)))
+    return claimed
+
+
+def _near(cells: list[float], value: float, tolerance: float) -> bool:
+    """Whether any sorted cell lies within `tolerance` of `value`."""
+    index = bisect_left(cells, value - tolerance)
+    return any(
+        abs(value - cells[position]) <= tolerance
+        for position in (index - 1, index)
+        if 0 <= position < len(cells)
+    )
+
+
+def _words(value: str) -> str:
+    return " ".join(_WORD.findall(value.casefold()))
+
+
+def _words_present(value: str, words: str, tokens: frozenset[str]) -> bool:
+    if not value:
         return True
-    if " " in normalized_value:
-        return normalized_value in normalized_claim
-    return normalized_value in normalized_claim.split()
+    if " " in value:
+        return value in words
+    return value in tokens
+
+
+def _text_value_present(value: str, claim: str) -> bool:
+    words = _words(claim)
+    return _words_present(_words(value), words, frozenset(words.split()))
 
 
-__all__ = ["RejectionError", "Runtime", "SQLValidationError"]
+__all__ = [
+    "AnswerEvent",
+    "AnswerJob",
+    "PipelineScheduler",
+    "RejectionError",
+    "Runtime",
+    "SQLValidationError",
+]
@@ -0,0 +1,140 @@
+"""Runtime stages and a scheduler that overlaps model calls with warehouse execution."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from tabletalk.instrumentation import ActiveSpan
+from tabletalk.traces import Interpretation, LLMCall, Trace
+from tabletalk.validation import ValidatedSQL
+
+if TYPE_CHECKING:
+    from tabletalk.runtime import Runtime
+
+STAGES = ("plan", "validate", "execute", "answer", "verify")
+LLM_STAGES = frozenset({"plan", "answer"})
+WAREHOUSE_STAGES = frozenset({"execute"})
+
+
+@dataclass
+class AnswerJob:
+    """One question's progress through the runtime; `stage` names the next stage to run.
+
+    A failed validation sends the job back to `plan` once. Finished jobs have stage `done` and a
+    `trace` whose `Usage` holds the timings and model calls recorded along the way. `span` is the
+    job's root instrumentation span; each stage runs in a child span.
+    """
+
+    question: str
+    messages: list[dict[str, str]]
+    started: float = field(default_factory=time.perf_counter)
+    stage: str = "plan"
+    attempt: int = 0
+    query: dict[str, Any] | None = None
+    interpretation: Interpretation | None = None
+    validated: ValidatedSQL | None = None
+    rows: tuple[dict[str, Any], ...] = ()
+    answer_payload: dict[str, Any] | None = None
+    calls: list[LLMCall] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    trace: Trace | None = None
+    span: ActiveSpan | None = None
+
+    def record(self, name: str, started: float, *, per_attempt: bool = False) -> float:
+        """Record milliseconds since `started` under `name` and return them."""
+        if per_attempt and self.attempt:
+            name = f"{name}_{self.attempt + 1}"
+        elapsed = (time.perf_counter() - started) * 1000
+        self.timings[name] = self.timings.get(name, 0) + elapsed
+        return elapsed
+
+
+class PipelineScheduler:
+    """Drive many questions through one runtime with separate model and warehouse pools.
+
+    While one question waits on the warehouse, others can be planned or answered by the model.
+    Validation and verification are CPU-only and run on the scheduling thread. `rate_limit` caps
+    how many questions start per second; questions are read from the iterable only as they start.
+    """
+
+    def __init__(
+        self,
+        runtime: Runtime,
+        *,
+        llm_workers: int = 4,
+        warehouse_workers: int = 2,
+        rate_limit: float | None = None,
+    ) -> None:
+        if llm_workers < 1 or warehouse_workers < 1:
+            raise ValueError("Pipeline worker counts must be positive")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("Pipeline rate limit must be positive")
+        self.runtime = runtime
+        self.llm_workers = llm_workers
+        self.warehouse_workers = warehouse_workers
+        self.rate_limit = rate_limit
+
+    def run(self, questions: Iterable[str]) -> Iterator[tuple[int, Trace | Exception]]:
+        """Yield `(question index, trace or exception)` in completion order."""
+        with (
+            ThreadPoolExecutor(self.llm_workers, thread_name_prefix="tabletalk-llm") as llm,
+            ThreadPoolExecutor(
+                self.warehouse_workers, thread_name_prefix="tabletalk-warehouse"
+            ) as warehouse,
+        ):
+            ready: deque[tuple[int, AnswerJob]] = deque()
+            running: dict[Future[None], tuple[int, AnswerJob]] = {}
+            pending = enumerate(questions)
+            interval = 1 / self.rate_limit if self.rate_limit else 0.0
+            next_start = time.perf_counter()
+            exhausted = False
+            while not exhausted or ready or running:
+                while not exhausted and time.perf_counter() >= next_start:
+                    item = next(pending, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    next_start = max(next_start, time.perf_counter() - interval) + interval
+                    index, question = item
+                    try:
+                        ready.append((index, self.runtime.start(question)))
+                    except Exception as exc:
+                        yield index, exc
+                while ready:
+                    index, job = ready.popleft()
+                    if job.stage == "done":
+                        assert job.trace is not None
+                        yield index, job.trace
+                    elif job.stage in LLM_STAGES or job.stage in WAREHOUSE_STAGES:
+                        pool = llm if job.stage in LLM_STAGES else warehouse
+                        running[pool.submit(self.runtime.advance, job)] = (index, job)
+                    else:
+                        try:
+                            self.runtime.advance(job)
+                        except Exception as exc:
+                            yield index, exc
+                        else:
+                            ready.append((index, job))
+                delay = None if exhausted else max(next_start - time.perf_counter(), 0)
+                if not running:
+                    if delay:
+                        time.sleep(delay)
+                    continue
+                finished, _ = wait(running, timeout=delay, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, job = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        ready.append((index, job))
+                    elif isinstance(error, Exception):
+                        yield index, error
+                    else:
+                        raise error
+
+
+__all__ = ["STAGES", "AnswerJob", "PipelineScheduler"]
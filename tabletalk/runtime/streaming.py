@@ -0,0 +1,151 @@
+"""Incremental parsing of streamed structured answers."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from tabletalk.interfaces import validate_structured_value
+from tabletalk.traces import Verification
+
+
+@dataclass(frozen=True)
+class AnswerEvent:
+    """One step of a streamed answer.
+
+    `kind` is `interpretation`, `sql`, `rows` (a batch starting at `offset`), `text` (an answer text
+    delta), `claim` (a completed claim with its own `verification`), or `trace` (always last).
+    """
+
+    kind: str
+    value: Any
+    offset: int = 0
+    verification: tuple[Verification, ...] = ()
+
+
+class StructuredAnswerParser:
+    """Scan a streamed `{"text": ..., "claims": [...]}` object as its chunks arrive.
+
+    `feed` returns `("text", delta)` for newly decoded answer text and `("claim", payload)` for each
+    claim object as soon as its closing brace arrives. Text before the first `{` is ignored.
+    """
+
+    def __init__(self, claim_schema: dict[str, Any]) -> None:
+        self.claim_schema = claim_schema
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._done = False
+        self._key: str | None = None
+        self._expect_key = False
+        self._string_start: int | None = None
+        self._string_is_key = False
+        self._string_is_text = False
+        self._escape = False
+        self._unicode_digits = 0
+        self._high_surrogate = False
+        self._text_emitted = 0
+        self._text_safe = 0
+        self._claim_start: int | None = None
+        self._claims = 0
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        self._buffer += chunk
+        events: list[tuple[str, Any]] = []
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer) and not self._done:
+            character = buffer[position]
+            if self._string_start is not None:
+                self._string_character(character, position, events)
+            elif self._depth == 0:
+                if character == "{":
+                    self._depth = 1
+                    self._expect_key = True
+            elif character == '"':
+                self._string_start = position + 1
+                self._string_is_key = self._depth == 1 and self._expect_key
+                self._string_is_text = (
+                    self._depth == 1 and not self._expect_key and self._key == "text"
+                )
+                self._text_emitted = self._text_safe = position + 1
+            elif character in "{[":
+                self._depth += 1
+                if character == "{" and self._depth == 3 and self._key == "claims":
+                    self._claim_start = position
+            elif character in "}]":
+                self._depth -= 1
+                if self._depth == 2 and self._claim_start is not None:
+                    events.append(("claim", self._claim(buffer[self._claim_start : position + 1])))
+                    self._claim_start = None
+                self._done = self._depth == 0
+            elif self._depth == 1 and character in ",:":
+                self._expect_key = character == ","
+            position += 1
+        self._position = position
+        if self._string_is_text and self._string_start is not None:
+            self._emit_text(events)
+        return events
+
+    def close(self, schema: dict[str, Any]) -> dict[str, Any]:
+        """Decode and validate the complete object once the stream has ended."""
+        start = self._buffer.find("{")
+        try:
+            value, _ = json.JSONDecoder().raw_decode(self._buffer, max(start, 0))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Streamed structured output is malformed JSON: {exc}") from exc
+        if not isinstance(value, dict):
+            raise ValueError("Model structured output must be an object")
+        validate_structured_value(value, schema)
+        return value
+
+    def _string_character(
+        self, character: str, position: int, events: list[tuple[str, Any]]
+    ) -> None:
+        if self._unicode_digits:
+            self._unicode_digits -= 1
+            if not self._unicode_digits:
+                self._escape = False
+                code = int(self._buffer[position - 3 : position + 1], 16)
+                if 0xD800 <= code <= 0xDBFF and not self._high_surrogate:
+                    self._high_surrogate = True
+                    return
+                self._high_surrogate = False
+                self._text_safe = position + 1
+        elif self._escape:
+            if character == "u":
+                self._unicode_digits = 4
+                return
+            self._escape = False
+            self._high_surrogate = False
+            self._text_safe = position + 1
+        elif character == "\\":
+            self._escape = True
+        elif character == '"':
+            assert self._string_start is not None
+            if self._string_is_text:
+                self._text_safe = position
+                self._emit_text(events)
+            if self._string_is_key:
+                self._key = json.loads(self._buffer[self._string_start - 1 : position + 1])
+            self._string_start = None
+            self._string_is_key = self._string_is_text = False
+        else:
+            self._high_surrogate = False
+            self._text_safe = position + 1
+
+    def _emit_text(self, events: list[tuple[str, Any]]) -> None:
+        if self._text_safe > self._text_emitted:
+            segment = self._buffer[self._text_emitted : self._text_safe]
+            events.append(("text", json.loads(f'"{segment}"')))
+            self._text_emitted = self._text_safe
+
+    def _claim(self, raw: str) -> dict[str, Any]:
+        value = json.loads(raw)
+        validate_structured_value(value, self.claim_schema, f"$.claims[{self._claims}]")
+        self._claims += 1
+        return value
+
+
+__all__ = ["AnswerEvent", "StructuredAnswerParser"]
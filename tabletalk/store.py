@@ -0,0 +1,515 @@
+"""Indexed SQLite history of live traces and eval results."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from tabletalk.traces import Trace
+
+if TYPE_CHECKING:
+    from tabletalk.evals import SuiteResult
+
+_SCHEMA = (
+    """
+    create table if not exists traces (
+        id integer primary key,
+        kind text not null,
+        created_at text not null,
+        agent text not null,
+        question text not null,
+        suite text,
+        case_name text,
+        passed integer not null,
+        error text,
+        manifest_digest text,
+        model_identity text,
+        warehouse_identity text,
+        agent_digest text,
+        eval_suite_digest text,
+        latency_ms real,
+        prompt_tokens integer,
+        completion_tokens integer,
+        row_count integer,
+        payload text,
+        shard text
+    )
+    """,
+    """
+    create table if not exists trace_rows (
+        trace_id integer primary key references traces(id) on delete cascade,
+        rows text not null
+    )
+    """,
+    "create index if not exists traces_created_at on traces(created_at, latency_ms)",
+    "create index if not exists traces_agent on traces(agent, created_at)",
+    "create index if not exists traces_manifest_digest on traces(manifest_digest, created_at)",
+    "create index if not exists traces_model_identity on traces(model_identity, created_at)",
+    "create index if not exists traces_passed on traces(passed, created_at)",
+    "create index if not exists traces_case on traces(suite, case_name, created_at)",
+    """
+    create unique index if not exists traces_identity on traces(
+        kind, created_at, agent, question, coalesce(suite, ''), coalesce(case_name, '')
+    )
+    """,
+)
+
+_BUCKETS = {"hour": 13, "day": 10, "month": 7, "all": 0}
+_FILTERS = ("agent", "kind", "manifest_digest", "model_identity", "suite", "case_name", "passed")
+
+
+class TraceStoreError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class RunStatistics:
+    bucket: str
+    count: int
+    failures: int
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    prompt_tokens: int
+    completion_tokens: int
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.count if self.count else 0.0
+
+
+def parse_time_bound(value: str, now: datetime | None = None) -> str:
+    """Return an ISO UTC bound from an ISO date/datetime or a relative '7d'/'24h'/'2w' window."""
+    current = now or datetime.now(timezone.utc)
+    relative = re.fullmatch(r"\s*(\d+)\s*([hdw])\s*", value)
+    if relative:
+        amount = int(relative.group(1))
+        unit = {"h": "hours", "d": "days", "w": "weeks"}[relative.group(2)]
+        return (current - timedelta(**{unit: amount})).isoformat()
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError as exc:
+        raise TraceStoreError(
+            f"Invalid time bound '{value}'; use ISO date/datetime or a window like 7d"
+        ) from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+class TraceStore:
+    """Append-only local index over the JSON records in `.tabletalk`.
+
+    Result rows live in a separate table so history queries never read evidence.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("pragma journal_mode=wal")
+        self._connection.execute("pragma foreign_keys=on")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+            columns = {row[1] for row in self._connection.execute("pragma table_info(traces)")}
+            if "shard" not in columns:
+                self._connection.execute("alter table traces add column shard text")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def add_trace(
+        self,
+        trace: Trace,
+        *,
+        kind: str = "run",
+        suite: str | None = None,
+        case_name: str | None = None,
+        passed: bool | None = None,
+        shard: str | None = None,
+    ) -> int | None:
+        """Index one trace; returns its id, or None when it was already indexed."""
+        payload = trace.to_dict()
+        rows = payload["result"].pop("rows")
+        record = {
+            "kind": kind,
+            "created_at": trace.created_at,
+            "agent": trace.agent,
+            "question": trace.question,
+            "suite": suite,
+            "case_name": case_name,
+            "passed": int(trace.passed if passed is None else passed),
+            "error": None,
+            "manifest_digest": trace.dbt_context.manifest_digest,
+            "model_identity": trace.model_identity,
+            "warehouse_identity": trace.warehouse_identity,
+            "agent_digest": trace.agent_digest,
+            "eval_suite_digest": trace.eval_suite_digest,
+            "latency_ms": trace.usage.latency_ms,
+            "prompt_tokens": trace.usage.prompt_tokens,
+            "completion_tokens": trace.usage.completion_tokens,
+            "row_count": trace.result.row_count,
+            "payload": json.dumps(payload, sort_keys=True),
+            "shard": shard,
+        }
+        return self._insert(record, json.dumps(rows, sort_keys=True))
+
+    def add_suite_result(self, result: SuiteResult, created_at: str | None = None) -> int:
+        """Index every case of a `SuiteResult`, including cases that failed before tracing."""
+        timestamp = created_at or datetime.now(timezone.utc).isoformat()
+        count = 0
+        for case in result.cases:
+            if case.trace is not None:
+                trace_id = self.add_trace(
+                    case.trace,
+                    kind="eval",
+                    suite=result.name,
+                    case_name=case.name,
+                    passed=case.passed,
+                    shard=result.shard,
+                )
+                count += trace_id is not None
+                continue
+            record = {
+                "kind": "eval",
+                "created_at": timestamp,
+                "agent": result.agent,
+                "question": "",
+                "suite": result.name,
+                "case_name": case.name,
+                "passed": int(case.passed),
+                "error": case.error,
+                "eval_suite_digest": result.suite_digest,
+                "shard": result.shard,
+            }
+            count += self._insert(record, None) is not None
+        return count
+
+    def import_file(self, path: str | Path) -> int:
+        """Backfill one persisted run or eval-result JSON file; returns indexed records."""
+        source = Path(path)
+        try:
+            payload = json.loads(source.read_text())
+        except (OSError, json.JSONDecodeError) as exc:
+            raise TraceStoreError(f"Could not import {source}: {exc}") from exc
+        if isinstance(payload, dict) and "cases" in payload:
+            count = 0
+            for case in payload.get("cases") or ():
+                trace = case.get("trace") or {}
+                inserted = self._insert(
+                    _record_from_payload(
+                        trace,
+                        kind="eval",
+                        agent=str(payload.get("agent") or ""),
+                        suite=payload.get("name"),
+                        case_name=case.get("name"),
+                        passed=bool(case.get("passed")),
+                        error=case.get("error"),
+                        fallback_created_at=_persisted_timestamp(source),
+                        shard=payload.get("shard"),
+                    ),
+                    json.dumps(trace.get("result", {}).get("rows", []), sort_keys=True)
+                    if trace
+                    else None,
+                )
+                count += inserted is not None
+            return count
+        if isinstance(payload, dict) and "question" in payload:
+            verification = payload.get("verification") or ()
+            inserted = self._insert(
+                _record_from_payload(
+                    payload,
+                    kind="run",
+                    agent=str(payload.get("agent") or ""),
+                    passed=all(check.get("passed") for check in verification),
+                ),
+                json.dumps(payload.get("result", {}).get("rows", []), sort_keys=True),
+            )
+            return int(inserted is not None)
+        raise TraceStoreError(f"{source} is not a tabletalk run or eval-result record")
+
+    def import_directory(self, directory: str | Path) -> int:
+        return sum(self.import_file(path) for path in sorted(Path(directory).rglob("*.json")))
+
+    def count(self) -> int:
+        return int(self._connection.execute("select count(*) from traces").fetchone()[0])
+
+    def statistics(
+        self,
+        *,
+        bucket: str = "day",
+        since: str | None = None,
+        until: str | None = None,
+        **filters: Any,
+    ) -> tuple[RunStatistics, ...]:
+        """Latency percentiles, token totals, and failure counts per time bucket."""
+        if bucket not in _BUCKETS:
+            raise TraceStoreError(f"Unsupported bucket '{bucket}'; use {', '.join(_BUCKETS)}")
+        where, parameters = _where(since, until, filters)
+        key = f"substr(created_at, 1, {_BUCKETS[bucket]})" if _BUCKETS[bucket] else "'all'"
+        totals = self._connection.execute(
+            f"""
+            select {key} as bucket, count(*), sum(1 - passed),
+                   coalesce(sum(prompt_tokens), 0), coalesce(sum(completion_tokens), 0),
+                   count(latency_ms)
+            from traces {where}
+            group by bucket order by bucket
+            """,
+            parameters,
+        ).fetchall()
+        if not totals:
+            return ()
+        ranks = {
+            (row[0], percentile): math.ceil(percentile * row[5]) or 1
+            for row in totals
+            for percentile in (0.5, 0.95, 0.99)
+        }
+        positions = sorted(set(ranks.values()))
+        ranked = self._connection.execute(
+            f"""
+            select bucket, position, latency_ms from (
+                select {key} as bucket, latency_ms,
+                       row_number() over (partition by {key} order by latency_ms) as position
+                from traces {where} {"and" if where else "where"} latency_ms is not null
+            ) where position in ({", ".join("?" * len(positions))})
+            """,
+            [*parameters, *positions],
+        ).fetchall()
+        latencies = {(row[0], row[1]): float(row[2]) for row in ranked}
+        return tuple(
+            RunStatistics(
+                bucket=str(row[0]),
+                count=int(row[1]),
+                failures=int(row[2] or 0),
+                p50_ms=latencies.get((row[0], ranks[(row[0], 0.5)])),
+                p95_ms=latencies.get((row[0], ranks[(row[0], 0.95)])),
+                p99_ms=latencies.get((row[0], ranks[(row[0], 0.99)])),
+                prompt_tokens=int(row[3]),
+                completion_tokens=int(row[4]),
+            )
+            for row in totals
+        )
+
+    def traces(
+        self,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int | None = None,
+        **filters: Any,
+    ) -> Iterator[Trace]:
+        """Yield stored traces newest first; evidence rows load only when `rows` is read."""
+        where, parameters = _where(since, until, filters)
+        clause = f"{where} {'and' if where else 'where'} payload is not null"
+        cursor = self._connection.execute(
+            f"select id, payload from traces {clause} order by created_at desc, id desc"
+            + (" limit ?" if limit is not None else ""),
+            [*parameters, *((limit,) if limit is not None else ())],
+        )
+        for trace_id, payload in cursor:
+            yield self._trace(int(trace_id), payload)
+
+    def approved_sql(self, agent: str, suite: str) -> dict[str, str]:
+        """Generated SQL from the most recent passing eval trace of each case in a suite."""
+        cursor = self._connection.execute(
+            """
+            select case_name, json_extract(payload, '$.sql.generated') from traces
+            where kind = 'eval' and agent = ? and suite = ? and passed = 1
+              and payload is not null
+            order by created_at desc, id desc
+            """,
+            (agent, suite),
+        )
+        approved: dict[str, str] = {}
+        for case_name, sql in cursor:
+            if case_name and sql:
+                approved.setdefault(case_name, sql)
+        return approved
+
+    def case_latencies(self) -> dict[tuple[str, str, str], float]:
+        """Mean latency in milliseconds of every eval case, keyed by agent, suite, and case.
+
+        Sharded runs are left out, so every shard of a run sees the same history and computes the
+        same partition.
+        """
+        cursor = self._connection.execute(
+            """
+            select agent, suite, case_name, avg(latency_ms) from traces
+            where kind = 'eval' and suite is not null and case_name is not null
+              and latency_ms is not null and shard is null
+            group by agent, suite, case_name
+            """
+        )
+        return {(agent, suite, case): float(latency) for agent, suite, case, latency in cursor}
+
+    def case_nodes(self, agent: str, suite: str) -> dict[str, tuple[str, ...]]:
+        """dbt unique IDs selected by the most recent traced eval run of each case in a suite."""
+        cursor = self._connection.execute(
+            """
+            select case_name, json_extract(payload, '$.dbt_context.selected_nodes') from traces
+            where kind = 'eval' and agent = ? and suite = ? and payload is not null
+            order by created_at desc, id desc
+            """,
+            (agent, suite),
+        )
+        nodes: dict[str, tuple[str, ...]] = {}
+        for case_name, selected in cursor:
+            if case_name and selected:
+                nodes.setdefault(case_name, tuple(json.loads(selected)))
+        return nodes
+
+    def trace(self, trace_id: int) -> Trace:
+        row = self._connection.execute(
+            "select payload from traces where id = ?", (trace_id,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            raise TraceStoreError(f"No stored trace with id {trace_id}")
+        return self._trace(trace_id, row[0])
+
+    def _trace(self, trace_id: int, payload: str) -> Trace:
+        def load_rows() -> tuple[dict[str, Any], ...]:
+            row = self._connection.execute(
+                "select rows from trace_rows where trace_id = ?", (trace_id,)
+            ).fetchone()
+            return tuple(json.loads(row[0])) if row else ()
+
+        return Trace.from_dict(json.loads(payload), load_rows=load_rows)
+
+    def _insert(self, record: dict[str, Any], rows: str | None) -> int | None:
+        columns = ", ".join(record)
+        placeholders = ", ".join("?" * len(record))
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                f"insert or ignore into traces ({columns}) values ({placeholders})",
+                tuple(record.values()),
+            )
+            if not cursor.rowcount:
+                return None
+            trace_id = int(cursor.lastrowid or 0)
+            if rows is not None:
+                self._connection.execute(
+                    "insert into trace_rows (trace_id, rows) values (?, ?)", (trace_id, rows)
+                )
+        return trace_id
+
+
+def _where(since: str | None, until: str | None, filters: dict[str, Any]) -> tuple[str, list[Any]]:
+    unknown = set(filters) - set(_FILTERS)
+    if unknown:
+        raise TraceStoreError(f"Unsupported filter: {', '.join(sorted(unknown))}")
+    clauses: list[str] = []
+    parameters: list[Any] = []
+    if since:
+        clauses.append("created_at >= ?")
+        parameters.append(since)
+    if until:
+        clauses.append("created_at < ?")
+        parameters.append(until)
+    for name, value in filters.items():
+        if value is not None:
+            clauses.append(f"{name} = ?")
+            parameters.append(int(value) if isinstance(value, bool) else value)
+    return ("where " + " and ".join(clauses) if clauses else ""), parameters
+
+
+def _persisted_timestamp(path: Path) -> str:
+    """Recover the creation time encoded in an eval-result filename by `_persist_eval_result`."""
+    match = re.match(r"(\d{4}-\d{2}-\d{2})(T[\d.+-]+)-[0-9a-f]{12}$", path.stem)
+    if match:
+        try:
+            return datetime.fromisoformat(
+                match.group(1) + match.group(2).replace("-", ":")
+            ).isoformat()
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat()
+
+
+def _record_from_payload(
+    payload: dict[str, Any],
+    *,
+    kind: str,
+    agent: str,
+    passed: bool,
+    suite: str | None = None,
+    case_name: str | None = None,
+    error: str | None = None,
+    fallback_created_at: str = "",
+    shard: str | None = None,
+) -> dict[str, Any]:
+    context = payload.get("dbt_context") or {}
+    usage = payload.get("usage") or {}
+    result = dict(payload.get("result") or {})
+    result.pop("rows", None)
+    stored = {**payload, "result": result} if payload else None
+    return {
+        "kind": kind,
+        "created_at": str(payload.get("created_at") or fallback_created_at),
+        "agent": str(payload.get("agent") or agent),
+        "question": str(payload.get("question") or ""),
+        "suite": suite,
+        "case_name": case_name,
+        "passed": int(passed),
+        "error": error,
+        "manifest_digest": context.get("manifest_digest"),
+        "model_identity": payload.get("model_identity"),
+        "warehouse_identity": payload.get("warehouse_identity"),
+        "agent_digest": payload.get("agent_digest"),
+        "eval_suite_digest": payload.get("eval_suite_digest"),
+        "latency_ms": usage.get("latency_ms"),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "row_count": result.get("row_count"),
+        "payload": json.dumps(stored, sort_keys=True) if stored else None,
+        "shard": shard,
+    }
+
+
+def summarize_traces(traces: Iterable[Trace], bucket: str = "all") -> RunStatistics:
+    """`RunStatistics` for in-memory traces, with the nearest-rank percentiles of the index."""
+    items = list(traces)
+    latencies = sorted(trace.usage.latency_ms for trace in items)
+
+    def percentile(value: float) -> float | None:
+        return latencies[(math.ceil(value * len(latencies)) or 1) - 1] if latencies else None
+
+    return RunStatistics(
+        bucket=bucket,
+        count=len(items),
+        failures=sum(not trace.passed for trace in items),
+        p50_ms=percentile(0.5),
+        p95_ms=percentile(0.95),
+        p99_ms=percentile(0.99),
+        prompt_tokens=sum(trace.usage.prompt_tokens or 0 for trace in items),
+        completion_tokens=sum(trace.usage.completion_tokens or 0 for trace in items),
+    )
+
+
+def statistics_rows(statistics: Iterable[RunStatistics]) -> list[dict[str, Any]]:
+    return [
+        {
+            "bucket": item.bucket,
+            "count": item.count,
+            "failures": item.failures,
+            "failure_rate": item.failure_rate,
+            "p50_ms": item.p50_ms,
+            "p95_ms": item.p95_ms,
+            "p99_ms": item.p99_ms,
+            "prompt_tokens": item.prompt_tokens,
+            "completion_tokens": item.completion_tokens,
+        }
+        for item in statistics
+    ]
+
+
+__all__ = ["RunStatistics", "TraceStore", "TraceStoreError", "parse_time_bound", "summarize_traces"]
@@ -0,0 +1,448 @@
+"""Deterministic synthetic dbt projects for benchmarks and load tests.
+
+`generate` builds manifest, catalog, and run_results payloads shaped like dbt's own artifacts;
+`write_project` adds dbt_project.yml, profiles.yml, tabletalk.yaml, and a DuckDB warehouse whose
+tables match the generated relations, so every command can run against the result.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from tabletalk.providers.duckdb_provider import DuckDBProvider
+
+DATABASE = "analytics"
+SCHEMA = "main"
+SCHEMA_VERSION = "https://schemas.getdbt.com/dbt/manifest/v12.json"
+GROUP_NAMES = (
+    "finance",
+    "marketing",
+    "sales",
+    "product",
+    "operations",
+    "support",
+    "growth",
+    "risk",
+    "supply",
+    "people",
+)
+_BASE_COLUMNS = (
+    ("id", "integer", "INTEGER", "Stable row identifier."),
+    ("event_date", "date", "DATE", "Date on which the event was recorded."),
+    ("amount", "decimal(18,2)", "DECIMAL(18,2)", "Amount in USD."),
+    ("category", "varchar", "VARCHAR", "Business category."),
+)
+_TESTS = (("not_null", "id"), ("unique", "id"), ("not_null", "event_date"), ("not_null", "amount"))
+
+
+class SyntheticError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Shape of a generated project; equal specs always produce identical artifacts.
+
+    Models are split evenly into `depth` layers. Each model reads up to `fan_out` models from the
+    previous layer (the first layer reads sources), so lineage is `depth` models deep. Every
+    twentieth intermediate model is ephemeral and every hundredth model is disabled, as in real
+    projects; every fiftieth test failed in the generated run_results.
+    """
+
+    models: int = 1000
+    columns: int = 12
+    depth: int = 4
+    fan_out: int = 3
+    groups: int = 10
+    tags: int = 25
+    packages: int = 1
+    tests: int = 2
+    sources: int = 0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        for name in ("models", "depth", "fan_out", "groups", "packages"):
+            if getattr(self, name) < 1:
+                raise SyntheticError(f"synthetic {name} must be at least 1")
+        if self.columns < len(_BASE_COLUMNS):
+            raise SyntheticError(f"synthetic columns must be at least {len(_BASE_COLUMNS)}")
+        if not 0 <= self.tests <= len(_TESTS):
+            raise SyntheticError(f"synthetic tests must be between 0 and {len(_TESTS)}")
+        if self.tags < 0 or self.sources < 0:
+            raise SyntheticError("synthetic tags and sources cannot be negative")
+
+    @property
+    def source_count(self) -> int:
+        return self.sources or max(1, self.models // 50)
+
+
+@dataclass(frozen=True)
+class SyntheticArtifacts:
+    manifest: dict[str, Any]
+    catalog: dict[str, Any]
+    run_results: dict[str, Any]
+
+    def relations(self) -> tuple[dict[str, Any], ...]:
+        """Queryable models and sources: the relations a matching warehouse must contain."""
+        resources = (*self.manifest["sources"].values(), *self.manifest["nodes"].values())
+        return tuple(
+            resource
+            for resource in resources
+            if resource["resource_type"] in {"model", "source"}
+            and resource["config"].get("materialized") != "ephemeral"
+        )
+
+
+def generate(spec: SyntheticSpec) -> SyntheticArtifacts:
+    generator = random.Random(spec.seed)
+    packages = ["analytics", *(f"package_{index}" for index in range(1, spec.packages))]
+    groups = [
+        GROUP_NAMES[index % len(GROUP_NAMES)]
+        + (f"_{index // len(GROUP_NAMES)}" if index >= len(GROUP_NAMES) else "")
+        for index in range(spec.groups)
+    ]
+    manifest: dict[str, Any] = {
+        "metadata": {
+            "dbt_schema_version": SCHEMA_VERSION,
+            "dbt_version": "1.10.0",
+            "project_name": "analytics",
+            "adapter_type": "duckdb",
+            "generated_at": "2026-01-01T00:00:00Z",
+        },
+        "nodes": {},
+        "sources": {},
+        "macros": {},
+        "docs": {},
+        "exposures": {},
+        "metrics": {},
+        "groups": {
+            f"group.analytics.{group}": {
+                "name": group,
+                "resource_type": "group",
+                "package_name": "analytics",
+                "unique_id": f"group.analytics.{group}",
+                "owner": {"name": f"{group.replace('_', ' ').title()} Analytics"},
+            }
+            for group in groups
+        },
+        "selectors": {},
+        "disabled": {},
+        "parent_map": {},
+        "child_map": {},
+        "semantic_models": {},
+        "unit_tests": {},
+    }
+    catalog: dict[str, Any] = {
+        "metadata": {"dbt_version": "1.10.0", "generated_at": "2026-01-01T00:00:00Z"},
+        "nodes": {},
+        "sources": {},
+        "errors": None,
+    }
+    results: list[dict[str, Any]] = []
+
+    previous_layer: list[str] = []
+    for index in range(spec.source_count):
+        name = f"raw_{index:05d}"
+        unique_id = f"source.analytics.raw.{name}"
+        manifest["sources"][unique_id] = {
+            **_relation(unique_id, "source", "analytics", name, spec.columns),
+            "source_name": "raw",
+            "identifier": name,
+            "fqn": ["analytics", "raw", name],
+            "path": "models/sources.yml",
+            "original_file_path": "models/sources.yml",
+            "description": f"Raw table {index} loaded before dbt transformations.",
+            "config": {"enabled": True},
+        }
+        catalog["sources"][unique_id] = _catalog_entry(unique_id, name, spec.columns, "BASE TABLE")
+        previous_layer.append(unique_id)
+
+    layer_sizes = [
+        spec.models // spec.depth + (1 if layer < spec.models % spec.depth else 0)
+        for layer in range(spec.depth)
+    ]
+    number = 0
+    for layer, size in enumerate(layer_sizes):
+        prefix = "stg" if layer == 0 else "fct" if layer == spec.depth - 1 else "int"
+        current_layer: list[str] = []
+        for _ in range(size):
+            group = groups[number % len(groups)]
+            package = packages[number % len(packages)]
+            name = f"{prefix}_{group}_{number:05d}"
+            unique_id = f"model.{package}.{name}"
+            parents = sorted(
+                generator.sample(previous_layer, min(spec.fan_out, len(previous_layer)))
+            )
+            ephemeral = 0 < layer < spec.depth - 1 and number % 20 == 19
+            materialized = "ephemeral" if ephemeral else "view" if layer == 0 else "table"
+            tags = [f"tag_{number % spec.tags}"] if spec.tags else []
+            node = {
+                **_relation(unique_id, "model", package, name, spec.columns),
+                "fqn": [package, "marts" if prefix == "fct" else prefix, name],
+                "path": f"{prefix}/{name}.sql",
+                "original_file_path": f"models/{prefix}/{name}.sql",
+                "description": f"{prefix.upper()} model {number} for the {group} domain.",
+                "checksum": {
+                    "name": "sha256",
+                    "checksum": hashlib.sha256(f"{spec.seed}:{unique_id}".encode()).hexdigest(),
+                },
+                "config": {
+                    "enabled": True,
+                    "materialized": materialized,
+                    "tags": tags,
+                    "meta": {},
+                    "group": group,
+                    "access": "protected",
+                },
+                "tags": tags,
+                "group": group,
+                "access": "protected",
+                "depends_on": {"macros": [], "nodes": parents},
+                "raw_code": "\nunion all\n".join(
+                    f"select * from {_reference(parent)}" for parent in parents
+                ),
+                "language": "sql",
+            }
+            if number % 100 == 99:
+                node["config"]["enabled"] = False
+                manifest["disabled"][unique_id] = [node]
+                number += 1
+                continue
+            manifest["nodes"][unique_id] = node
+            manifest["parent_map"][unique_id] = parents
+            for parent in parents:
+                manifest["child_map"].setdefault(parent, []).append(unique_id)
+            manifest["child_map"].setdefault(unique_id, [])
+            if not ephemeral:
+                kind = "VIEW" if materialized == "view" else "BASE TABLE"
+                catalog["nodes"][unique_id] = _catalog_entry(unique_id, name, spec.columns, kind)
+            for test_name, column in _TESTS[: spec.tests]:
+                test_id = _test_id(package, test_name, name, column)
+                manifest["nodes"][test_id] = {
+                    "database": DATABASE,
+                    "schema": f"{SCHEMA}_dbt_test__audit",
+                    "name": f"{test_name}_{name}_{column}",
+                    "resource_type": "test",
+                    "package_name": package,
+                    "unique_id": test_id,
+                    "original_file_path": "models/schema.yml",
+                    "config": {"enabled": True, "materialized": "test", "severity": "ERROR"},
+                    "column_name": column,
+                    "attached_node": unique_id,
+                    "test_metadata": {
+                        "name": test_name,
+                        "kwargs": {"column_name": column, "model": f"{{{{ ref('{name}') }}}}"},
+                    },
+                    "depends_on": {"macros": [f"macro.dbt.test_{test_name}"], "nodes": [unique_id]},
+                }
+                manifest["parent_map"][test_id] = [unique_id]
+                manifest["child_map"][unique_id].append(test_id)
+                manifest["child_map"][test_id] = []
+                results.append(
+                    {
+                        "unique_id": test_id,
+                        "status": "fail" if len(results) % 50 == 49 else "pass",
+                        "execution_time": 0.01,
+                        "failures": 1 if len(results) % 50 == 49 else 0,
+                        "message": None,
+                    }
+                )
+            current_layer.append(unique_id)
+            number += 1
+        previous_layer = current_layer or previous_layer
+    for unique_id in manifest["sources"]:
+        manifest["parent_map"][unique_id] = []
+        manifest["child_map"].setdefault(unique_id, [])
+    run_results = {
+        "metadata": {
+            "dbt_schema_version": "https://schemas.getdbt.com/dbt/run-results/v6.json",
+            "dbt_version": "1.10.0",
+            "generated_at": "2026-01-01T00:00:00Z",
+        },
+        "results": results,
+        "elapsed_time": round(len(results) * 0.01, 2),
+        "args": {"which": "test"},
+    }
+    return SyntheticArtifacts(manifest, catalog, run_results)
+
+
+def populate_duckdb(
+    connection: Any,
+    artifacts: SyntheticArtifacts,
+    *,
+    rows: int = 100,
+    unique_ids: set[str] | None = None,
+) -> int:
+    """Create every generated relation (or only `unique_ids`) with `rows` rows; return the count.
+
+    `connection` must already expose the `analytics` database, for example a file named
+    `analytics.duckdb` or `ATTACH ':memory:' AS analytics`.
+    """
+    created = 0
+    for resource in artifacts.relations():
+        if unique_ids is not None and resource["unique_id"] not in unique_ids:
+            continue
+        alias = resource.get("identifier") or resource["alias"]
+        seed = int(hashlib.sha256(resource["unique_id"].encode()).hexdigest()[:6], 16) % 97
+        extras = [
+            f"cast((range * {position + seed}) % 1000 as integer) as {name}"
+            if data_type == "integer"
+            else f"'v' || cast((range + {position}) % 13 as varchar) as {name}"
+            for position, (name, data_type, _, _) in enumerate(
+                _columns(len(resource["columns"]))[len(_BASE_COLUMNS) :]
+            )
+        ]
+        connection.execute(
+            f'create or replace table {DATABASE}.{SCHEMA}."{alias}" as select '
+            "cast(range + 1 as integer) as id, "
+            "cast(date '2026-07-01' + cast(range % 62 as integer) as date) as event_date, "
+            f"cast(50 + (range * {37 + seed}) % 5000 / 100.0 as decimal(18, 2)) as amount, "
+            "'C' || lpad(cast(range % 97 + 1 as varchar), 3, '0') as category"
+            + "".join(f", {extra}" for extra in extras)
+            + f" from range({rows})"
+        )
+        created += 1
+    return created
+
+
+def write_project(
+    spec: SyntheticSpec, directory: str | Path, *, rows: int = 100, tables: bool = True
+) -> Path:
+    """Write a complete synthetic dbt + TableTalk project and return its manifest path."""
+    root = Path(directory).expanduser().resolve()
+    target = root / "target"
+    target.mkdir(parents=True, exist_ok=True)
+    artifacts = generate(spec)
+    for name, payload in (
+        ("manifest.json", artifacts.manifest),
+        ("catalog.json", artifacts.catalog),
+        ("run_results.json", artifacts.run_results),
+    ):
+        (target / name).write_text(json.dumps(payload))
+    (root / "dbt_project.yml").write_text(
+        yaml.safe_dump(
+            {"name": "analytics", "version": "1.0.0", "config-version": 2, "profile": "analytics"},
+            sort_keys=False,
+        )
+    )
+    (root / "profiles.yml").write_text(
+        yaml.safe_dump(
+            {
+                "analytics": {
+                    "target": "dev",
+                    "outputs": {
+                        "dev": {"type": "duckdb", "path": f"{DATABASE}.duckdb", "schema": SCHEMA}
+                    },
+                }
+            },
+            sort_keys=False,
+        )
+    )
+    (root / "tabletalk.yaml").write_text(
+        yaml.safe_dump(
+            {
+                "dbt": {
+                    "project_dir": ".",
+                    "manifest": "target/manifest.json",
+                    "catalog": "target/catalog.json",
+                    "run_results": "target/run_results.json",
+                    "target": "dev",
+                    "profiles_dir": ".",
+                },
+                "llm": {
+                    "provider": "ollama",
+                    "model": "gemma4:31b-cloud",
+                    "base_url": "http://localhost:11434/v1",
+                },
+            },
+            sort_keys=False,
+        )
+    )
+    (root / "agents").mkdir(exist_ok=True)
+    (root / "evals").mkdir(exist_ok=True)
+    if tables:
+        database = root / f"{DATABASE}.duckdb"
+        database.unlink(missing_ok=True)
+        connection = DuckDBProvider(str(database)).connection
+        try:
+            populate_duckdb(connection, artifacts, rows=rows)
+        finally:
+            connection.close()
+    return target / "manifest.json"
+
+
+def _columns(width: int) -> tuple[tuple[str, str, str, str], ...]:
+    extras = tuple(
+        (f"attribute_{index:03d}", "integer", "INTEGER", f"Numeric attribute {index}.")
+        if index % 2
+        else (f"attribute_{index:03d}", "varchar", "VARCHAR", f"Text attribute {index}.")
+        for index in range(width - len(_BASE_COLUMNS))
+    )
+    return _BASE_COLUMNS + extras
+
+
+def _relation(
+    unique_id: str, resource_type: str, package: str, name: str, width: int
+) -> dict[str, Any]:
+    return {
+        "database": DATABASE,
+        "schema": SCHEMA,
+        "name": name,
+        "alias": name,
+        "resource_type": resource_type,
+        "package_name": package,
+        "unique_id": unique_id,
+        "relation_name": f'"{DATABASE}"."{SCHEMA}"."{name}"',
+        "columns": {
+            column: {
+                "name": column,
+                "description": description,
+                "data_type": data_type,
+                "meta": {},
+                "constraints": [],
+                "tags": [],
+            }
+            for column, data_type, _, description in _columns(width)
+        },
+        "meta": {},
+    }
+
+
+def _catalog_entry(unique_id: str, name: str, width: int, kind: str) -> dict[str, Any]:
+    return {
+        "unique_id": unique_id,
+        "metadata": {"type": kind, "schema": SCHEMA, "name": name, "database": DATABASE},
+        "columns": {
+            column: {"type": physical, "index": index, "name": column, "comment": None}
+            for index, (column, _, physical, _) in enumerate(_columns(width), start=1)
+        },
+        "stats": {},
+    }
+
+
+def _reference(unique_id: str) -> str:
+    if unique_id.startswith("source."):
+        return f"{{{{ source('raw', '{unique_id.rsplit('.', 1)[1]}') }}}}"
+    return f"{{{{ ref('{unique_id.rsplit('.', 1)[1]}') }}}}"
+
+
+def _test_id(package: str, test_name: str, model: str, column: str) -> str:
+    name = f"{test_name}_{model}_{column}"
+    return f"test.{package}.{name}.{hashlib.sha256(name.encode()).hexdigest()[:10]}"
+
+
+__all__ = [
+    "SyntheticArtifacts",
+    "SyntheticError",
+    "SyntheticSpec",
+    "generate",
+    "populate_duckdb",
+    "write_project",
+]
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import json
+import pstats
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from copy import deepcopy
+from dataclasses import replace
 from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
+import openai
 import pytest
 import yaml
 from click.testing import CliRunner
@@ -17,23 +25,44 @@ from tabletalk.authoring import parse_choices, selector_options
 from tabletalk.cli import cli
 from tabletalk.connections import ReadOnlyConnection, Target
 from tabletalk.evals import (
+    AdaptiveTrials,
     EvalCase,
     EvalError,
     EvalRunner,
     EvalSuite,
     ResultExpectation,
     load_eval_suite,
+    shard_cases,
+    wilson_interval,
 )
 from tabletalk.evals import _compare_result as compare_result
-from tabletalk.interfaces import LLMProvider, validate_structured_value
+from tabletalk.factories import clear_llm_providers, get_llm_provider
+from tabletalk.instrumentation import (
+    Instrumentation,
+    MemorySink,
+    PrometheusFileSink,
+    configure_instrumentation,
+    get_instrumentation,
+)
+from tabletalk.interfaces import (
+    LLMProvider,
+    compile_structured_schema,
+    validate_structured_value,
+)
 from tabletalk.manifest import Manifest, ManifestError
+from tabletalk.profiling import subsystem
 from tabletalk.project import Project
 from tabletalk.providers.duckdb_provider import DuckDBProvider
-from tabletalk.providers.openai_provider import _json_object
-from tabletalk.runtime import Runtime
+from tabletalk.providers.openai_provider import OpenAIProvider, _json_object
+from tabletalk.providers.openai_provider import _usage as openai_usage
+from tabletalk.providers.routing import HedgePolicy, RoutedLLM
+from tabletalk.responses import ResponseStore, ResponseStoreError
+from tabletalk.runtime import _ANSWER_SCHEMA, Runtime
 from tabletalk.runtime import _claim_covered as claim_covered
 from tabletalk.runtime import _text_value_present as text_value_present
-from tabletalk.traces import Claim, Evidence
+from tabletalk.runtime.streaming import StructuredAnswerParser
+from tabletalk.synthetic import SyntheticError, SyntheticSpec, generate
+from tabletalk.traces import Claim, Evidence, Trace
 from tabletalk.validation import SQLValidationError, validate_sql
 
 EXAMPLE = Path(__file__).parents[2] / "examples" / "dbt-analytics"
@@ -48,6 +77,22 @@ def test_cloud_json_fences_are_parsed_without_weakening_object_shape() -> None:
         _json_object("```json\n[42]\n```", "cloud")
 
 
+def test_json_recovery_stays_linear_on_large_noisy_output() -> None:
+    payload = {"sql": "select 1", "assumptions": ['a "quoted" {brace} \\ path']}
+    noise = 'Draft: {maybe "x} {{ {not json} } {"a": oops} } ' * 20_000 + 'He said "hi.\n'
+    started = time.perf_counter()
+    assert _json_object(noise + json.dumps(payload) + " then {" * 1000, "cloud") == payload
+    assert _json_object("{" + noise + json.dumps(payload), "cloud") == payload
+    assert time.perf_counter() - started < 2
+    assert _json_object('Outer {"broken": } then {"answer": {"n": 1}}', "cloud") == {
+        "answer": {"n": 1}
+    }
+    for prose in ('Note {draft "quoted text: ', 'x { y "z ', 'Try {"say "hi" now '):
+        assert _json_object(prose + '{"a": 1}', "cloud") == {"a": 1}
+    with pytest.raises(ValueError, match="malformed JSON"):
+        _json_object(noise * 2, "cloud")
+
+
 def test_cloud_output_is_validated_against_the_requested_schema() -> None:
     schema = {
         "type": "object",
@@ -62,6 +107,13 @@ def test_cloud_output_is_validated_against_the_requested_schema() -> None:
         validate_structured_value({"answer": 42, "extra": True}, schema)
     with pytest.raises(ValueError, match=r"\$\.answer must have type integer"):
         validate_structured_value({"answer": "42"}, schema)
+    assert compile_structured_schema(schema) is compile_structured_schema(deepcopy(schema))
+    answer = {"text": "t", "claims": [{"text": "c", "evidence": [{"row": 0, "column": "x"}]}] * 3}
+    validate_structured_value(answer, _ANSWER_SCHEMA)
+    answer["claims"] = [*answer["claims"][:2], {"text": "c", "evidence": [{"row": True}]}]
+    with pytest.raises(ValueError) as failure:
+        validate_structured_value(answer, _ANSWER_SCHEMA)
+    assert str(failure.value) == "Structured output $.claims[2].evidence[0] is missing: column"
 
 
 def test_claim_matching_tolerates_wording_but_not_different_claims() -> None:
@@ -157,6 +209,31 @@ def test_claim_evidence_does_not_treat_iso_date_parts_as_numeric_metrics() -> No
     assert all(check.passed for check in natural_checks)
 
 
+def test_claim_verification_matches_many_cited_cells_within_display_tolerance() -> None:
+    rows = tuple({"customer": f"C{index:03d}", "revenue": index * 1.25} for index in range(300))
+    text = " ".join(f"C{index:03d} had {index * 1.25:.1f}." for index in range(300))
+    claims = tuple(
+        Claim(
+            f"C{index:03d} had {index * 1.25:.1f}.",
+            (Evidence(index, "customer"), Evidence(index, "revenue")),
+        )
+        for index in range(300)
+    )
+    assert all(check.passed for check in Runtime._validate_claims(text, claims, rows))
+    wrong = Runtime._validate_claims(
+        "C007 had 8.9.",
+        (Claim("C007 had 8.9.", (Evidence(7, "customer"), Evidence(7, "revenue"))),),
+        rows,
+    )
+    assert "Numeric claim is absent from cited evidence: 8.9" in wrong[1].message
+    missing_name = Runtime._validate_claims(
+        "C008 had 10.",
+        (Claim("C008 had 10.", (Evidence(9, "customer"), Evidence(8, "revenue"))),),
+        rows,
+    )
+    assert "Text claim is absent from cited evidence: C009" in missing_name[1].message
+
+
 def test_eval_suite_declares_kind_and_repeat_trials(tmp_path: Path) -> None:
     path = tmp_path / "suite.yaml"
     path.write_text(
@@ -445,6 +522,278 @@ def test_runtime_returns_complete_evidence_trace(runtime: Runtime) -> None:
     assert trace.passed
 
 
+def test_structured_answer_parser_emits_text_and_claims_incrementally() -> None:
+    payload = {
+        "claims": [
+            {"text": 'Revenue {"a"} was 1.', "evidence": [{"row": 0, "column": "revenue"}]},
+            {"text": "Orders were 2.", "evidence": [{"row": 1, "column": "orders"}]},
+        ],
+        "text": 'Revenue was 1 \U0001f4c8 at café "north"\nand orders were 2.',
+    }
+    parser = StructuredAnswerParser(
+        {
+            "type": "object",
+            "required": ["text", "evidence"],
+            "properties": {"text": {"type": "string"}, "evidence": {"type": "array"}},
+        }
+    )
+    events = []
+    for character in "Here you go: " + json.dumps(payload):
+        events.extend(parser.feed(character))
+    claims = [value for kind, value in events if kind == "claim"]
+    assert claims == payload["claims"]
+    assert "".join(value for kind, value in events if kind == "text") == payload["text"]
+    assert len([kind for kind, _ in events if kind == "text"]) > 10
+    assert parser.close({"type": "object"}) == payload
+
+
+def test_runtime_stream_yields_stages_and_the_same_trace(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events = list(runtime.answer_stream("What was recognized revenue in July 2026?", batch_size=1))
+    assert [event.kind for event in events] == [
+        "interpretation",
+        "sql",
+        "rows",
+        "text",
+        "claim",
+        "trace",
+    ]
+    assert events[2].value[0]["recognized_revenue"] == 184.25
+    assert all(check.passed for check in events[4].verification)
+    streamed = events[-1].value
+    answered = runtime.answer("What was recognized revenue in July 2026?")
+    assert streamed.answer == answered.answer
+    assert streamed.verification == answered.verification
+    project = _project_with_runtime(tmp_path, runtime)
+    monkeypatch.setattr("tabletalk.cli._project", lambda path: project)
+    result = CliRunner().invoke(
+        cli,
+        [
+            "ask",
+            "revenue",
+            "What was recognized revenue in July 2026?",
+            "--stream",
+            "--format",
+            "json",
+        ],
+    )
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [line["kind"] for line in lines][-3:] == ["text", "claim", "trace"]
+    assert lines[-1]["value"]["answer"]["text"] == "Recognized revenue was $184.25."
+    assert any(
+        check["name"] == "correctness_eval_coverage" for check in lines[-1]["value"]["verification"]
+    )
+
+
+class TimedLLM(StubLLM):
+    """Thread-safe stub that answers by schema and records when each call ran."""
+
+    def __init__(self, sql: str) -> None:
+        super().__init__(sql)
+        self.intervals: list[tuple[float, float]] = []
+
+    def generate_structured(
+        self, messages: list[dict[str, str]], json_schema: dict[str, Any]
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        time.sleep(0.05)
+        self.calls = 0 if "sql" in json_schema["properties"] else 1
+        value = super().generate_structured(messages, json_schema)
+        self.last_usage = {"prompt_tokens": 7, "completion_tokens": 3}
+        self.intervals.append((started, time.perf_counter()))
+        return value
+
+
+class TimedProvider(DuckDBProvider):
+    def __init__(self, provider: DuckDBProvider) -> None:
+        self.connection = provider.connection
+        self.intervals: list[tuple[float, float]] = []
+
+    def execute_query_timed(self, sql_query: str) -> tuple[list[dict[str, Any]], dict[str, float]]:
+        started = time.perf_counter()
+        time.sleep(0.05)
+        rows, timings = super().execute_query_timed(sql_query)
+        self.intervals.append((started, time.perf_counter()))
+        return rows, {**timings, "execute": (time.perf_counter() - started) * 1000}
+
+
+def test_pipelined_runtime_overlaps_model_calls_with_warehouse_execution(
+    runtime: Runtime,
+) -> None:
+    llm = TimedLLM(runtime.llm.sql)  # type: ignore[attr-defined]
+    provider = TimedProvider(runtime.connection.provider)  # type: ignore[arg-type]
+    runtime.llm = llm
+    runtime.connection.provider = provider
+    questions = [f"What was recognized revenue in July 2026? ({index})" for index in range(4)]
+    outcomes = runtime.answer_many([*questions, " "], llm_workers=2, warehouse_workers=2)
+    assert isinstance(outcomes[-1], ValueError)
+    traces = outcomes[:-1]
+    assert [trace.question for trace in traces] == questions  # type: ignore[union-attr]
+    for trace in traces:
+        assert isinstance(trace, Trace) and trace.passed
+        assert list(trace.usage.stages) == [
+            "query_prompt",
+            "plan",
+            "validate",
+            "execute",
+            "fetch",
+            "answer_prompt",
+            "answer",
+            "verify",
+        ]
+        assert trace.usage.stages["execute"] >= 50
+        assert [call.stage for call in trace.usage.calls] == ["plan", "answer"]
+        assert (trace.usage.prompt_tokens, trace.usage.completion_tokens) == (14, 6)
+    assert any(
+        start < other_end and other_start < end
+        for start, end in llm.intervals
+        for other_start, other_end in provider.intervals
+    )
+
+
+def test_prompts_share_a_byte_stable_prefix_and_record_cached_tokens(runtime: Runtime) -> None:
+    class RecordingLLM(StubLLM):
+        def __init__(self, sql: str) -> None:
+            super().__init__(sql)
+            self.requests: list[list[dict[str, str]]] = []
+
+        def generate_structured(
+            self, messages: list[dict[str, str]], json_schema: dict[str, Any]
+        ) -> dict[str, Any]:
+            self.requests.append([dict(message) for message in messages])
+            self.last_usage = {"prompt_tokens": 100, "completion_tokens": 5, "cached_tokens": 64}
+            return super().generate_structured(messages, json_schema)
+
+    llm = RecordingLLM(runtime.llm.sql)  # type: ignore[attr-defined]
+    runtime.llm = llm
+    first = runtime.answer("What was recognized revenue in July 2026?")
+    runtime.agent = runtime.agent.source.resolve(
+        Manifest.load(EXAMPLE / "target" / "manifest.json")
+    )
+    runtime.answer("How much revenue did we recognize in July 2026?")
+    first_query, first_answer, second_query, second_answer = llm.requests
+    assert first_query[:-1] == second_query[:-1]
+    assert first_answer[0] == second_answer[0]
+    assert [message["role"] for message in first_answer] == ["system", "system", "user"]
+    assert first_query[-1]["content"] == first_answer[-1]["content"] == first.question
+    assert first.usage.cached_tokens == 128
+    assert [call.cached_tokens for call in first.usage.calls] == [64, 64]
+    assert Trace.from_dict(json.loads(first.to_json())).usage.cached_tokens == 128
+
+    usage = SimpleNamespace(
+        prompt_tokens=100,
+        completion_tokens=5,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=96),
+    )
+    assert openai_usage(usage) == {
+        "prompt_tokens": 100,
+        "completion_tokens": 5,
+        "cached_tokens": 96,
+    }
+    assert "cached_tokens" not in openai_usage(
+        SimpleNamespace(prompt_tokens=1, completion_tokens=1)
+    )
+
+
+def test_response_store_records_and_replays_structured_calls(tmp_path: Path) -> None:
+    requests: list[dict[str, Any]] = []
+
+    def create(**request: Any) -> Any:
+        requests.append(request)
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=11, completion_tokens=2),
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"answer": 42}'))],
+        )
+
+    schema = {
+        "type": "object",
+        "additionalProperties": False,
+        "required": ["answer"],
+        "properties": {"answer": {"type": "integer"}},
+    }
+    messages = [{"role": "user", "content": "What is the answer?"}]
+    provider = get_llm_provider(
+        {"provider": "ollama", "model": "m", "responses": "record"}, tmp_path
+    )
+    assert isinstance(provider, OpenAIProvider) and provider.response_store is not None
+    provider.client = SimpleNamespace(  # type: ignore[assignment]
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    assert provider.generate_structured(messages, schema) == {"answer": 42}
+    assert provider.generate_structured(messages, schema) == {"answer": 42}
+    assert len(requests) == 2 and len(provider.response_store) == 1
+    assert provider.response_store.path == tmp_path / ".tabletalk" / "responses"
+
+    provider.response_store.mode = "replay"
+    assert provider.generate_structured(messages, schema) == {"answer": 42}
+    assert provider.last_usage == {} and len(requests) == 2
+    with pytest.raises(ResponseStoreError, match="replay mode"):
+        provider.generate_structured(messages, {**schema, "description": "changed"})
+    provider.temperature = 0.5
+    with pytest.raises(ResponseStoreError):
+        provider.generate_structured(messages, schema)
+
+    provider.response_store.mode = "replay-or-record"
+    assert provider.generate_structured(messages, schema) == {"answer": 42}
+    assert provider.generate_structured(messages, schema) == {"answer": 42}
+    assert len(requests) == 3 and len(provider.response_store) == 2
+    with pytest.raises(ResponseStoreError, match="Unsupported response mode"):
+        ResponseStore(tmp_path, "sometimes")
+
+
+def test_batch_ask_streams_recorded_traces_and_summarizes(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime.llm = TimedLLM(runtime.llm.sql)  # type: ignore[attr-defined]
+    evals = tmp_path / "evals"
+    evals.mkdir()
+    (evals / "revenue.yaml").write_text(
+        "name: revenue-regression\nagent: revenue\ncases:\n"
+        "  - name: july\n    question: What was recognized revenue in July 2026?\n"
+        "    expect:\n      result:\n        comparison: scalar\n        value: 184.25\n"
+    )
+    project = _project_with_runtime(tmp_path, runtime)
+    started = time.perf_counter()
+    outcomes = dict(
+        project.answer_many(
+            "revenue",
+            ["What was recognized revenue in July 2026?", "A new question", " "],
+            workers=2,
+            rate_limit=20,
+        )
+    )
+    assert time.perf_counter() - started >= 0.1
+    assert outcomes[0].correctness_verified  # type: ignore[union-attr]
+    assert not outcomes[1].passed  # type: ignore[union-attr]
+    assert isinstance(outcomes[2], ValueError)
+    assert project.trace_store is not None and project.trace_store.count() == 2
+
+    batch = tmp_path / "questions.jsonl"
+    batch.write_text(
+        '"What was recognized revenue in July 2026?"\n\n{"question": "A new question"}\n'
+    )
+    monkeypatch.setattr("tabletalk.cli._project", lambda path: project)
+    result = CliRunner().invoke(cli, ["ask", "revenue", "--batch", str(batch), "--format", "json"])
+    assert result.exit_code == 4
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(line["question"] for line in lines) == [
+        "A new question",
+        "What was recognized revenue in July 2026?",
+    ]
+    summary = json.loads(result.stderr)
+    assert (summary["count"], summary["failures"], summary["errors"]) == (2, 1, 0)
+    assert (summary["prompt_tokens"], summary["completion_tokens"]) == (28, 12)
+    assert summary["p50_ms"] >= 100
+
+    batch.write_text('{"question": 3}\n')
+    result = CliRunner().invoke(cli, ["ask", "revenue", "--batch", str(batch)])
+    assert result.exit_code == 1
+    assert "expected a question string" in result.output
+    result = CliRunner().invoke(cli, ["ask", "revenue"])
+    assert result.exit_code == 2
+
+
 def test_runtime_fails_claims_not_present_in_cited_evidence(runtime: Runtime) -> None:
     runtime.llm = StubLLM(
         runtime.llm.sql,  # type: ignore[attr-defined]
@@ -493,6 +842,474 @@ def test_runtime_repairs_one_sql_validation_failure(runtime: Runtime) -> None:
     trace = runtime.answer("What was recognized revenue in July 2026?")
     assert trace.passed
     assert runtime.llm.calls == 3  # type: ignore[attr-defined]
+    assert {"plan", "validate", "plan_2", "validate_2"} <= set(trace.usage.stages)
+    assert [call.stage for call in trace.usage.calls] == ["plan", "plan", "answer"]
+    assert Trace.from_dict(json.loads(trace.to_json())).usage == trace.usage
+
+
+def test_instrumentation_nests_runtime_spans_and_aggregates_metrics(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    memory = MemorySink()
+    metrics_file = tmp_path / "metrics.prom"
+    monkeypatch.setattr(
+        "tabletalk.instrumentation._current",
+        Instrumentation([memory, PrometheusFileSink(metrics_file)]),
+    )
+    runtime.llm = TimedLLM(runtime.llm.sql)  # type: ignore[attr-defined]
+    trace = runtime.answer("What was recognized revenue in July 2026?")
+    assert trace.passed
+    get_instrumentation().flush()
+
+    spans = {span.name: span for span in memory.spans}
+    root = spans["tabletalk.answer"]
+    assert root.parent_id is None and root.attributes["outcome"] == "verified"
+    assert {span.trace_id for span in memory.spans} == {root.trace_id}
+    for stage in ("plan", "validate", "execute", "answer", "verify"):
+        assert spans[f"tabletalk.stage.{stage}"].parent_id == root.span_id
+    assert spans["tabletalk.validate_sql"].parent_id == spans["tabletalk.stage.validate"].span_id
+    query = spans["tabletalk.warehouse.query"]
+    assert query.parent_id == spans["tabletalk.stage.execute"].span_id
+    assert query.attributes["rows"] == 1 and query.attributes["bytes"] > 0
+
+    tokens = memory.metric("tabletalk_llm_tokens_total", stage="plan", kind="prompt")
+    assert tokens is not None and tokens.value == 7
+    answers = memory.metric("tabletalk_answers_total", outcome="verified")
+    assert answers is not None and answers.value == 1
+    rows = memory.metric("tabletalk_query_rows", adapter="duckdb")
+    assert rows is not None and rows.count == 1 and rows.bucket_counts[0] == 1
+    exposition = metrics_file.read_text()
+    assert "# TYPE tabletalk_stage_duration_ms histogram" in exposition
+    assert 'tabletalk_answers_total{agent="revenue",outcome="verified"} 1' in exposition
+    assert 'tabletalk_stage_duration_ms_bucket{stage="plan",le="+Inf"} 1' in exposition
+
+    with pytest.raises(SQLValidationError):
+        validate_sql(
+            "delete from analytics.main.fct_orders",
+            runtime.manifest,
+            runtime.agent.nodes,
+            dialect="duckdb",
+            max_rows=100,
+        )
+    failures = get_instrumentation().metrics()
+    assert any(
+        metric.name == "tabletalk_operation_errors_total"
+        and ("error", "SQLValidationError") in metric.labels
+        for metric in failures
+    )
+
+
+def test_otlp_sinks_export_to_a_local_collector(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    received: list[tuple[str, dict[str, Any]]] = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, json.loads(body)))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Collector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr("tabletalk.instrumentation._current", Instrumentation())
+    try:
+        instrumentation = configure_instrumentation(
+            [
+                {"sink": "otlp_http", "endpoint": f"http://127.0.0.1:{server.server_port}"},
+                {"sink": "otlp_file", "path": "telemetry.jsonl"},
+            ],
+            tmp_path,
+        )
+        assert get_instrumentation() is instrumentation
+        with instrumentation.span("outer"):
+            with instrumentation.span("inner", rows=3):
+                instrumentation.observe("tabletalk_query_duration_ms", 12.5, adapter="duckdb")
+            instrumentation.count("tabletalk_answers_total", outcome="verified")
+        instrumentation.flush()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [path for path, _ in received] == ["/v1/traces", "/v1/metrics"]
+    traces, metrics = (payload for _, payload in received)
+    outer, inner = sorted(
+        traces["resourceSpans"][0]["scopeSpans"][0]["spans"],
+        key=lambda span: span["name"],
+        reverse=True,
+    )
+    assert inner["parentSpanId"] == outer["spanId"] and inner["traceId"] == outer["traceId"]
+    assert inner["attributes"] == [{"key": "rows", "value": {"intValue": "3"}}]
+    exported = {
+        metric["name"]: metric
+        for metric in metrics["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+    }
+    histogram = exported["tabletalk_query_duration_ms"]["histogram"]["dataPoints"][0]
+    assert histogram["count"] == "1" and histogram["sum"] == 12.5
+    assert len(histogram["bucketCounts"]) == len(histogram["explicitBounds"]) + 1
+    assert exported["tabletalk_answers_total"]["sum"]["isMonotonic"]
+    lines = (tmp_path / "telemetry.jsonl").read_text().splitlines()
+    written_traces, written_metrics = (json.loads(line) for line in lines)
+    assert written_traces == traces
+    assert [
+        metric["name"]
+        for metric in written_metrics["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]
+    ] == list(exported)
+    with pytest.raises(ValueError, match="otlp_http requires endpoint"):
+        configure_instrumentation({"sink": "otlp_http"}, tmp_path)
+
+
+def test_llm_providers_share_one_pooled_client_per_configuration(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    completion = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "m",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": '{"answer": 42}'},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+    }
+    ports: list[int] = []
+
+    class Endpoint(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers["Content-Length"]))
+            ports.append(self.client_address[1])
+            body = json.dumps(completion).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Endpoint)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    memory = MemorySink()
+    monkeypatch.setattr("tabletalk.instrumentation._current", Instrumentation([memory]))
+    monkeypatch.setenv("STANDIN_KEY", "first")
+    config = {
+        "provider": "openai-compatible",
+        "base_url": f"http://127.0.0.1:{server.server_port}/v1",
+        "api_key": "${STANDIN_KEY}",
+        "model": "m",
+        "http": {"max_connections": 4, "keepalive_expiry": 17.5},
+    }
+    schema = {
+        "type": "object",
+        "required": ["answer"],
+        "properties": {"answer": {"type": "integer"}},
+    }
+    messages = [{"role": "user", "content": "What is the answer?"}]
+    try:
+        provider = get_llm_provider(config, tmp_path)
+        assert get_llm_provider(deepcopy(config), tmp_path) is provider
+        monkeypatch.setenv("STANDIN_KEY", "rotated")
+        rotated = get_llm_provider(config, tmp_path)
+        assert isinstance(provider, OpenAIProvider) and isinstance(rotated, OpenAIProvider)
+        assert rotated is not provider and rotated.client._client is provider.client._client
+        for client in (provider, rotated, provider):
+            assert client.generate_structured(messages, schema) == {"answer": 42}
+    finally:
+        server.shutdown()
+        server.server_close()
+        clear_llm_providers()
+
+    assert len(ports) == 3 and len(set(ports)) == 1
+    get_instrumentation().flush()
+    new = memory.metric("tabletalk_llm_connections_total", outcome="new", http_version="HTTP/1.1")
+    reused = memory.metric(
+        "tabletalk_llm_connections_total", outcome="reused", http_version="HTTP/1.1"
+    )
+    assert new is not None and new.value == 1
+    assert reused is not None and reused.value == 2
+    assert get_llm_provider(config, tmp_path) is not provider
+    with pytest.raises(ValueError, match="Unsupported llm.http settings: pool"):
+        get_llm_provider({**config, "http": {"pool": 3}}, tmp_path)
+
+
+def test_llm_limits_throttle_requests_and_retry_429s_after_retry_after(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    active: list[int] = [0, 0]  # current, peak
+    seen: list[str] = []
+    lock = threading.Lock()
+
+    class Endpoint(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            model = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["model"]
+            with lock:
+                seen.append(model)
+                refuse = model == "busy" or seen.count("m") == 1
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            if refuse:
+                body = b'{"error": {"message": "Rate limit reached", "type": "requests"}}'
+                self.send_response(429)
+                self.send_header(
+                    *(("Retry-After", "120") if model == "busy" else ("retry-after-ms", "150"))
+                )
+            else:
+                content = json.dumps({"answer": 42})
+                body = json.dumps(
+                    {
+                        "id": "chatcmpl-1",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+                    }
+                ).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Endpoint)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    memory = MemorySink()
+    monkeypatch.setattr("tabletalk.instrumentation._current", Instrumentation([memory]))
+    config = {
+        "provider": "openai-compatible",
+        "base_url": f"http://127.0.0.1:{server.server_port}/v1",
+        "api_key": "local",
+        "model": "m",
+        "limits": {"requests_per_minute": 240, "max_in_flight": 2},
+        "retry": {"max_retries": 2, "initial_delay_seconds": 0.01},
+    }
+    schema = {
+        "type": "object",
+        "required": ["answer"],
+        "properties": {"answer": {"type": "integer"}},
+    }
+    messages = [{"role": "user", "content": "What is the answer?"}]
+    results: list[dict[str, Any]] = []
+    try:
+        provider = get_llm_provider(config, tmp_path)
+        workers = [
+            threading.Thread(
+                target=lambda: results.append(provider.generate_structured(messages, schema))
+            )
+            for _ in range(6)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        busy = get_llm_provider({**config, "model": "busy"}, tmp_path)
+        with pytest.raises(openai.RateLimitError):
+            busy.generate_structured(messages, schema)
+    finally:
+        server.shutdown()
+        server.server_close()
+        clear_llm_providers()
+
+    assert results == [{"answer": 42}] * 6
+    assert seen.count("m") == 7 and seen.count("busy") == 1 and active[1] == 2
+    get_instrumentation().flush()
+    retries = memory.metric("tabletalk_llm_retries_total", model="m", reason="429")
+    assert retries is not None and retries.value == 1
+    retry = memory.metric("tabletalk_llm_throttle_delay_ms", model="m", reason="retry")
+    assert retry is not None and retry.count == 1 and retry.value == 150
+    throttled = memory.metric("tabletalk_llm_throttle_delay_ms", model="m", reason="requests")
+    assert throttled is not None and throttled.value >= 250
+    assert memory.metric("tabletalk_llm_throttle_delay_ms", model="m", reason="in_flight")
+    with pytest.raises(ValueError, match="llm.limits values must be positive"):
+        get_llm_provider({**config, "limits": {"tokens_per_minute": 0}}, tmp_path)
+    with pytest.raises(ValueError, match="Unsupported llm.retry settings: attempts"):
+        get_llm_provider({**config, "retry": {"attempts": 3}}, tmp_path)
+
+
+def test_hedge_delay_ignores_replayed_responses(tmp_path: Path) -> None:
+    requests: list[dict[str, Any]] = []
+
+    def create(**request: Any) -> Any:
+        requests.append(request)
+        time.sleep(0.01)
+        return SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=11, completion_tokens=2),
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"answer": 42}'))],
+        )
+
+    provider = get_llm_provider(
+        {"provider": "ollama", "model": "m", "responses": "replay-or-record"}, tmp_path
+    )
+    assert isinstance(provider, OpenAIProvider)
+    provider.client = SimpleNamespace(  # type: ignore[assignment]
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    routed = RoutedLLM([("ollama:m", provider)], hedge=HedgePolicy(min_samples=3))
+    schema = {"type": "object", "properties": {"answer": {"type": "integer"}}}
+    replayed = []
+    for question in ("a", "a", "b", "a", "b", "c"):
+        messages = [{"role": "user", "content": question}]
+        assert routed.generate_structured(messages, schema) == {"answer": 42}
+        replayed.append(provider.last_replayed)
+    assert replayed == [False, True, False, True, True, False] and len(requests) == 3
+    assert routed._hedge_delay("ollama:m") is not None
+    assert min(routed._latencies["ollama:m"]) >= 0.01
+
+
+def test_routed_llm_hedges_slow_requests_and_falls_back_on_errors(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    seen: list[str] = []
+    lock = threading.Lock()
+
+    class Endpoint(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            model = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["model"]
+            with lock:
+                seen.append(model)
+                slow = model == "m" and seen.count("m") == 4
+            time.sleep(1.0 if slow else 0.01)
+            if model == "down":
+                body = b'{"error": {"message": "overloaded"}}'
+                self.send_response(503)
+            else:
+                body = json.dumps(
+                    {
+                        "id": "chatcmpl-1",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": '{"answer": 42}'},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7},
+                    }
+                ).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Endpoint)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    memory = MemorySink()
+    monkeypatch.setattr("tabletalk.instrumentation._current", Instrumentation([memory]))
+    config = {
+        "provider": "openai-compatible",
+        "base_url": f"http://127.0.0.1:{server.server_port}/v1",
+        "api_key": "local",
+        "model": "down",
+        "retry": {"max_retries": 0},
+        "fallbacks": [{"model": "m"}],
+        "hedge": {"percentile": 50, "min_samples": 3},
+    }
+    schema = {
+        "type": "object",
+        "required": ["answer"],
+        "properties": {"answer": {"type": "integer"}},
+    }
+    messages = [{"role": "user", "content": "What is the answer?"}]
+    latencies: list[float] = []
+    try:
+        routed = get_llm_provider(config, tmp_path)
+        assert isinstance(routed, RoutedLLM)
+        assert [identity for identity, _ in routed.providers] == [
+            "openai-compatible:down",
+            "openai-compatible:m",
+        ]
+        for _ in range(4):
+            started = time.perf_counter()
+            assert routed.generate_structured(messages, schema) == {"answer": 42}
+            latencies.append(time.perf_counter() - started)
+            assert routed.last_model == "openai-compatible:m"
+            assert routed.last_usage == {"prompt_tokens": 5, "completion_tokens": 2}
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            get_instrumentation().flush()
+            wasted = memory.metric(
+                "tabletalk_llm_hedge_wasted_tokens",
+                model="openai-compatible:m",
+                kind="prompt_tokens",
+            )
+            if wasted is not None:
+                break
+            time.sleep(0.05)
+        assert wasted is not None and wasted.value == 5
+    finally:
+        server.shutdown()
+        server.server_close()
+        clear_llm_providers()
+
+    # The fourth original request stalls for a second; its hedge answers first.
+    assert seen.count("down") == 4 and seen.count("m") == 5 and max(latencies) < 0.5
+    get_instrumentation().flush()
+    hedges = memory.metric(
+        "tabletalk_llm_hedges_total", model="openai-compatible:m", winner="hedge"
+    )
+    assert hedges is not None and hedges.value == 1
+    fallbacks = memory.metric(
+        "tabletalk_llm_fallbacks_total",
+        model="openai-compatible:down",
+        to="openai-compatible:m",
+        error="InternalServerError",
+    )
+    assert fallbacks is not None and fallbacks.value == 4
+
+    class Down(LLMProvider):
+        def generate_response(self, prompt: str) -> str:
+            raise TimeoutError("request timed out")
+
+        def generate_structured(
+            self, messages: list[dict[str, str]], json_schema: dict[str, Any]
+        ) -> dict[str, Any]:
+            raise TimeoutError("request timed out")
+
+    backup = runtime.llm
+    runtime.llm = RoutedLLM([("stub:primary", Down()), ("stub:backup", backup)])
+    trace = runtime.answer("What was recognized revenue in July 2026?")
+    assert trace.passed and trace.model_identity == "stub:model"
+    assert [call.model for call in trace.usage.calls] == ["stub:backup", "stub:backup"]
+    assert Trace.from_dict(json.loads(trace.to_json())).usage == trace.usage
+    runtime.llm = RoutedLLM([("stub:primary", Down())])
+    with pytest.raises(TimeoutError):
+        runtime.answer("What was recognized revenue in July 2026?")
+    with pytest.raises(ValueError, match="percentile must be between 0 and 100"):
+        get_llm_provider({**config, "hedge": {"percentile": 100}}, tmp_path)
 
 
 def test_eval_uses_runtime_and_reference_query_as_hard_gate(runtime: Runtime) -> None:
@@ -559,7 +1376,7 @@ def _project_with_runtime(tmp_path: Path, runtime: Runtime) -> Project:
     project = object.__new__(Project)
     project.root = tmp_path
     project.config = {"evals_dir": "evals"}
-    project.runtime = lambda agent_name: runtime  # type: ignore[method-assign]
+    project.runtime = lambda agent_name, **options: runtime  # type: ignore[method-assign]
     return project
 
 
@@ -724,6 +1541,370 @@ def test_cli_exposes_only_dbt_native_lifecycle() -> None:
         assert command in result.output
 
 
+def test_synthetic_project_is_deterministic_and_queryable(tmp_path: Path) -> None:
+    spec = SyntheticSpec(models=60, columns=6, depth=3, fan_out=2, groups=3, packages=2, tests=3)
+    assert generate(spec) == generate(spec)
+    assert generate(spec) != generate(replace(spec, seed=1))
+    result = CliRunner().invoke(
+        cli,
+        [
+            "synthetic",
+            str(tmp_path),
+            "--models=60",
+            "--columns=6",
+            "--depth=3",
+            "--fan-out=2",
+            "--groups=3",
+            "--packages=2",
+            "--tests=3",
+            "--rows=5",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    project = Project.load(tmp_path)
+    summary = project.manifest.summary
+    assert summary.groups == ("finance", "marketing", "sales")
+    assert summary.packages == ("analytics", "package_1")
+    models = [node for node in project.manifest.queryable_nodes if node.resource_type == "model"]
+    assert len(models) == 60 - 1  # every twentieth intermediate model is ephemeral
+    facts = [node for node in models if node.name.startswith("fct_")]
+    assert facts and all(len(node.parents) == 2 for node in facts)
+    assert all(len(node.columns) == 6 and len(node.tests) == 3 for node in models)
+    assert {test.status for node in models for test in node.tests} == {"pass", "fail"}
+    assert facts[0].columns["amount"].physical_type == "DECIMAL(18,2)"
+    agent = Agent("finance", "Finance", ("group:finance",)).resolve(project.manifest)
+    validated = validate_sql(
+        f"select sum(amount) as amount from {facts[0].alias}",
+        project.manifest,
+        agent.nodes,
+        dialect="duckdb",
+        max_rows=10,
+    )
+    assert project.connection().execute(validated.executed, 10)[0]["amount"] is not None
+    with pytest.raises(SyntheticError, match="columns must be at least 4"):
+        SyntheticSpec(columns=2)
+
+
+@pytest.mark.parametrize("profile_format", ["pstats", "speedscope"])
+def test_profile_option_writes_a_profile_and_groups_hot_spots(
+    profile_format: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--profile",
+            f"--profile-format={profile_format}",
+            "synthetic",
+            "project",
+            "--models=200",
+            "--no-tables",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    (written,) = (tmp_path / ".tabletalk" / "profiles").iterdir()
+    assert "manifest" in result.output and "Subsystem" in result.output
+    if profile_format == "pstats":
+        assert written.name.endswith("-synthetic.pstats")
+        assert pstats.Stats(str(written)).total_calls > 0  # type: ignore[attr-defined]
+    else:
+        profile = json.loads(written.read_text())
+        frames = profile["shared"]["frames"]
+        sampled = profile["profiles"][0]
+        assert sampled["type"] == "sampled"
+        assert len(sampled["samples"]) == len(sampled["weights"]) > 0
+        assert all(0 <= index < len(frames) for stack in sampled["samples"] for index in stack)
+    assert subsystem("/site-packages/sqlglot/parser.py") == "validation"
+
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    listed = CliRunner().invoke(
+        cli, ["--profile", "agent", "list", "--project-folder", str(tmp_path / "project")]
+    )
+    assert listed.exit_code == 0, listed.output
+    assert len(list((tmp_path / "project" / ".tabletalk" / "profiles").iterdir())) == 1
+    assert not (elsewhere / ".tabletalk").exists()
+    override = tmp_path / "profiles"
+    listed = CliRunner().invoke(
+        cli,
+        [
+            "--profile",
+            "--profile-dir",
+            str(override),
+            "agent",
+            "list",
+            "--project-folder",
+            "../project",
+        ],
+    )
+    assert listed.exit_code == 0, listed.output
+    assert len(list(override.iterdir())) == 1
+    assert subsystem("/repo/tabletalk/runtime/__init__.py") == "runtime"
+
+
+def test_sql_replay_reruns_approved_sql_without_the_model(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    evals = tmp_path / "evals"
+    evals.mkdir()
+    (evals / "revenue.yaml").write_text(
+        "name: revenue-regression\nagent: revenue\ncases:\n"
+        "  - name: july\n    question: What was recognized revenue in July 2026?\n"
+        "    required_models: [model.analytics.fct_orders]\n"
+        "    expect:\n      result:\n        comparison: scalar\n        value: 184.25\n"
+        "  - name: august\n    question: What was recognized revenue in August 2026?\n"
+        "    expect:\n      reference_sql: >-\n"
+        "        select sum(recognized_revenue) as recognized_revenue\n"
+        "        from {{ ref('fct_orders') }} where order_date >= '2026-08-01'\n"
+        "      result: {comparison: scalar}\n"
+        "  - name: refunds\n    question: What were refunds?\n"
+        "    expect:\n      outcome: rejection\n"
+    )
+    project = _project_with_runtime(tmp_path, runtime)
+    monkeypatch.setattr("tabletalk.cli._project", lambda path: project)
+    live = CliRunner().invoke(cli, ["eval", "run", "revenue"])
+    assert "PASS july" in live.output and "FAIL august" in live.output
+
+    class NoModel(StubLLM):
+        def generate_structured(
+            self, messages: list[dict[str, str]], json_schema: dict[str, Any]
+        ) -> dict[str, Any]:
+            raise AssertionError("sql-replay must not call the model")
+
+    runtime.llm = NoModel(runtime.llm.sql)  # type: ignore[attr-defined]
+    replayed = CliRunner().invoke(
+        cli, ["eval", "run", "revenue", "--mode", "sql-replay", "--format", "json"]
+    )
+    assert replayed.exit_code == 3, replayed.output
+    (result,) = json.loads(replayed.output)
+    cases = {case["name"]: case for case in result["cases"]}
+    assert set(cases) == {"july", "august"}
+    assert cases["july"]["passed"]
+    assert {check["name"] for check in cases["july"]["checks"]} >= {
+        "approved_sql",
+        "required_models",
+        "result_match",
+    }
+    assert cases["august"]["checks"][0]["name"] == "approved_sql"
+    assert not cases["august"]["passed"]
+
+    runtime.connection.provider.connection.execute(  # type: ignore[attr-defined]
+        "update analytics.main.fct_orders set recognized_revenue = 1 where order_id = 2"
+    )
+    replayed = CliRunner().invoke(
+        cli, ["eval", "run", "revenue", "--mode", "sql-replay", "--case", "july"]
+    )
+    assert replayed.exit_code == 3
+    assert "FAIL july" in replayed.output and "result_match" in replayed.output
+
+
+def test_impacted_since_runs_only_cases_using_changed_nodes(
+    runtime: Runtime, manifest: Manifest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert "_fingerprints" not in vars(manifest)
+    payload = json.loads((EXAMPLE / "target" / "manifest.json").read_text())
+    calendar = deepcopy(payload)
+    calendar["nodes"]["model.shared_models.shared_calendar"]["checksum"]["checksum"] = "0" * 64
+    assert Manifest(manifest.path, calendar).changed_nodes(manifest.fingerprints()) == {
+        "model.shared_models.shared_calendar"
+    }
+    retyped = deepcopy(payload)
+    column = retyped["nodes"]["model.analytics.stg_orders"]["columns"]["order_id"]
+    column["data_type"] = "bigint"
+    changed = Manifest(manifest.path, retyped).changed_nodes(manifest.fingerprints())
+    assert {"model.analytics.stg_orders", "model.analytics.fct_orders"} <= changed
+    assert "model.shared_models.shared_calendar" not in changed
+
+    evals = tmp_path / "evals"
+    evals.mkdir()
+    (evals / "revenue.yaml").write_text(
+        "name: revenue-regression\nagent: revenue\ncases:\n"
+        "  - name: july\n    question: What was recognized revenue in July 2026?\n"
+        "    expect:\n      result:\n        comparison: scalar\n        value: 184.25\n"
+    )
+    project = _project_with_runtime(tmp_path, runtime)
+    monkeypatch.setattr("tabletalk.cli._project", lambda path: project)
+    assert CliRunner().invoke(cli, ["eval", "run", "revenue"]).exit_code == 0
+    (baseline,) = (tmp_path / ".tabletalk" / "eval-results" / "revenue").glob("*.json")
+    assert "model.analytics.stg_orders" in json.loads(baseline.read_text())["node_fingerprints"]
+
+    project.manifest = Manifest(manifest.path, calendar)
+    unaffected = CliRunner().invoke(cli, ["eval", "run", "--impacted-since", str(baseline)])
+    assert unaffected.exit_code == 0, unaffected.output
+    assert "Skipped 1 eval cases" in unaffected.output
+    assert "july" not in unaffected.output
+
+    previous = tmp_path / "previous-manifest.json"
+    previous.write_text(json.dumps(payload))
+    project.manifest = Manifest(manifest.path, retyped)
+    impacted = CliRunner().invoke(cli, ["eval", "run", "--impacted-since", str(previous)])
+    assert impacted.exit_code == 0, impacted.output
+    assert "PASS july" in impacted.output and "Skipped 0" in impacted.output
+
+
+def test_adaptive_trials_stop_stable_cases_and_spend_budget_on_flaky_ones(
+    runtime: Runtime, tmp_path: Path
+) -> None:
+    class FlakyLLM(StubLLM):
+        flaky_queries = 0
+
+        def generate_structured(
+            self, messages: list[dict[str, str]], json_schema: dict[str, Any]
+        ) -> dict[str, Any]:
+            payload = super().generate_structured(messages, json_schema)
+            if "sql" in payload and "Flaky" in messages[-1]["content"]:
+                self.flaky_queries += 1
+                if self.flaky_queries % 2 == 0:
+                    payload["sql"] = self.sql.replace("2026-07-01", "2026-07-10")
+            return payload
+
+    runtime.llm = FlakyLLM(runtime.llm.sql)  # type: ignore[attr-defined]
+    expect = ResultExpectation(comparison="scalar", value=184.25)
+    suite = EvalSuite(
+        "revenue-capability",
+        "revenue",
+        (
+            EvalCase("stable", "What was recognized revenue in July 2026?", result=expect),
+            EvalCase("flaky", "Flaky: what was July 2026 revenue?", result=expect),
+        ),
+        trials=6,
+        adaptive=AdaptiveTrials(),
+    )
+    result = EvalRunner(suite, runtime).run_adaptive(suite.trials)
+    stable, flaky = result.cases
+    assert stable.passed and stable.pass_rate
+    assert (stable.pass_rate.passes, stable.pass_rate.trials) == (4, 4)
+    assert stable.pass_rate.lower >= 0.5
+    assert not flaky.passed and flaky.pass_rate
+    assert (flaky.pass_rate.passes, flaky.pass_rate.trials) == (4, 8)
+    assert runtime.llm.calls == 2 * 12  # type: ignore[attr-defined]
+    assert result.to_dict()["cases"][1]["pass_rate"]["trials"] == 8
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    (tmp_path / "suite.yaml").write_text(
+        "name: s\nagent: revenue\ntrials: 4\nadaptive: {threshold: 0.6, min_trials: 3}\n"
+        "cases:\n  - name: a\n    question: Q?\n"
+    )
+    assert load_eval_suite(tmp_path / "suite.yaml").adaptive == AdaptiveTrials(0.6, 0.95, 3)
+
+
+def test_adaptive_trials_reject_budgets_too_small_to_pass_a_case(runtime: Runtime) -> None:
+    expect = ResultExpectation(comparison="scalar", value=184.25)
+    suite = EvalSuite(
+        "revenue-regression",
+        "revenue",
+        (EvalCase("july", "What was recognized revenue in July 2026?", result=expect),),
+        trials=1,
+        adaptive=AdaptiveTrials(),
+    )
+    assert suite.adaptive is not None and suite.adaptive.trials_to_pass == 4
+    runner = EvalRunner(suite, runtime)
+    with pytest.raises(EvalError, match="need trials of at least 4"):
+        runner.run_adaptive(suite.trials)
+    assert runtime.llm.calls == 0  # type: ignore[attr-defined]
+    result = runner.run_adaptive(4)
+    (case,) = result.cases
+    assert result.passed and case.passed and case.pass_rate
+    assert (case.pass_rate.passes, case.pass_rate.trials) == (4, 4)
+    assert AdaptiveTrials(threshold=0.8, min_trials=1).trials_to_pass == 16
+    with pytest.raises(EvalError, match="cannot be reached"):
+        AdaptiveTrials(threshold=0.9)
+
+
+def test_sharded_eval_runs_partition_cases_and_merge_into_one_report(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    latencies = {"a": 10.0, "b": 1.0, "c": 1.0}
+    assert shard_cases(["a", "b", "c", "d"], 1, 2, latencies) == {"a"}
+    assert shard_cases(["a", "b", "c", "d"], 2, 2, latencies) == {"b", "c", "d"}
+    unweighted = [shard_cases(list("abcde"), shard, 2) for shard in (1, 2)]
+    assert sorted(map(len, unweighted)) == [2, 3] and unweighted[0] | unweighted[1] == set("abcde")
+
+    evals = tmp_path / "evals"
+    evals.mkdir()
+    (evals / "revenue.yaml").write_text(
+        "name: revenue-regression\nagent: revenue\ncases:\n"
+        + "".join(
+            f"  - name: {name}\n    question: What was recognized revenue ({name})?\n"
+            f"    expect:\n      result:\n        comparison: scalar\n        value: {value}\n"
+            for name, value in (("july", 184.25), ("july-again", 184.25), ("august", 50))
+        )
+    )
+    project = _project_with_runtime(tmp_path, runtime)
+    monkeypatch.setattr("tabletalk.cli._project", lambda path: project)
+    ran: list[str] = []
+    by_shard: dict[str, list[str]] = {}
+    for shard in ("1/2", "2/2"):
+        output = tmp_path / f"shard-{shard[0]}"
+        result = CliRunner().invoke(cli, ["eval", "run", "--shard", shard, "--format", "json"])
+        (record,) = json.loads(result.output)
+        assert record["shard"] == shard
+        by_shard[shard] = [case["name"] for case in record["cases"]]
+        ran.extend(by_shard[shard])
+        output.mkdir()
+        for persisted in (tmp_path / ".tabletalk" / "eval-results" / "revenue").glob("*.json"):
+            persisted.rename(output / persisted.name)
+    assert sorted(ran) == ["august", "july", "july-again"]
+
+    merged = CliRunner().invoke(
+        cli, ["eval", "merge", str(tmp_path / "shard-1"), str(tmp_path / "shard-2")]
+    )
+    assert merged.exit_code == 3, merged.output
+    assert "Case pass rate: 2/3 (66.7%)" in merged.output
+    partial = CliRunner().invoke(
+        cli, ["eval", "merge", str(tmp_path / "shard-1"), "--format", "json"]
+    )
+    (record,) = json.loads(partial.output)
+    assert [case["name"] for case in record["cases"]] == ["july", "july-again", "august"]
+    uncovered = [
+        case["name"] for case in record["cases"] if case["checks"][0]["name"] == "shard_coverage"
+    ]
+    assert uncovered == by_shard["2/2"] and not record["passed"]
+    assert CliRunner().invoke(cli, ["eval", "run", "--shard", "3/2"]).exit_code == 2
+
+
+def test_shards_agree_across_runners_with_different_trace_histories(
+    runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    names = ["july", "july-again", "august", "september", "october"]
+    projects = {}
+    for runner in ("a", "b"):
+        evals = tmp_path / runner / "evals"
+        evals.mkdir(parents=True)
+        (evals / "revenue.yaml").write_text(
+            "name: revenue-regression\nagent: revenue\ncases:\n"
+            + "".join(f"  - name: {name}\n    question: Revenue ({name})?\n" for name in names)
+        )
+        projects[runner] = _project_with_runtime(tmp_path / runner, runtime)
+    current = "a"
+    monkeypatch.setattr("tabletalk.cli._project", lambda path: projects[current])
+    assert CliRunner().invoke(cli, ["eval", "run"]).exit_code == 0
+
+    latencies = tmp_path / "latencies.json"
+    exported = CliRunner().invoke(cli, ["eval", "latencies", "--output", str(latencies)])
+    assert exported.exit_code == 0, exported.output
+    assert sorted(record["case"] for record in json.loads(latencies.read_text())) == sorted(names)
+
+    for extra in ([], ["--shard-latencies", str(latencies)]):
+        split = []
+        for current, shard in (("a", "1/2"), ("b", "2/2")):
+            result = CliRunner().invoke(
+                cli, ["eval", "run", "--shard", shard, "--format", "json", *extra]
+            )
+            (record,) = json.loads(result.output)
+            split.append({case["name"] for case in record["cases"]})
+        assert split[0] | split[1] == set(names) and not split[0] & split[1]
+
+    latencies.write_text("{}")
+    assert (
+        CliRunner()
+        .invoke(cli, ["eval", "run", "--shard", "1/2", "--shard-latencies", str(latencies)])
+        .exit_code
+        == 4
+    )
+
+
 def test_eval_case_filter_skips_other_suites_for_same_agent(
     runtime: Runtime, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -852,7 +2033,9 @@ def test_end_to_end_dbt_init_agent_eval_and_live_ask(
         'from "analytics"."main"."fct_orders" '
         "where order_date >= '2026-07-01' and order_date < '2026-08-01'"
     )
-    monkeypatch.setattr("tabletalk.project.get_llm_provider", lambda config: StubLLM(sql))
+    monkeypatch.setattr(
+        "tabletalk.project.get_llm_provider", lambda config, root=None: StubLLM(sql)
+    )
     reference = (
         "select sum(recognized_revenue) as recognized_revenue "
         "from {{ ref('fct_orders') }} where order_date >= '2026-07-01' "
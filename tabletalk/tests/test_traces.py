@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from tabletalk.agents import Agent, AgentError
+from tabletalk.cli import cli
+from tabletalk.evals import CaseResult, SuiteResult
+from tabletalk.evidence import EvidencePolicy, compact_trace, encode_rows
+from tabletalk.runtime import Runtime
+from tabletalk.store import TraceStore, parse_time_bound
+from tabletalk.traces import (
+    Answer,
+    Claim,
+    DbtContext,
+    Evidence,
+    Interpretation,
+    LazyResultTrace,
+    ResultTrace,
+    SQLTrace,
+    Trace,
+    Usage,
+    Verification,
+    result_digest,
+)
+
+EXAMPLE = Path(__file__).parents[2] / "examples" / "dbt-analytics"
+
+
+def write_project(root: Path, **config: Any) -> Path:
+    """A tabletalk project over the example dbt artifacts, loaded as `--project-folder root`."""
+    root.mkdir(parents=True, exist_ok=True)
+    dbt = {"project_dir": str(EXAMPLE), "manifest": "target/manifest.json"}
+    (root / "tabletalk.yaml").write_text(yaml.safe_dump({"dbt": dbt, **config}))
+    return root
+
+
+def make_trace(
+    *,
+    agent: str = "revenue",
+    latency_ms: float = 100,
+    passed: bool = True,
+    created_at: str | None = None,
+    rows: tuple[dict[str, Any], ...] = (
+        {"order_date": date(2026, 7, 3), "recognized_revenue": Decimal("184.25")},
+    ),
+    question: str = "What was recognized revenue in July 2026?",
+) -> Trace:
+    return Trace(
+        question=question,
+        interpretation=Interpretation("aggregate", ("recognized_revenue",)),
+        dbt_context=DbtContext(
+            "manifest-digest",
+            None,
+            ("model.analytics.fct_orders",),
+            ("recognized_revenue",),
+            test_health={"not_null": "pass"},
+        ),
+        sql=SQLTrace("select 1", "select 1 limit 10", "duckdb"),
+        result=ResultTrace(rows, len(rows)),
+        answer=Answer(
+            "Revenue was 184.25.",
+            (Claim("Revenue was 184.25.", (Evidence(0, "recognized_revenue"),)),),
+        ),
+        verification=(Verification("claims_supported", passed),),
+        agent=agent,
+        agent_digest="agent-digest",
+        model_identity="stub:model",
+        warehouse_identity="duckdb",
+        usage=Usage(latency_ms=latency_ms, prompt_tokens=10, completion_tokens=5),
+        created_at=created_at or datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def test_trace_store_reports_percentiles_tokens_and_failures(tmp_path: Path) -> None:
+    store = TraceStore(tmp_path / "traces.sqlite")
+    start = datetime(2026, 7, 1, tzinfo=timezone.utc)
+    for index in range(100):
+        store.add_trace(
+            make_trace(
+                latency_ms=index + 1,
+                passed=index % 10 != 0,
+                created_at=(start + timedelta(minutes=index)).isoformat(),
+            )
+        )
+    store.add_trace(make_trace(agent="other", created_at="2026-07-02T00:00:00+00:00"))
+    (stats,) = store.statistics(bucket="day", agent="revenue")
+    assert stats.bucket == "2026-07-01"
+    assert stats.count == 100
+    assert stats.failures == 10
+    assert (stats.p50_ms, stats.p95_ms, stats.p99_ms) == (50, 95, 99)
+    assert stats.prompt_tokens == 1000
+    assert stats.completion_tokens == 500
+    windowed = store.statistics(bucket="all", since="2026-07-01T01:00:00+00:00")
+    assert windowed[0].count == 41
+    assert store.statistics(bucket="day", agent="missing") == ()
+
+
+def test_trace_store_keeps_rows_out_of_metadata_and_indexes_eval_failures(
+    tmp_path: Path,
+) -> None:
+    store = TraceStore(tmp_path / "traces.sqlite")
+    trace = make_trace()
+    assert store.add_trace(trace) is not None
+    assert store.add_trace(trace) is None
+    result = SuiteResult(
+        "revenue-regression",
+        "revenue",
+        (
+            CaseResult("july", True, (), make_trace(question="July?")),
+            CaseResult("broken", False, (), error="model timed out"),
+        ),
+        "suite-digest",
+    )
+    assert store.add_suite_result(result, "2026-07-01T00:00:00+00:00") == 2
+    (eval_stats,) = store.statistics(bucket="all", kind="eval")
+    assert (eval_stats.count, eval_stats.failures) == (2, 1)
+    payload = json.loads(
+        store._connection.execute("select payload from traces where kind = 'run'").fetchone()[0]
+    )
+    assert "rows" not in payload["result"]
+    assert payload["result"]["row_count"] == 1
+
+
+def test_runs_index_backfills_json_history_once(tmp_path: Path) -> None:
+    project = write_project(tmp_path / "project", trace_store="history.sqlite")
+    make_trace().write(project / ".tabletalk" / "runs", "one.json")
+    result = SuiteResult(
+        "revenue-regression",
+        "revenue",
+        (CaseResult("july", True, (), make_trace(question="July?")),),
+        "0123456789abcdef",
+    )
+    eval_dir = project / ".tabletalk" / "eval-results" / "revenue"
+    eval_dir.mkdir(parents=True)
+    (eval_dir / "2026-07-01T00-00-00+00-00-0123456789ab.json").write_text(
+        json.dumps(result.to_dict())
+    )
+    folder = ["--project-folder", str(project)]
+    runner = CliRunner()
+    first = runner.invoke(cli, ["runs", "index", *folder])
+    assert first.exit_code == 0, first.output
+    assert "Indexed 2 new records" in first.output
+    assert (project / "history.sqlite").is_file()
+    assert "Indexed 0 new records" in runner.invoke(cli, ["runs", "index", *folder]).output
+    queried = runner.invoke(cli, ["runs", "query", "--bucket", "all", "--format", "json", *folder])
+    assert queried.exit_code == 0, queried.output
+    assert json.loads(queried.output)[0]["count"] == 2
+
+    disabled = write_project(tmp_path / "disabled", trace_store=False)
+    refused = runner.invoke(cli, ["runs", "index", "--project-folder", str(disabled)])
+    assert refused.exit_code == 4 and "trace store is disabled" in refused.output
+
+
+def test_relative_time_bounds_are_utc_windows() -> None:
+    now = datetime(2026, 7, 8, tzinfo=timezone.utc)
+    assert parse_time_bound("7d", now) == "2026-07-01T00:00:00+00:00"
+    assert parse_time_bound("2026-07-01") == "2026-07-01T00:00:00+00:00"
+
+
+def test_fast_serializer_round_trips_with_and_without_orjson(monkeypatch: Any) -> None:
+    rows = tuple(
+        {
+            "order_date": date(2026, 7, day),
+            "loaded_at": datetime(2026, 7, day, 12, tzinfo=timezone.utc),
+            "recognized_revenue": Decimal("184.25"),
+            "customer": "Zoë" if day % 2 else None,
+            "flag": day % 2 == 0,
+        }
+        for day in range(1, 29)
+    )
+    trace = make_trace(rows=rows)
+    expected = trace.to_dict()
+    assert expected["result"]["rows"][0]["order_date"] == "2026-07-01"
+    assert expected["result"]["rows"][0]["loaded_at"] == "2026-07-01 12:00:00+00:00"
+    assert expected["result"]["rows"][0]["recognized_revenue"] == "184.25"
+    assert json.loads(trace.to_json()) == expected
+    monkeypatch.setattr("tabletalk.traces._orjson", None)
+    assert json.loads(trace.to_json()) == expected
+    assert trace.to_json(indent=False).count(b"\n") == 0
+
+
+def test_suite_result_json_matches_its_dict(tmp_path: Path) -> None:
+    result = SuiteResult(
+        "revenue-regression",
+        "revenue",
+        (
+            CaseResult("july", True, (Verification("result_match", True),), make_trace()),
+            CaseResult("broken", False, (), error="timeout"),
+        ),
+        "suite-digest",
+    )
+    assert json.loads(result.to_json()) == result.to_dict()
+    assert result.to_dict()["cases"][0]["trace"]["agent"] == "revenue"
+
+
+def test_trace_records_load_back_into_traces(tmp_path: Path) -> None:
+    trace = make_trace()
+    loaded = Trace.load(trace.write(tmp_path, "trace.json"))
+    assert loaded.to_dict() == trace.to_dict()
+    assert loaded.answer.claims[0].evidence[0] == Evidence(0, "recognized_revenue")
+    assert loaded.result.rows[0]["recognized_revenue"] == "184.25"
+
+
+def test_stored_traces_materialize_rows_only_on_access(tmp_path: Path) -> None:
+    store = TraceStore(tmp_path / "traces.sqlite")
+    for index in range(3):
+        store.add_trace(
+            make_trace(passed=index != 1, created_at=f"2026-07-0{index + 1}T00:00:00+00:00")
+        )
+    listed = list(store.traces(agent="revenue"))
+    assert [trace.created_at[:10] for trace in listed] == [
+        "2026-07-03",
+        "2026-07-02",
+        "2026-07-01",
+    ]
+    assert all(isinstance(trace.result, LazyResultTrace) for trace in listed)
+    assert not any(trace.result.loaded for trace in listed)  # type: ignore[attr-defined]
+    assert [trace.passed for trace in store.traces(passed=False)] == [False]
+    first = listed[0]
+    assert first.result.row_count == 1
+    assert first.result.rows == ({"order_date": "2026-07-03", "recognized_revenue": "184.25"},)
+    assert first.result.loaded  # type: ignore[attr-defined]
+    assert json.loads(first.to_json())["result"]["rows"] == list(first.result.rows)
+
+
+def test_runs_list_reads_the_project_trace_store_without_loading_rows(tmp_path: Path) -> None:
+    project = write_project(tmp_path / "project")
+    store = TraceStore(project / ".tabletalk" / "traces.sqlite")
+    store.add_trace(make_trace(question="July?", created_at="2026-07-01T00:00:00+00:00"))
+    store.add_trace(
+        make_trace(question="August?", passed=False, created_at="2026-08-01T00:00:00+00:00")
+    )
+    folder = ["--project-folder", str(project)]
+    listed = CliRunner().invoke(cli, ["runs", "list", *folder])
+    assert listed.exit_code == 0, listed.output
+    assert listed.output.index("August?") < listed.output.index("July?")
+    failed = CliRunner().invoke(cli, ["runs", "list", "--failed", *folder])
+    assert "August?" in failed.output and "July?" not in failed.output
+    invalid = CliRunner().invoke(cli, ["runs", "list", "--since", "soon", *folder])
+    assert invalid.exit_code == 4
+
+
+def test_evidence_policies_keep_cited_rows_and_original_indexes() -> None:
+    rows = tuple(
+        {"region": "west" if index % 4 else "east", "revenue": Decimal(index)}
+        for index in range(100)
+    )
+    trace = replace(
+        make_trace(rows=rows),
+        answer=Answer("Revenue peaked.", (Claim("Peak", (Evidence(57, "revenue"),)),)),
+    )
+    assert compact_trace(trace, EvidencePolicy()) is trace
+    head_tail = compact_trace(trace, EvidencePolicy("head_tail", rows=4)).result
+    assert head_tail.indexes == (0, 1, 57, 98, 99)
+    assert head_tail.row(57) == rows[57] and head_tail.row(99) == rows[99]
+    for missing in (2, 100):
+        with pytest.raises(IndexError, match=f"row {missing} was not retained"):
+            head_tail.row(missing)
+    assert head_tail.row_count == 100
+    assert head_tail.digest == result_digest(rows)
+    assert head_tail.summary is not None
+    assert head_tail.summary["revenue"]["sum"] == Decimal(4950)
+    assert head_tail.summary["region"]["distinct"] == 2
+    sample = EvidencePolicy("sample", rows=8, stratify_by="region").select(rows)
+    assert len(sample) == 8
+    assert sample == EvidencePolicy("sample", rows=8, stratify_by="region").select(rows)
+    assert sum(1 for index in sample if rows[index]["region"] == "east") == 2
+    summary = compact_trace(trace, EvidencePolicy("summary")).result
+    assert summary.indexes == (57,)
+    loaded = Trace.from_dict(json.loads(compact_trace(trace, EvidencePolicy("summary")).to_json()))
+    assert loaded.result.indexes == (57,)
+    assert loaded.result.row(57) == {"region": "west", "revenue": "57"}
+
+
+def test_agent_evidence_policies_load_and_dump(tmp_path: Path) -> None:
+    path = tmp_path / "revenue.yaml"
+    base = "name: revenue\ndescription: Revenue.\nselect: [group:finance]\n"
+    path.write_text(base + "evidence: {prompt: head_tail, trace: {mode: summary}}\n")
+    agent = Agent.load(path)
+    assert agent.prompt_evidence == EvidencePolicy("head_tail")
+    assert agent.trace_evidence == EvidencePolicy("summary")
+    assert yaml.safe_load(agent.dump())["evidence"]["trace"] == {"mode": "summary", "rows": 50}
+    path.write_text(base + "evidence: {prompt: summary}\n")
+    with pytest.raises(AgentError, match="cannot be summary"):
+        Agent.load(path)
+    path.write_text(base + "evidence: {trace: everything}\n")
+    with pytest.raises(AgentError, match="evidence mode"):
+        Agent.load(path)
+
+
+def test_answer_prompt_encodes_evidence_as_an_indexed_table() -> None:
+    rows = (
+        {"order_date": date(2026, 7, 3), "revenue": Decimal("100.00"), "note": "a|b"},
+        {"order_date": date(2026, 7, 17), "revenue": Decimal("84.25"), "note": None},
+        {"order_date": date(2026, 8, 2), "revenue": Decimal("50.00"), "note": "NULL"},
+    )
+    assert encode_rows(rows) == (
+        'row|order_date|revenue|note\n0|2026-07-03|100.00|"a|b"\n'
+        '1|2026-07-17|84.25|NULL\n2|2026-08-02|50.00|"NULL"'
+    )
+    prompt = Runtime._answer_prompt("select 1", rows, EvidencePolicy("head_tail", rows=2))
+    assert "Decimal(" not in prompt and "datetime" not in prompt
+    assert "2 of 3 rows shown" in prompt
+    assert "\n0|2026-07-03|100.00|" in prompt and "\n2|2026-08-02|50.00|" in prompt
+    assert "revenue: nulls=0 min=50.00 max=100.00 sum=234.25" in prompt
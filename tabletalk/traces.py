@@ -2,29 +2,89 @@
 
 from __future__ import annotations
 
+import bisect
 import dataclasses
+import hashlib
 import json
-from dataclasses import dataclass, field
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - exercised when the optional extra is absent
+    _orjson = None  # type: ignore[assignment]
+
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+_ENCODERS: dict[type, Callable[[Any], Any]] = {}
+
+
+def _dataclass_encoder(cls: type) -> Callable[[Any], Any]:
+    """Generate one flat encoder per trace dataclass instead of reflecting on every value."""
+    names = [item.name for item in dataclasses.fields(cls)]
+    body = ", ".join(f"{name!r}: encode(value.{name})" for name in names)
+    namespace: dict[str, Any] = {"encode": _json_value}
+    exec(f"def encode_{cls.__name__}(value):\n    return {{{body}}}\n", namespace)
+    return namespace[f"encode_{cls.__name__}"]
+
 
 def _json_value(value: Any) -> Any:
-    if dataclasses.is_dataclass(value):
+    kind = type(value)
+    if kind in _SCALARS:
+        return value
+    encoder = _ENCODERS.get(kind)
+    if encoder is not None:
+        return encoder(value)
+    if isinstance(value, dict):
         return {
-            item.name: _json_value(getattr(value, item.name)) for item in dataclasses.fields(value)
+            str(key): item if type(item) in _SCALARS else _json_value(item)
+            for key, item in value.items()
         }
-    if isinstance(value, dict):
-        return {str(key): _json_value(item) for key, item in value.items()}
     if isinstance(value, (tuple, list)):
-        return [_json_value(item) for item in value]
+        return [item if type(item) in _SCALARS else _json_value(item) for item in value]
     if isinstance(value, (Decimal, date, datetime)):
         return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        encoder = _ENCODERS[kind] = _dataclass_encoder(kind)
+        return encoder(value)
     return value
 
 
+def result_digest(rows: Any) -> str:
+    """A content hash of a complete result, stable across serializer backends."""
+    canonical = json.dumps(_json_value(tuple(rows)), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, (Decimal, date, datetime)):
+        return str(value)
+    if isinstance(value, LazyResultTrace):
+        return {item.name: getattr(value, item.name) for item in dataclasses.fields(value)}
+    raise TypeError
+
+
+def dumps(value: Any, *, indent: bool = True) -> bytes:
+    """Serialize traces and trace-bearing records to sorted JSON bytes.
+
+    With the optional `orjson` extra, dataclasses are written directly without intermediate dicts;
+    otherwise the generated encoders feed the standard library. Both parse to the same value for
+    finite numbers; orjson writes non-finite floats as null.
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_SORT_KEYS | _orjson.OPT_PASSTHROUGH_DATETIME | _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        try:
+            return _orjson.dumps(value, default=_orjson_default, option=option)
+        except TypeError:
+            pass
+    return json.dumps(_json_value(value), indent=2 if indent else None, sort_keys=True).encode()
+
+
 @dataclass(frozen=True)
 class Interpretation:
     intent: str = ""
@@ -54,8 +114,57 @@ class SQLTrace:
 
 @dataclass(frozen=True)
 class ResultTrace:
+    """Result evidence; `row_count` and `digest` always describe the complete result.
+
+    When an evidence policy dropped rows, `indexes` holds the original index of each kept row and
+    `summary` aggregates every column of the complete result.
+    """
+
     rows: tuple[dict[str, Any], ...]
     row_count: int
+    digest: str | None = None
+    indexes: tuple[int, ...] | None = None
+    summary: dict[str, Any] | None = None
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return a row by its index in the complete result, as cited by `Evidence.row`."""
+        if self.indexes is None:
+            return self.rows[index]
+        # Evidence policies keep rows in result order, so `indexes` is sorted.
+        position = bisect.bisect_left(self.indexes, index)
+        if position == len(self.indexes) or self.indexes[position] != index:
+            raise IndexError(f"Result row {index} was not retained in this trace")
+        return self.rows[position]
+
+
+class LazyResultTrace(ResultTrace):
+    """A persisted `ResultTrace` whose evidence rows are fetched on first access.
+
+    Listing and filtering historical traces only touches metadata; `rows` is loaded once and
+    cached the first time anything reads it.
+    """
+
+    def __init__(
+        self,
+        row_count: int,
+        load_rows: Callable[[], tuple[dict[str, Any], ...]],
+        **metadata: Any,
+    ) -> None:
+        object.__setattr__(self, "row_count", row_count)
+        object.__setattr__(self, "_load_rows", load_rows)
+        for name, value in metadata.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def loaded(self) -> bool:
+        return "rows" in self.__dict__
+
+    def __getattr__(self, name: str) -> Any:
+        if name != "rows":
+            raise AttributeError(name)
+        rows = tuple(dict(row) for row in self._load_rows())
+        object.__setattr__(self, "rows", rows)
+        return rows
 
 
 @dataclass(frozen=True)
@@ -83,12 +192,37 @@ class Verification:
     message: str = ""
 
 
+@dataclass(frozen=True)
+class LLMCall:
+    stage: str
+    latency_ms: float
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    cached_tokens: int | None = None
+    model: str | None = None
+
+
 @dataclass(frozen=True)
 class Usage:
+    """Latency and tokens for one answer.
+
+    `stages` maps each timed step to milliseconds in the order it ran; a repeated plan/validate
+    attempt is suffixed `_2`. Token totals sum every model call listed in `calls`;
+    `cached_tokens` is the part of `prompt_tokens` the provider served from its prompt cache.
+    Each call's `model` is the identity that served it, which differs from the trace's
+    `model_identity` when a fallback answered.
+    """
+
     latency_ms: float = 0
     prompt_tokens: int | None = None
     completion_tokens: int | None = None
+    cached_tokens: int | None = None
     estimated_cost: float | None = None
+    stages: dict[str, float] = field(default_factory=dict)
+    calls: tuple[LLMCall, ...] = ()
+
+    def with_stage(self, name: str, milliseconds: float) -> Usage:
+        return replace(self, stages={**self.stages, name: milliseconds})
 
 
 @dataclass(frozen=True)
@@ -122,10 +256,96 @@ class Trace:
     def to_dict(self) -> dict[str, Any]:
         return _json_value(self)
 
+    @classmethod
+    def from_dict(
+        cls,
+        payload: dict[str, Any],
+        *,
+        load_rows: Callable[[], tuple[dict[str, Any], ...]] | None = None,
+    ) -> Trace:
+        """Rebuild a trace from its persisted JSON record.
+
+        Result cells keep their JSON representation: decimals and dates stay strings. Records whose
+        rows were stored separately need `load_rows`, which runs on first access to `rows`.
+        """
+        try:
+            raw_result = dict(payload["result"])
+            raw_answer = payload["answer"]
+            if "rows" in raw_result:
+                result: ResultTrace = _restore(
+                    ResultTrace, {**raw_result, "rows": tuple(raw_result["rows"])}
+                )
+            elif load_rows is not None:
+                raw_result.pop("row_count")
+                result = LazyResultTrace(
+                    int(payload["result"]["row_count"]),
+                    load_rows,
+                    **{name: _restored(value) for name, value in raw_result.items()},
+                )
+            else:
+                raise ValueError("Trace record has no result rows and no row loader")
+            return _restore(
+                cls,
+                {
+                    **payload,
+                    "interpretation": _restore(Interpretation, payload["interpretation"]),
+                    "dbt_context": _restore(DbtContext, payload["dbt_context"]),
+                    "sql": _restore(SQLTrace, payload["sql"]),
+                    "result": result,
+                    "answer": Answer(
+                        str(raw_answer["text"]),
+                        tuple(
+                            Claim(
+                                str(claim["text"]),
+                                tuple(_restore(Evidence, item) for item in claim["evidence"]),
+                            )
+                            for claim in raw_answer["claims"]
+                        ),
+                    ),
+                    "verification": tuple(
+                        _restore(Verification, item) for item in payload["verification"]
+                    ),
+                    "usage": _restore(
+                        Usage,
+                        {
+                            **(payload.get("usage") or {}),
+                            "calls": tuple(
+                                _restore(LLMCall, call)
+                                for call in (payload.get("usage") or {}).get("calls") or ()
+                            ),
+                        },
+                    ),
+                },
+            )
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid trace record: {exc}") from exc
+
+    @classmethod
+    def load(cls, path: str | Path) -> Trace:
+        source = Path(path)
+        try:
+            payload = json.loads(source.read_bytes())
+        except (OSError, json.JSONDecodeError) as exc:
+            raise ValueError(f"Could not load trace {source}: {exc}") from exc
+        return cls.from_dict(payload)
+
+    def to_json(self, *, indent: bool = True) -> bytes:
+        return dumps(self, indent=indent)
+
     def write(self, directory: str | Path, name: str | None = None) -> Path:
         root = Path(directory)
         root.mkdir(parents=True, exist_ok=True)
         filename = name or self.created_at.replace(":", "-") + ".json"
         target = root / filename
-        target.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n")
+        target.write_bytes(self.to_json() + b"\n")
         return target
+
+
+def _restored(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _restore(cls: type, raw: dict[str, Any]) -> Any:
+    """Construct a flat trace dataclass from JSON, ignoring fields newer or older than `cls`."""
+    names = {item.name for item in dataclasses.fields(cls)}
+    return cls(**{name: _restored(value) for name, value in raw.items() if name in names})
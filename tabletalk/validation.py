@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from sqlglot import exp, parse
 from sqlglot.errors import ParseError
 
+from tabletalk.instrumentation import instrumented
 from tabletalk.manifest import Manifest, ManifestError, Node
 from tabletalk.traces import Verification
 
@@ -55,6 +56,7 @@ class ValidatedSQL:
     checks: tuple[Verification, ...]
 
 
+@instrumented("validate_sql")
 def validate_sql(
     sql: str,
     manifest: Manifest,